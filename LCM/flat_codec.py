@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LCM扁平编解码模块
+按照lowlevel_schema中由.lcm文件生成的消息布局，为整条消息预编译一个struct.Struct，
+并生成直线式的解码/编码函数，替代lcm-gen逐层_decode_one/_encode_one的实现。
+输出字节与lcm_type的encode()/decode()完全兼容（含指纹）。
+
+状态消息只提供原地解码decode_state_into（≥5x于lcm-gen的目标针对它）：每条消息新建7个结构体的开销
+占了解码时间的一半，返回新对象的解码达不到该目标，接收端一律解码到三缓冲中预分配的快照。
+"""
+
+import struct
+
+from .lcm_type.LowlevelState_t import LowlevelState_t
+from .lcm_type.LowlevelCmd_t import LowlevelCmd_t
+from . import lowlevel_schema
+from .lowlevel_schema import STATE_LAYOUT, CMD_LAYOUT, CMD_STRINGS
+
+
+def _layout_format(layout):
+    """由布局生成struct格式串（不含字节序和指纹）"""
+    fmt = ""
+    for _, _, fields in layout:
+        for _, code, dim in fields:
+            fmt += f"{dim}{code}" if dim else code
+    return fmt
+
+
+def _layout_locals(layout):
+    """为布局中的每个标量分配一个局部变量名，返回 [(子结构体, 字段, 数组长度, [变量名...]), ...]"""
+    result = []
+    index = 0
+    for group, _, fields in layout:
+        for name, _, dim in fields:
+            count = dim or 1
+            result.append((group, name, dim, [f"v{index + i}" for i in range(count)]))
+            index += count
+    return result
+
+
+def _compile(source, namespace, func_name):
+    """编译生成的函数源码"""
+    exec(compile(source, f"<flat_codec {func_name}>", "exec"), namespace)
+    return namespace[func_name]
+
+
+# =============================================================================
+# LowlevelState_t 解码
+# =============================================================================
+STATE_STRUCT = struct.Struct(">Q" + _layout_format(STATE_LAYOUT))
+STATE_SIZE = STATE_STRUCT.size
+STATE_FINGERPRINT = LowlevelState_t._get_packed_fingerprint()  # 消息开头的8字节指纹
+assert STATE_SIZE == lowlevel_schema.STATE_SIZE, "lowlevel_schema.py与扁平编解码不一致，请重新运行lcm_gen"
+
+
+def _group_spans(layout, offset):
+    """每个子结构体在消息中的字节区间: ((子结构体属性名, 起始, 结束), ...)"""
+    spans = []
+    for group, cls, fields in layout:
+        size = struct.calcsize(">" + _layout_format(((group, cls, fields),)))
+        spans.append((group, offset, offset + size))
+        offset += size
+    return tuple(spans)
+
+
+# 各子结构体在消息中的字节区间（跳过8字节指纹），其顺序即decode_state_changes返回掩码的位序
+STATE_GROUP_SPANS = _group_spans(STATE_LAYOUT, 8)
+
+
+def _build_state_decoder_into(compare=False):
+    """生成原地解码函数；compare为True时生成decode_state_changes，额外与prev逐字段比较并返回变化掩码"""
+    func_name = "decode_state_changes" if compare else "decode_state_into"
+    slots = _layout_locals(STATE_LAYOUT)
+    all_vars = [v for _, _, _, names in slots for v in names]
+    lines = [
+        f"def {func_name}(data, msg{', prev' if compare else ''}):",
+        f"    fp, {', '.join(all_vars)} = _unpack_from(data)",
+        "    if fp != _FINGERPRINT:",
+        "        raise ValueError(\"Decode error\")",
+    ]
+    if compare:
+        lines.append("    mask = 0")
+    for bit, (group, _, _) in enumerate(STATE_LAYOUT):
+        lines.append(f"    sub = msg.{group}")
+        terms = []
+        for g, name, dim, names in slots:
+            if g != group:
+                continue
+            if dim:
+                # 数组原地写入，保持list对象不变
+                lines.append(f"    arr = sub.{name}")
+                lines.extend(f"    arr[{i}] = {v}" for i, v in enumerate(names))
+                terms.extend(f"{v} != p.{name}[{i}]" for i, v in enumerate(names))
+            else:
+                lines.append(f"    sub.{name} = {names[0]}")
+                terms.append(f"{names[0]} != p.{name}")
+        if compare:
+            # 与上一包解码出的数值直接比较，短路求值，不切片、不分配新对象
+            lines.append(f"    p = prev.{group}")
+            lines.append(f"    if {' or '.join(terms)}:")
+            lines.append(f"        mask |= {1 << bit}")
+    lines.append("    return mask" if compare else "    return msg")
+    namespace = {
+        "_unpack_from": STATE_STRUCT.unpack_from,
+        "_FINGERPRINT": struct.unpack(">Q", STATE_FINGERPRINT)[0],
+    }
+    return _compile("\n".join(lines), namespace, func_name)
+
+
+decode_state_into = _build_state_decoder_into()
+decode_state_into.__doc__ = """将uwbot_state消息原地解码到已分配的LowlevelState_t中（不创建新的结构体/列表），返回target
+
+一次unpack_from加逐字段赋值，是uwbot_state唯一的解码路径；需要独立对象时传入新建的LowlevelState_t()。
+
+target的数组字段必须是长度足够的list（LowlevelState_t()默认即满足）。
+"""
+
+decode_state_changes = _build_state_decoder_into(compare=True)
+decode_state_changes.__doc__ = """同decode_state_into，同时与prev（上一包的快照）逐字段比较，返回发生变化的子结构体掩码
+
+第i位对应STATE_GROUP_SPANS[i]。数值比较与按字节比较的区别只在NaN：值为NaN的字段每包都算作变化。
+"""
+
+
+# =============================================================================
+# LowlevelCmd_t 编码
+# =============================================================================
+CMD_FIXED_STRUCT = struct.Struct(">Q" + _layout_format(CMD_LAYOUT))
+_STRING_LEN_STRUCT = struct.Struct(">I")
+
+
+def _build_cmd_encoder():
+    slots = _layout_locals(CMD_LAYOUT)
+    lines = ["def encode_cmd(cmd):"]
+    for group, _, _ in CMD_LAYOUT:
+        lines.append(f"    {group} = cmd.{group}")
+    args = []
+    for group, name, dim, names in slots:
+        if dim:
+            lines.append(f"    {name} = {group}.{name}")
+            args.extend(f"{name}[{i}]" for i in range(dim))
+        else:
+            args.append(f"{group}.{name}")
+    lines.append(f"    parts = [_pack(_FINGERPRINT, {', '.join(args)})]")
+    for group, name, dim in CMD_STRINGS:
+        lines.append(f"    {name} = {group}.{name}")
+        for i in range(dim):
+            lines.append(f"    s = {name}[{i}].encode('utf-8')")
+            lines.append("    parts.append(_pack_len(len(s) + 1))")
+            lines.append("    parts.append(s)")
+            lines.append("    parts.append(b\"\\0\")")
+    lines.append("    return b\"\".join(parts)")
+
+    namespace = {
+        "_pack": CMD_FIXED_STRUCT.pack,
+        "_pack_len": _STRING_LEN_STRUCT.pack,
+        "_FINGERPRINT": struct.unpack(">Q", LowlevelCmd_t._get_packed_fingerprint())[0],
+    }
+    return _compile("\n".join(lines), namespace, "encode_cmd")
+
+
+encode_cmd = _build_cmd_encoder()
+encode_cmd.__doc__ = """一次pack编码整条uwbot_command消息，输入为LowlevelCmd_t或同结构的LowlevelCmd数据类"""
+
+
+def _build_cmd_group_encoders():
+    """为每个命令子结构体生成独立的编码函数，字符串数组并入其所属子结构体"""
+    encoders = []
+    for index, (group, _, fields) in enumerate(CMD_LAYOUT):
+        strings = [(name, dim) for g, name, dim in CMD_STRINGS if g == group]
+        # 字符串位于整条消息末尾，只有最后一个子结构体可以携带字符串
+        assert not strings or index == len(CMD_LAYOUT) - 1
+        func_name = f"encode_{group}"
+        lines = [f"def {func_name}(sub):"]
+        args = []
+        for name, _, dim in fields:
+            if dim:
+                lines.append(f"    {name} = sub.{name}")
+                args.extend(f"{name}[{i}]" for i in range(dim))
+            else:
+                args.append(f"sub.{name}")
+        if not strings:
+            lines.append(f"    return _pack({', '.join(args)})")
+        else:
+            lines.append(f"    parts = [_pack({', '.join(args)})]")
+            for name, dim in strings:
+                lines.append(f"    {name} = sub.{name}")
+                for i in range(dim):
+                    lines.append(f"    s = {name}[{i}].encode('utf-8')")
+                    lines.append("    parts.append(_pack_len(len(s) + 1))")
+                    lines.append("    parts.append(s)")
+                    lines.append("    parts.append(b\"\\0\")")
+            lines.append("    return b\"\".join(parts)")
+        namespace = {
+            "_pack": struct.Struct(">" + _layout_format(((group, None, fields),))).pack,
+            "_pack_len": _STRING_LEN_STRUCT.pack,
+        }
+        encoders.append((group, _compile("\n".join(lines), namespace, func_name)))
+    return tuple(encoders)
+
+
+CMD_GROUP_ENCODERS = _build_cmd_group_encoders()
+_CMD_FINGERPRINT_BYTES = LowlevelCmd_t._get_packed_fingerprint()
+
+
+class CmdEncodeCache:
+    """uwbot_command编码缓存
+
+    按子结构体缓存编码结果，以(子结构体对象, _version)判断是否变化：
+    全部未变化时直接复用上次的整条消息字节；否则只重新编码变化的子结构体再拼接。
+    没有_version属性的输入（如lcm-gen的LowlevelCmd_t）每次都视为已变化。
+    """
+
+    def __init__(self):
+        self._entries = {group: [None, None, b""] for group, _ in CMD_GROUP_ENCODERS}
+        self._message = None
+        self.hits = 0
+        self.misses = 0
+        self.group_encodes = {group: 0 for group, _ in CMD_GROUP_ENCODERS}
+
+    def encode(self, cmd):
+        """返回cmd的编码字节，与encode_cmd(cmd)结果一致"""
+        changed = self._message is None
+        entries = self._entries
+        for group, encoder in CMD_GROUP_ENCODERS:
+            sub = getattr(cmd, group)
+            version = getattr(sub, "_version", None)
+            entry = entries[group]
+            if version is None or entry[0] is not sub or entry[1] != version:
+                entry[0] = sub
+                entry[1] = version
+                entry[2] = encoder(sub)
+                self.group_encodes[group] += 1
+                changed = True
+        if changed:
+            self.misses += 1
+            self._message = _CMD_FINGERPRINT_BYTES + b"".join(entry[2] for entry in entries.values())
+        else:
+            self.hits += 1
+        return self._message
+
+    def stats(self):
+        """缓存统计: 命中/未命中次数、命中率及各子结构体的重新编码次数"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "group_encodes": dict(self.group_encodes),
+        }
+
+
+# =============================================================================
+# 结构体之间的整体拷贝（替代逐字段手写的格式转换）
+# =============================================================================
+def _build_copier(layout, strings, func_name):
+    lines = [f"def {func_name}(src, dst):"]
+    groups = [group for group, _, _ in layout]
+    fields = {group: [(name, dim) for name, _, dim in group_fields] for group, _, group_fields in layout}
+    for group, name, dim in strings:
+        fields[group].append((name, dim))
+    for group in groups:
+        lines.append(f"    s = src.{group}")
+        lines.append(f"    d = dst.{group}")
+        for name, dim in fields[group]:
+            if dim:
+                # 数组按元素写入，保持目标list对象（及其修改追踪）不变
+                lines.append(f"    a = s.{name}")
+                lines.append(f"    b = d.{name}")
+                lines.extend(f"    b[{i}] = a[{i}]" for i in range(dim))
+            else:
+                lines.append(f"    d.{name} = s.{name}")
+    lines.append("    return dst")
+    return _compile("\n".join(lines), {}, func_name)
+
+
+copy_state = _build_copier(STATE_LAYOUT, (), "copy_state")
+copy_state.__doc__ = """把一条状态消息的全部字段拷贝到dst（LowlevelState_t或同结构的数据类），返回dst"""
+
+copy_cmd = _build_copier(CMD_LAYOUT, CMD_STRINGS, "copy_cmd")
+copy_cmd.__doc__ = """把一条控制命令的全部字段拷贝到dst（LowlevelCmd_t或同结构的数据类），返回dst"""
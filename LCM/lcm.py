@@ -1,40 +1,170 @@
 import lcm
+import logging
 import threading
-import sys
+import time
 from .lcm_type.LowlevelState_t import LowlevelState_t
 from .lcm_type.LowlevelCmd_t import LowlevelCmd_t
+from .flat_codec import decode_state_changes, CmdEncodeCache, STATE_GROUP_SPANS, STATE_SIZE, STATE_FINGERPRINT
+
+
+class StateTripleBuffer:
+    """单写单读的无锁三缓冲，用于接收线程与UI线程之间交换状态快照
+
+    写端（LCM接收线程）始终原地写入一个既不是最新发布、也不是读端正在使用的缓冲，
+    写完后以一次元组引用赋值(seq, 缓冲索引)发布，GIL保证该赋值的原子性。
+    读端（UI线程）取最新发布的缓冲并登记为"正在读"，再确认发布未变化，
+    之后该快照在下一次read()之前不会被写端改写，读端无需加锁。
+    """
+
+    def __init__(self, factory):
+        self._buffers = (factory(), factory(), factory())
+        self._latest = (0, 0)  # (seq, 缓冲索引)，只由写端整体替换
+        self._reading = 0  # 读端正在使用的缓冲索引，只由读端修改
+        self._write_index = 1
+
+    def begin_write(self):
+        """写端：取得一个可以原地写入的缓冲"""
+        latest = self._latest[1]
+        reading = self._reading
+        for index in (0, 1, 2):
+            if index != latest and index != reading:
+                self._write_index = index
+                return self._buffers[index]
+
+    def latest_buffer(self):
+        """写端：最新发布的缓冲，写端在下一次发布前不会改写它，可用于与新数据比较"""
+        return self._buffers[self._latest[1]]
+
+    def publish(self):
+        """写端：发布begin_write()取得的缓冲，返回新的seq"""
+        seq = self._latest[0] + 1
+        self._latest = (seq, self._write_index)
+        return seq
+
+    def read(self):
+        """读端：返回(seq, 最新快照)，快照在下一次read()前保持不变，调用方不应修改它"""
+        while True:
+            latest = self._latest
+            self._reading = latest[1]
+            # 登记后再确认一次：若期间写端又发布了新数据，登记的缓冲可能正被改写，重试
+            if self._latest is latest:
+                return latest[0], self._buffers[latest[1]]
+
+    def current(self):
+        """读端：返回上一次read()取得的快照，不切换缓冲"""
+        return self._buffers[self._reading]
+
+    @property
+    def seq(self):
+        """最新发布的序号"""
+        return self._latest[0]
+
 
 class LCMInterface:
     def __init__(self):
         self.lcm = lcm.LCM("udpm://239.255.76.67:7667?ttl=255")
         
-        self.state_mutex = threading.Lock()
         self.cmd_mutex = threading.Lock()
 
-        self.state_simple = LowlevelState_t()
+        # 状态三缓冲：接收线程原地解码并无锁发布，UI线程通过read_state()取一致快照
+        self.state_buffer = StateTripleBuffer(LowlevelState_t)
+        # 每个状态子结构体最近一次发生变化时的seq，只由接收端写入
+        self._group_seq = [0] * len(STATE_GROUP_SPANS)
+        self._has_packet = False  # 是否已收到过有效数据包，第一包的全部子结构体都算作变化
+        self.rejected_packets = 0  # 长度或指纹不符、解码失败而被丢弃的数据包数
+        self._state_listeners = []  # 每个数据包到达时调用的回调(data, seq)，运行在接收端
         self.command_simple = LowlevelCmd_t()
+        # 命令编码缓存：命令未变化时直接复用上次编码的字节
+        self.cmd_cache = CmdEncodeCache()
 
         self.data_init()
         print("LCM initialized successfully")
         
         self.lcm_stop_flag = True #开启lcm设置为False，关闭lcm设置为True
+        self.receive_thread = None
+        self.notifier = None
 
         self.receiveData()
         self.send_data_once()
 
 
     def __del__(self):
-        if hasattr(self, 'receive_thread') and self.receive_thread.is_alive():
-            self.receive_thread.join()
+        self.stop_receive()
 
     #接收：执行一次，订阅uwbot_state
     def receiveData(self):
         self.lcm.subscribe("uwbot_state", self.state_callback)
 
     def state_callback(self, channel, data):
-        msg = LowlevelState_t.decode(data)
-        with self.state_mutex:
-            self.state_simple = msg
+        # 先校验长度和指纹：无效的数据包不改动任何状态（变化记录、缓冲、历史）
+        if len(data) != STATE_SIZE or not data.startswith(STATE_FINGERPRINT):
+            self._reject_packet(f"长度{len(data)}或指纹不符")
+            return
+        # 原地解码到空闲缓冲，并与上一包的快照逐字段比较，稳态下不再为每条消息分配新的对象；
+        # 未发布的缓冲即使写了一半也不会被读端看到
+        buffer = self.state_buffer
+        try:
+            mask = decode_state_changes(data, buffer.begin_write(), buffer.latest_buffer())
+        except Exception as e:
+            self._reject_packet(f"解码失败: {e}")
+            return
+        if not self._has_packet:
+            self._has_packet = True
+            mask = (1 << len(STATE_GROUP_SPANS)) - 1
+        # 记录发生变化的子结构体（必须在发布之前写入）
+        seq = buffer.seq + 1
+        group_seq = self._group_seq
+        index = 0
+        while mask:
+            if mask & 1:
+                group_seq[index] = seq
+            mask >>= 1
+            index += 1
+        seq = buffer.publish()
+        for listener in self._state_listeners:
+            try:
+                listener(data, seq)
+            except Exception:
+                logging.exception(f"uwbot_state数据包回调失败: {listener}")
+
+    def _reject_packet(self, reason):
+        """丢弃无效的uwbot_state数据包；日志只在累计数为1、2、4、8…时记录，避免持续的坏包刷屏"""
+        self.rejected_packets += 1
+        count = self.rejected_packets
+        if count & (count - 1) == 0:
+            logging.warning(f"丢弃无效的uwbot_state数据包（{reason}），累计{count}个")
+
+    def add_state_listener(self, listener):
+        """注册原始数据包回调listener(data, seq)，以完整包率在接收端（线程模式下为接收线程）调用
+
+        回调必须足够快且不能访问Qt控件，用于把数据包写入遥测历史等无锁结构。
+        """
+        self._state_listeners.append(listener)
+
+    def changed_mask(self, since_seq):
+        """返回seq大于since_seq的数据包中发生过变化的状态子结构体掩码
+
+        第i位对应STATE_GROUP_SPANS[i]，与robot_data中状态分组的事件位一致。
+        """
+        group_seq = self._group_seq
+        mask = 0
+        for index in range(len(group_seq)):
+            if group_seq[index] > since_seq:
+                mask |= 1 << index
+        return mask
+
+    def read_state(self):
+        """UI线程读取最新状态，返回(seq, LowlevelState_t快照)，无锁"""
+        return self.state_buffer.read()
+
+    @property
+    def state_simple(self):
+        """读端当前持有的状态快照（兼容旧接口，仅在UI线程使用）
+
+        不调用read()：UI线程只能由update_data切换快照，否则robot_data中仍在使用的
+        快照可能被接收线程改写。
+        """
+        return self.state_buffer.current()
 
     # def cmd_callback(self, channel, data):
     #     msg = LowlevelCmd_t.decode(data)
@@ -42,18 +172,82 @@ class LCMInterface:
     #         self.command_simple = msg
 
     #创建一个新线程，调用 lcm 对象的 handle_receive 方法，阻塞
-    def handle_receive(self):
+    def handle_receive(self, timeout=100):
+        """接收循环，每次最多等待timeout毫秒，lcm_stop_flag置位后在一个超时周期内退出"""
         while not self.lcm_stop_flag:
-            self.lcm.handle()
+            try:
+                self.lcm.handle_timeout(timeout)
+            except Exception:
+                # 单条消息的错误不应结束接收线程；等待一个超时周期，避免底层持续出错时空转
+                logging.exception("LCM接收处理失败")
+                time.sleep(timeout / 1000.0)
+
+    def start_receive_thread(self, timeout=100):
+        """线程模式：在独立线程中运行接收循环，可通过stop_receive()干净退出"""
+        self.lcm_stop_flag = False
+        self.receive_thread = threading.Thread(target=self.handle_receive, args=(timeout,), daemon=True)
+        self.receive_thread.start()
+
+    def start_receive_notifier(self, parent=None, max_drain=256):
+        """notifier模式：把LCM的文件描述符注册到Qt事件循环，有数据到达时在UI线程中处理
+
+        不再需要接收线程，state_callback与界面更新运行在同一线程。
+        """
+        from PyQt5.QtCore import QSocketNotifier
+
+        self.lcm_stop_flag = False
+        self._max_drain = max_drain
+        self.notifier = QSocketNotifier(self.lcm.fileno(), QSocketNotifier.Read, parent)
+        self.notifier.activated.connect(self._drain_messages)
+
+    def _drain_messages(self, *args):
+        """处理当前已到达的全部消息（不等待），单次最多max_drain条，剩余的由下一次事件处理"""
+        for _ in range(self._max_drain):
+            # 异常不能逃出Qt槽函数（PyQt5会直接终止程序），记录后留给下一次事件处理
+            try:
+                if self.lcm_stop_flag or self.lcm.handle_timeout(0) <= 0:
+                    break
+            except Exception:
+                logging.exception("LCM接收处理失败")
+                break
+
+    def stop_receive(self, timeout=1.0):
+        """停止接收：关闭notifier或等待接收线程退出"""
+        self.lcm_stop_flag = True
+        notifier = getattr(self, 'notifier', None)
+        if notifier is not None:
+            notifier.setEnabled(False)
+            self.notifier = None
+        thread = getattr(self, 'receive_thread', None)
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout)
 
     #定时发送send_data_once：100hz，放到ui主线程
-    def send_data_once(self):
+    def send_data_once(self, cmd=None):
+        """发送一次uwbot_command并返回发送的字节，cmd为空时发送command_simple
+
+        cmd可以直接传入robot_data中的LowlevelCmd数据类，其子结构体带版本号，
+        未变化的子结构体复用缓存的编码结果。
+        """
         with self.cmd_mutex:
-            self.lcm.publish("uwbot_command", self.command_simple.encode())
+            if cmd is None:
+                cmd = self.command_simple
+            data = self.cmd_cache.encode(cmd)
+            self.lcm.publish("uwbot_command", data)
+            return data
+
+    def get_cmd_cache_stats(self):
+        """获取命令编码缓存的命中统计"""
+        with self.cmd_mutex:
+            return self.cmd_cache.stats()
 
 
     def data_init(self):
-        """LowlevelCmd_t数据初始化"""
+        """LowlevelCmd_t数据初始化
+
+        状态不在这里初始化：三缓冲中的快照由LowlevelState_t()创建，各字段已是0，
+        发布后的快照可能正被读端使用，不能再直接改写。
+        """
         # 初始化浮游模式命令
         self.command_simple.cmd_floating_mode.cmd_floating_vel_x = 0.0
         self.command_simple.cmd_floating_mode.cmd_floating_vel_y = 0.0
@@ -95,148 +289,3 @@ class LCMInterface:
         self.command_simple.cmd_camera.cmd_camera_snapshot = [ 0 for dim0 in range(2) ]
         self.command_simple.cmd_camera.cmd_storage_path = [ "" for dim0 in range(2) ]
         self.command_simple.cmd_camera.cmd_camera_path = [ "" for dim0 in range(2) ]
-        
-        
-        """LowlevelState_t数据初始化"""
-        #初始化机器人位姿
-        self.state_simple.state_robot.sta_position_x = 0.0
-        self.state_simple.state_robot.sta_position_y = 0.0
-        self.state_simple.state_robot.sta_position_z = 0.0
-        self.state_simple.state_robot.sta_roll = 0.0
-        self.state_simple.state_robot.sta_pitch = 0.0
-        self.state_simple.state_robot.sta_yaw = 0.0
-
-        #初始化浮游模式状态
-        self.state_simple.state_floating_mode.sta_floating_vel_x = 0.0
-        self.state_simple.state_floating_mode.sta_floating_vel_y = 0.0
-        self.state_simple.state_floating_mode.sta_floating_vel_z = 0.0
-        self.state_simple.state_floating_mode.sta_floating_angular_x = 0.0
-        self.state_simple.state_floating_mode.sta_floating_angular_y = 0.0
-        self.state_simple.state_floating_mode.sta_floating_angular_z = 0.0
-        self.state_simple.state_floating_mode.sta_thruster_power = [ 0.0 for dim0 in range(4) ]
-        self.state_simple.state_floating_mode.sta_thruster_temp = [ 0.0 for dim0 in range(4) ]
-
-        #初始化轮式模式状态
-        self.state_simple.state_wheel_mode.sta_wheel_linear_vel = 0.0
-        self.state_simple.state_wheel_mode.sta_wheel_angular_vel = 0.0
-        self.state_simple.state_wheel_mode.sta_motor_data = [ 0.0 for dim0 in range(3) ]
-        self.state_simple.state_wheel_mode.sta_motor_temp = [ 0.0 for dim0 in range(3) ]
-
-        #初始化电磁铁状态
-        self.state_simple.state_electromagnet.sta_electromagnet_enable = 0.0
-        self.state_simple.state_electromagnet.sta_electromagnet_voltage = 0.0
-
-        #初始化清洗状态
-        self.state_simple.state_brush.sta_brush_enable = 0.0
-        self.state_simple.state_brush.sta_brush_power = 0.0
-        self.state_simple.state_brush.sta_water_enable = 0.0
-        self.state_simple.state_brush.sta_water_flow = 0.0
-
-        #初始化系统状态
-        self.state_simple.state_system.sta_system_voltage = 0.0
-        self.state_simple.state_system.sta_system_current = 0.0
-        self.state_simple.state_system.sta_system_power = 0.0
-        self.state_simple.state_system.sta_comm_status = 0
-        self.state_simple.state_system.sta_communication_status = 0
-        self.state_simple.state_system.sta_send_time = 0
-        self.state_simple.state_system.sta_packet_loss = 0
-        self.state_simple.state_system.sta_leak_detected = 0
-        self.state_simple.state_system.sta_uptime = 0
-
-    def _convert_cmd_to_lcm_format(self, ui_cmd):
-        """将UI的LowlevelCmd数据类转换为LCM的LowlevelCmd_t格式"""
-        lcm_cmd = LowlevelCmd_t()
-        
-        # 转换浮游模式命令
-        lcm_cmd.cmd_floating_mode.cmd_floating_vel_x = ui_cmd.cmd_floating_mode.cmd_floating_vel_x
-        lcm_cmd.cmd_floating_mode.cmd_floating_vel_y = ui_cmd.cmd_floating_mode.cmd_floating_vel_y
-        lcm_cmd.cmd_floating_mode.cmd_floating_vel_z = ui_cmd.cmd_floating_mode.cmd_floating_vel_z
-        lcm_cmd.cmd_floating_mode.cmd_floating_angular_roll = ui_cmd.cmd_floating_mode.cmd_floating_angular_roll
-        lcm_cmd.cmd_floating_mode.cmd_floating_angular_yaw = ui_cmd.cmd_floating_mode.cmd_floating_angular_yaw
-        lcm_cmd.cmd_floating_mode.cmd_floating_angular_pitch = ui_cmd.cmd_floating_mode.cmd_floating_angular_pitch
-        lcm_cmd.cmd_floating_mode.cmd_depth_hold = ui_cmd.cmd_floating_mode.cmd_depth_hold
-        lcm_cmd.cmd_floating_mode.cmd_target_depth = ui_cmd.cmd_floating_mode.cmd_target_depth
-        lcm_cmd.cmd_floating_mode.cmd_floating_heading_hold = ui_cmd.cmd_floating_mode.cmd_floating_heading_hold
-        lcm_cmd.cmd_floating_mode.cmd_target_roll = ui_cmd.cmd_floating_mode.cmd_target_roll
-        lcm_cmd.cmd_floating_mode.cmd_target_yaw = ui_cmd.cmd_floating_mode.cmd_target_yaw
-        lcm_cmd.cmd_floating_mode.cmd_target_pitch = ui_cmd.cmd_floating_mode.cmd_target_pitch
-        
-        # 转换轮式模式命令
-        lcm_cmd.cmd_wheel_mode.cmd_wheel_linear_vel = ui_cmd.cmd_wheel_mode.cmd_wheel_linear_vel
-        lcm_cmd.cmd_wheel_mode.cmd_wheel_angular_vel = ui_cmd.cmd_wheel_mode.cmd_wheel_angular_vel
-        lcm_cmd.cmd_wheel_mode.cmd_wheel_heading_hold = ui_cmd.cmd_wheel_mode.cmd_wheel_heading_hold
-        lcm_cmd.cmd_wheel_mode.cmd_target_heading = ui_cmd.cmd_wheel_mode.cmd_target_heading
-        
-        # 转换电磁铁命令
-        lcm_cmd.cmd_electromagnet.cmd_electromagnet_enable = ui_cmd.cmd_electromagnet.cmd_electromagnet_enable
-        lcm_cmd.cmd_electromagnet.cmd_electromagnet_voltage = ui_cmd.cmd_electromagnet.cmd_electromagnet_voltage
-        
-        # 转换清洗命令
-        lcm_cmd.cmd_brush.cmd_brush_enable = ui_cmd.cmd_brush.cmd_brush_enable
-        lcm_cmd.cmd_brush.cmd_brush_power = ui_cmd.cmd_brush.cmd_brush_power
-        lcm_cmd.cmd_brush.cmd_water_enable = ui_cmd.cmd_brush.cmd_water_enable
-        lcm_cmd.cmd_brush.cmd_water_flow = ui_cmd.cmd_brush.cmd_water_flow
-        
-        # 转换相机命令
-        lcm_cmd.cmd_camera.cmd_camera_enable = ui_cmd.cmd_camera.cmd_camera_enable
-        lcm_cmd.cmd_camera.cmd_camera_zoom = ui_cmd.cmd_camera.cmd_camera_zoom
-        lcm_cmd.cmd_camera.cmd_camera_record = ui_cmd.cmd_camera.cmd_camera_record
-        lcm_cmd.cmd_camera.cmd_camera_record_time = ui_cmd.cmd_camera.cmd_camera_record_time
-        lcm_cmd.cmd_camera.cmd_camera_snapshot = ui_cmd.cmd_camera.cmd_camera_snapshot
-        lcm_cmd.cmd_camera.cmd_storage_path = ui_cmd.cmd_camera.cmd_storage_path
-        lcm_cmd.cmd_camera.cmd_camera_path = ui_cmd.cmd_camera.cmd_camera_path
-        
-        return lcm_cmd
-
-    def _convert_state_to_ui_format(self, lcm_state):
-        """将LCM的LowlevelState_t格式转换为UI的LowlevelState dataclass格式"""
-        ui_state = LowlevelState_t()
-        
-        # 转换机器人位姿状态
-        ui_state.state_robot.sta_position_x = lcm_state.state_robot.sta_position_x
-        ui_state.state_robot.sta_position_y = lcm_state.state_robot.sta_position_y
-        ui_state.state_robot.sta_position_z = lcm_state.state_robot.sta_position_z
-        ui_state.state_robot.sta_roll = lcm_state.state_robot.sta_roll
-        ui_state.state_robot.sta_pitch = lcm_state.state_robot.sta_pitch
-        ui_state.state_robot.sta_yaw = lcm_state.state_robot.sta_yaw
-        
-        # 转换浮游模式状态
-        ui_state.state_floating_mode.sta_floating_vel_x = lcm_state.state_floating_mode.sta_floating_vel_x
-        ui_state.state_floating_mode.sta_floating_vel_y = lcm_state.state_floating_mode.sta_floating_vel_y
-        ui_state.state_floating_mode.sta_floating_vel_z = lcm_state.state_floating_mode.sta_floating_vel_z
-        ui_state.state_floating_mode.sta_floating_angular_x = lcm_state.state_floating_mode.sta_floating_angular_x
-        ui_state.state_floating_mode.sta_floating_angular_y = lcm_state.state_floating_mode.sta_floating_angular_y
-        ui_state.state_floating_mode.sta_floating_angular_z = lcm_state.state_floating_mode.sta_floating_angular_z
-        # 确保推进器数据是列表而不是元组
-        ui_state.state_floating_mode.sta_thruster_power = list(lcm_state.state_floating_mode.sta_thruster_power)
-        ui_state.state_floating_mode.sta_thruster_temp = list(lcm_state.state_floating_mode.sta_thruster_temp)
-        
-        # 转换轮式模式状态
-        ui_state.state_wheel_mode.sta_wheel_linear_vel = lcm_state.state_wheel_mode.sta_wheel_linear_vel
-        ui_state.state_wheel_mode.sta_wheel_angular_vel = lcm_state.state_wheel_mode.sta_wheel_angular_vel
-        # 确保电机数据是列表而不是元组
-        ui_state.state_wheel_mode.sta_motor_data = list(lcm_state.state_wheel_mode.sta_motor_data)
-        ui_state.state_wheel_mode.sta_motor_temp = list(lcm_state.state_wheel_mode.sta_motor_temp)
-        
-        # 转换电磁铁状态
-        ui_state.state_electromagnet.sta_electromagnet_enable = int(lcm_state.state_electromagnet.sta_electromagnet_enable)
-        ui_state.state_electromagnet.sta_electromagnet_voltage = int(lcm_state.state_electromagnet.sta_electromagnet_voltage)
-        
-        # 转换清洗状态
-        ui_state.state_brush.sta_brush_enable = int(lcm_state.state_brush.sta_brush_enable)
-        ui_state.state_brush.sta_brush_power = int(lcm_state.state_brush.sta_brush_power)
-        ui_state.state_brush.sta_water_enable = int(lcm_state.state_brush.sta_water_enable)
-        ui_state.state_brush.sta_water_flow = int(lcm_state.state_brush.sta_water_flow)
-        
-        # 转换系统状态
-        ui_state.state_system.sta_system_voltage = lcm_state.state_system.sta_system_voltage
-        ui_state.state_system.sta_system_current = lcm_state.state_system.sta_system_current
-        ui_state.state_system.sta_system_power = lcm_state.state_system.sta_system_power
-        ui_state.state_system.sta_comm_status = lcm_state.state_system.sta_comm_status
-        ui_state.state_system.sta_communication_status = lcm_state.state_system.sta_communication_status
-        ui_state.state_system.sta_send_time = lcm_state.state_system.sta_send_time
-        ui_state.state_system.sta_packet_loss = lcm_state.state_system.sta_packet_loss
-        ui_state.state_system.sta_leak_detected = lcm_state.state_system.sta_leak_detected
-        ui_state.state_system.sta_uptime = lcm_state.state_system.sta_uptime
-        
-        return ui_state
\ No newline at end of file
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LCM消息模式代码生成器
+读取 lcm_type/cmd_lcmt.lcm 与 lcm_type/state_lcmt.lcm，生成：
+  - LCM/lowlevel_schema.py        扁平编解码使用的消息布局与字段元数据表（路径、类型、单位、偏移）
+  - messages/LowlevelState.py     UI状态数据类（__slots__）
+  - messages/LowlevelCmd.py       UI控制命令数据类（__slots__，带修改追踪）
+lcm_type/*.py 仍由官方 lcm-gen 生成，本工具不覆盖。
+
+修改 .lcm 文件后运行: python -m LCM.lcm_gen
+只检查生成文件是否过期（不写盘）: python -m LCM.lcm_gen --check
+"""
+
+import argparse
+import difflib
+import os
+import re
+import sys
+from collections import namedtuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LCM_DIR = os.path.join(ROOT, "LCM", "lcm_type")
+SCHEMA_FILES = ("cmd_lcmt.lcm", "state_lcmt.lcm")
+
+SCHEMA_OUTPUT = os.path.join(ROOT, "LCM", "lowlevel_schema.py")
+STATE_OUTPUT = os.path.join(ROOT, "messages", "LowlevelState.py")
+CMD_OUTPUT = os.path.join(ROOT, "messages", "LowlevelCmd.py")
+
+# LCM基本类型: (struct格式符, 元数据类型名, Python类型名, 默认值)
+PRIMITIVES = {
+    "int8_t": ("b", "int8", "int", 0),
+    "int16_t": ("h", "int16", "int", 0),
+    "int32_t": ("i", "int32", "int", 0),
+    "int64_t": ("q", "int64", "int", 0),
+    "byte": ("B", "uint8", "int", 0),
+    "boolean": ("b", "bool", "int", 0),
+    "float": ("f", "float32", "float", 0.0),
+    "double": ("d", "float64", "float", 0.0),
+    "string": (None, "string", "str", ""),
+}
+
+# UI数据类中与零值不同的默认值（表示"尚未收到数据"等），按 子结构体.字段 指定
+STATE_DEFAULTS = {
+    "state_floating_mode.sta_thruster_temp": 25.0,
+    "state_wheel_mode.sta_motor_temp": 25.0,
+    "state_electromagnet.sta_electromagnet_enable": -1,
+    "state_brush.sta_brush_enable": -1,
+    "state_brush.sta_water_enable": -1,
+    "state_system.sta_system_voltage": -1.0,
+    "state_system.sta_system_current": -1.0,
+    "state_system.sta_system_power": -1.0,
+    "state_system.sta_comm_status": -1,
+    "state_system.sta_communication_status": 1,
+    "state_system.sta_send_time": -1,
+    "state_system.sta_leak_detected": -1,
+}
+CMD_DEFAULTS = {}
+
+Field = namedtuple("Field", "type name dim comment section")
+Struct = namedtuple("Struct", "name doc fields")
+
+_BLOCK_COMMENT = re.compile(r"/\*\*?(.*?)\*/", re.S)
+_STRUCT_BEGIN = re.compile(r"^struct\s+(\w+)\s*\{")
+_FIELD = re.compile(r"^(\w+)\s+(\w+)\s*(?:\[\s*(\d+)\s*\])?\s*;\s*(?://\s*(.*))?$")
+_UNIT = re.compile(r"\(([^()]*)\)\s*$")
+
+
+def _clean_doc(text):
+    lines = [line.strip().lstrip("*").strip() for line in text.strip().splitlines()]
+    return "\n".join(line for line in lines if line)
+
+
+def parse_lcm(path):
+    """解析.lcm文件（结构体、基本类型字段、定长数组、嵌套结构体），返回 (文件说明, [Struct, ...])"""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    file_doc = ""
+    structs = []
+    current = None
+    pending_doc = ""
+    section = ""
+    # 块注释单独成行出现，先替换成占位行以便逐行解析
+    docs = []
+
+    def keep_doc(match):
+        docs.append(_clean_doc(match.group(1)))
+        return f"\n@doc{len(docs) - 1}\n"
+
+    for raw in _BLOCK_COMMENT.sub(keep_doc, text).splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        if line.startswith("@doc"):
+            doc = docs[int(line[4:])]
+            if not structs and current is None and not file_doc:
+                file_doc = doc
+            else:
+                pending_doc = doc
+            continue
+        if current is None:
+            match = _STRUCT_BEGIN.match(line)
+            if not match:
+                raise ValueError(f"{path}: 无法解析: {line}")
+            current = Struct(match.group(1), pending_doc, [])
+            pending_doc = ""
+            section = ""
+            continue
+        if line.startswith("}"):
+            structs.append(current)
+            current = None
+            continue
+        if line.startswith("//"):
+            section = line[2:].strip()
+            continue
+        match = _FIELD.match(line)
+        if not match:
+            raise ValueError(f"{path}: 无法解析字段: {line}")
+        type_name, name, dim, comment = match.groups()
+        current.fields.append(Field(type_name, name, int(dim) if dim else None, (comment or "").strip(), section))
+        section = ""
+    return file_doc, structs
+
+
+def _message(structs):
+    """找到顶层消息结构体：字段全部是其他结构体，且子结构体只含基本类型"""
+    by_name = {s.name: s for s in structs}
+    tops = [s for s in structs if s.fields and all(f.type in by_name for f in s.fields)]
+    if len(tops) != 1:
+        raise ValueError("每个.lcm文件必须恰好有一个顶层消息结构体")
+    top = tops[0]
+    groups = []
+    for f in top.fields:
+        sub = by_name[f.type]
+        for field in sub.fields:
+            if field.type not in PRIMITIVES:
+                raise ValueError(f"{sub.name}.{field.name}: 只支持两层结构体")
+        groups.append((f.name, sub))
+    return top, groups
+
+
+def _unit(comment):
+    match = _UNIT.search(comment)
+    if match:
+        return match.group(1).strip()
+    if "%" in comment:
+        return "%"
+    return ""
+
+
+def _description(comment):
+    return _UNIT.sub("", comment).strip()
+
+
+def build_model(path):
+    """解析单个.lcm文件，返回消息模型"""
+    file_doc, structs = parse_lcm(path)
+    top, groups = _message(structs)
+    layout = []
+    strings = []
+    fields = []
+    offset = 8  # 跳过8字节指纹
+    for group, sub in groups:
+        layout_fields = []
+        for field in sub.fields:
+            code, dtype, _, _ = PRIMITIVES[field.type]
+            if code is None:
+                strings.append((group, field.name, field.dim))
+                for i in range(field.dim or 1):
+                    suffix = f"[{i}]" if field.dim else ""
+                    fields.append((f"{group}.{field.name}{suffix}", group, field.name, i if field.dim else None,
+                                   dtype, None, _unit(field.comment), None, _description(field.comment)))
+                continue
+            if strings:
+                # 字符串为变长，扁平编码要求它们位于消息末尾
+                raise ValueError(f"{sub.name}.{field.name}: 字符串字段之后不能再有定长字段")
+            layout_fields.append((field.name, code, field.dim))
+            size = {"b": 1, "B": 1, "h": 2, "i": 4, "q": 8, "f": 4, "d": 8}[code]
+            for i in range(field.dim or 1):
+                suffix = f"[{i}]" if field.dim else ""
+                fields.append((f"{group}.{field.name}{suffix}", group, field.name, i if field.dim else None,
+                               dtype, code, _unit(field.comment), offset, _description(field.comment)))
+                offset += size
+        layout.append((group, sub.name, tuple(layout_fields)))
+    return {
+        "file_doc": file_doc,
+        "top": top,
+        "groups": groups,
+        "layout": tuple(layout),
+        "strings": tuple(strings),
+        "fields": tuple(fields),
+        "fixed_size": offset,
+    }
+
+
+# =============================================================================
+# 代码输出
+# =============================================================================
+HEADER = '''#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# 本文件由 LCM/lcm_gen.py 根据 {sources} 自动生成，请勿手动修改
+'''
+
+
+def _render_layout(name, layout):
+    lines = [f"{name} = ("]
+    for group, cls_name, fields in layout:
+        lines.append(f"    ({group!r}, {cls_name!r}, (")
+        for field in fields:
+            lines.append(f"        {field!r},")
+        lines.append("    )),")
+    lines.append(")")
+    return lines
+
+
+def _render_fields(name, fields):
+    lines = [f"{name} = ("]
+    for field in fields:
+        lines.append(f"    FieldInfo{field!r},")
+    lines.append(")")
+    return lines
+
+
+def render_schema(state, cmd):
+    lines = [HEADER.format(sources="state_lcmt.lcm / cmd_lcmt.lcm").rstrip("\n")]
+    lines += [
+        '"""',
+        "LCM消息模式",
+        "消息布局供 LCM/flat_codec.py 生成扁平编解码函数；字段元数据表供界面按路径访问字段。",
+        '"""',
+        "",
+        "from collections import namedtuple",
+        "",
+        "# 字段元数据: 路径, 子结构体, 字段名, 数组下标(标量为None), 类型, struct格式符, 单位, 消息内字节偏移(含8字节指纹，变长字段为None), 说明",
+        'FieldInfo = namedtuple("FieldInfo", "path group name index dtype code unit offset description")',
+        "",
+        "# 消息布局: (子结构体属性名, lcm类型名, ((字段名, struct格式符, 数组长度或None), ...))",
+    ]
+    lines += _render_layout("STATE_LAYOUT", state["layout"])
+    lines.append("")
+    lines.append("# 命令消息的定长部分；字符串数组为变长，按CMD_STRINGS顺序追加在末尾")
+    lines += _render_layout("CMD_LAYOUT", cmd["layout"])
+    lines.append("")
+    lines.append("# (子结构体属性名, 字段名, 数组长度)")
+    lines.append("CMD_STRINGS = (")
+    lines += [f"    {item!r}," for item in cmd["strings"]]
+    lines.append(")")
+    lines.append("")
+    lines.append(f"STATE_SIZE = {state['fixed_size']}")
+    lines.append(f"CMD_FIXED_SIZE = {cmd['fixed_size']}")
+    lines.append("")
+    lines += _render_fields("STATE_FIELDS", state["fields"])
+    lines.append("")
+    lines += _render_fields("CMD_FIELDS", cmd["fields"])
+    lines.append("")
+    lines.append("FIELDS_BY_PATH = {field.path: field for field in STATE_FIELDS + CMD_FIELDS}")
+    return "\n".join(lines) + "\n"
+
+
+def _default_literal(field, py_type, override):
+    value = PRIMITIVES[field.type][3] if override is None else override
+    if py_type == "float":
+        value = float(value)
+    if field.dim:
+        return f"field(default_factory=lambda: [{value!r}] * {field.dim})"
+    return repr(value)
+
+
+def render_dataclasses(model, defaults, doc, base=None):
+    """生成UI数据类模块"""
+    top = model["top"]
+    lines = [HEADER.format(sources=os.path.basename(model["source"])).rstrip("\n"), '"""', doc, '"""', ""]
+    lines.append("from dataclasses import dataclass, field")
+    lines.append("from typing import List")
+    lines.append(f"from tracked import {base + ', ' if base else ''}slotted")
+    lines.append("")
+    for group, sub in model["groups"]:
+        cls_name = sub.name[:-2] if sub.name.endswith("_t") else sub.name
+        lines.append(f'"""{sub.doc}"""')
+        lines.append("@slotted")
+        lines.append("@dataclass")
+        lines.append(f"class {cls_name}({base}):" if base else f"class {cls_name}:")
+        for field in sub.fields:
+            if field.section:
+                lines.append(f"    # {field.section}")
+            _, _, py_type, _ = PRIMITIVES[field.type]
+            annotation = f"List[{py_type}]" if field.dim else py_type
+            default = _default_literal(field, py_type, defaults.get(f"{group}.{field.name}"))
+            comment = f"  # {field.comment}" if field.comment else ""
+            lines.append(f"    {field.name}: {annotation} = {default}{comment}")
+        lines.append("")
+    top_name = top.name[:-2] if top.name.endswith("_t") else top.name
+    lines.append("@slotted")
+    lines.append("@dataclass")
+    lines.append(f"class {top_name}:")
+    lines.append(f'    """{top.doc}"""')
+    for group, sub in model["groups"]:
+        cls_name = sub.name[:-2] if sub.name.endswith("_t") else sub.name
+        lines.append(f"    {group}: {cls_name} = field(default_factory={cls_name})")
+    return "\n".join(lines) + "\n"
+
+
+def render_outputs(schema_path=SCHEMA_OUTPUT, state_path=STATE_OUTPUT, cmd_path=CMD_OUTPUT):
+    """解析.lcm文件并渲染全部生成文件，返回 {输出路径: 源码} （不写盘）"""
+    models = {}
+    for name in SCHEMA_FILES:
+        model = build_model(os.path.join(LCM_DIR, name))
+        model["source"] = name
+        models[model["top"].name] = model
+    state = models["LowlevelState_t"]
+    cmd = models["LowlevelCmd_t"]
+    return {
+        schema_path: render_schema(state, cmd),
+        state_path: render_dataclasses(state, STATE_DEFAULTS, state["file_doc"]),
+        cmd_path: render_dataclasses(cmd, CMD_DEFAULTS, cmd["file_doc"], base="TrackedStruct"),
+    }
+
+
+def generate(schema_path=SCHEMA_OUTPUT, state_path=STATE_OUTPUT, cmd_path=CMD_OUTPUT):
+    """解析.lcm文件并写出全部生成文件，返回写出的文件路径列表"""
+    outputs = render_outputs(schema_path, state_path, cmd_path)
+    for path, source in outputs.items():
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(source)
+    return list(outputs)
+
+
+def check(schema_path=SCHEMA_OUTPUT, state_path=STATE_OUTPUT, cmd_path=CMD_OUTPUT):
+    """对比生成结果与磁盘上的文件，不写盘，返回 {路径: unified diff文本}，只含有差异的文件"""
+    diffs = {}
+    for path, source in render_outputs(schema_path, state_path, cmd_path).items():
+        try:
+            with open(path, encoding="utf-8") as f:
+                current = f.read()
+        except FileNotFoundError:
+            current = ""
+        if current != source:
+            rel = os.path.relpath(path, ROOT)
+            diffs[path] = "".join(difflib.unified_diff(
+                current.splitlines(keepends=True), source.splitlines(keepends=True),
+                fromfile=f"a/{rel}", tofile=f"b/{rel}"))
+    return diffs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="根据 lcm_type/*.lcm 生成 lowlevel_schema.py 与 UI 数据类")
+    parser.add_argument("--schema-out", default=SCHEMA_OUTPUT, metavar="PATH",
+                        help="消息布局表输出路径（默认: %(default)s）")
+    parser.add_argument("--state-out", default=STATE_OUTPUT, metavar="PATH",
+                        help="状态数据类输出路径（默认: %(default)s）")
+    parser.add_argument("--cmd-out", default=CMD_OUTPUT, metavar="PATH",
+                        help="控制命令数据类输出路径（默认: %(default)s）")
+    parser.add_argument("--check", action="store_true",
+                        help="只对比生成结果与现有文件并打印差异，不写盘；有差异时返回1")
+    args = parser.parse_args(argv)
+    paths = (args.schema_out, args.state_out, args.cmd_out)
+
+    if args.check:
+        diffs = check(*paths)
+        for text in diffs.values():
+            sys.stdout.write(text)
+        for path in paths:
+            status = "需要重新生成" if path in diffs else "已是最新"
+            print(f"{status}: {os.path.relpath(path, ROOT)}")
+        return 1 if diffs else 0
+
+    for path in generate(*paths):
+        print(f"已生成: {os.path.relpath(path, ROOT)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# 本文件由 LCM/lcm_gen.py 根据 state_lcmt.lcm / cmd_lcmt.lcm 自动生成，请勿手动修改
+"""
+LCM消息模式
+消息布局供 LCM/flat_codec.py 生成扁平编解码函数；字段元数据表供界面按路径访问字段。
+"""
+
+from collections import namedtuple
+
+# 字段元数据: 路径, 子结构体, 字段名, 数组下标(标量为None), 类型, struct格式符, 单位, 消息内字节偏移(含8字节指纹，变长字段为None), 说明
+FieldInfo = namedtuple("FieldInfo", "path group name index dtype code unit offset description")
+
+# 消息布局: (子结构体属性名, lcm类型名, ((字段名, struct格式符, 数组长度或None), ...))
+STATE_LAYOUT = (
+    ('state_robot', 'state_robot_t', (
+        ('sta_position_x', 'f', None),
+        ('sta_position_y', 'f', None),
+        ('sta_position_z', 'f', None),
+        ('sta_roll', 'f', None),
+        ('sta_pitch', 'f', None),
+        ('sta_yaw', 'f', None),
+    )),
+    ('state_floating_mode', 'state_floating_mode_t', (
+        ('sta_floating_vel_x', 'f', None),
+        ('sta_floating_vel_y', 'f', None),
+        ('sta_floating_vel_z', 'f', None),
+        ('sta_floating_angular_x', 'f', None),
+        ('sta_floating_angular_y', 'f', None),
+        ('sta_floating_angular_z', 'f', None),
+        ('sta_thruster_power', 'f', 4),
+        ('sta_thruster_temp', 'f', 4),
+    )),
+    ('state_wheel_mode', 'state_wheel_mode_t', (
+        ('sta_wheel_linear_vel', 'f', None),
+        ('sta_wheel_angular_vel', 'f', None),
+        ('sta_motor_data', 'f', 3),
+        ('sta_motor_temp', 'f', 3),
+    )),
+    ('state_electromagnet', 'state_electromagnet_t', (
+        ('sta_electromagnet_enable', 'i', None),
+        ('sta_electromagnet_voltage', 'i', None),
+    )),
+    ('state_brush', 'state_brush_t', (
+        ('sta_brush_power', 'i', None),
+        ('sta_brush_enable', 'i', None),
+        ('sta_water_flow', 'i', None),
+        ('sta_water_enable', 'i', None),
+    )),
+    ('state_system', 'state_system_t', (
+        ('sta_system_voltage', 'f', None),
+        ('sta_system_current', 'f', None),
+        ('sta_system_power', 'f', None),
+        ('sta_comm_status', 'i', None),
+        ('sta_communication_status', 'i', None),
+        ('sta_send_time', 'q', None),
+        ('sta_packet_loss', 'i', None),
+        ('sta_leak_detected', 'i', None),
+        ('sta_uptime', 'i', None),
+    )),
+)
+
+# 命令消息的定长部分；字符串数组为变长，按CMD_STRINGS顺序追加在末尾
+CMD_LAYOUT = (
+    ('cmd_floating_mode', 'cmd_floating_mode_t', (
+        ('cmd_floating_vel_x', 'f', None),
+        ('cmd_floating_vel_y', 'f', None),
+        ('cmd_floating_vel_z', 'f', None),
+        ('cmd_floating_angular_roll', 'f', None),
+        ('cmd_floating_angular_yaw', 'f', None),
+        ('cmd_floating_angular_pitch', 'f', None),
+        ('cmd_depth_hold', 'i', None),
+        ('cmd_target_depth', 'f', None),
+        ('cmd_floating_heading_hold', 'i', None),
+        ('cmd_target_roll', 'f', None),
+        ('cmd_target_yaw', 'f', None),
+        ('cmd_target_pitch', 'f', None),
+    )),
+    ('cmd_wheel_mode', 'cmd_wheel_mode_t', (
+        ('cmd_wheel_linear_vel', 'f', None),
+        ('cmd_wheel_angular_vel', 'f', None),
+        ('cmd_wheel_heading_hold', 'i', None),
+        ('cmd_target_heading', 'f', None),
+    )),
+    ('cmd_electromagnet', 'cmd_electromagnet_t', (
+        ('cmd_electromagnet_enable', 'i', None),
+        ('cmd_electromagnet_voltage', 'i', None),
+    )),
+    ('cmd_brush', 'cmd_brush_t', (
+        ('cmd_brush_power', 'i', None),
+        ('cmd_brush_enable', 'i', None),
+        ('cmd_water_flow', 'i', None),
+        ('cmd_water_enable', 'i', None),
+    )),
+    ('cmd_camera', 'cmd_camera_t', (
+        ('cmd_camera_enable', 'i', 2),
+        ('cmd_camera_zoom', 'i', 2),
+        ('cmd_camera_record', 'i', 2),
+        ('cmd_camera_record_time', 'i', 2),
+        ('cmd_camera_snapshot', 'i', 2),
+    )),
+)
+
+# (子结构体属性名, 字段名, 数组长度)
+CMD_STRINGS = (
+    ('cmd_camera', 'cmd_storage_path', 2),
+    ('cmd_camera', 'cmd_camera_path', 2),
+)
+
+STATE_SIZE = 184
+CMD_FIXED_SIZE = 136
+
+STATE_FIELDS = (
+    FieldInfo('state_robot.sta_position_x', 'state_robot', 'sta_position_x', None, 'float32', 'f', 'm', 8, 'X坐标'),
+    FieldInfo('state_robot.sta_position_y', 'state_robot', 'sta_position_y', None, 'float32', 'f', 'm', 12, 'Y坐标'),
+    FieldInfo('state_robot.sta_position_z', 'state_robot', 'sta_position_z', None, 'float32', 'f', 'm', 16, 'Z坐标/深度'),
+    FieldInfo('state_robot.sta_roll', 'state_robot', 'sta_roll', None, 'float32', 'f', 'rad', 20, '横滚角'),
+    FieldInfo('state_robot.sta_pitch', 'state_robot', 'sta_pitch', None, 'float32', 'f', 'rad', 24, '俯仰角'),
+    FieldInfo('state_robot.sta_yaw', 'state_robot', 'sta_yaw', None, 'float32', 'f', 'rad', 28, '偏航角'),
+    FieldInfo('state_floating_mode.sta_floating_vel_x', 'state_floating_mode', 'sta_floating_vel_x', None, 'float32', 'f', 'm/s', 32, 'X方向线速度'),
+    FieldInfo('state_floating_mode.sta_floating_vel_y', 'state_floating_mode', 'sta_floating_vel_y', None, 'float32', 'f', 'm/s', 36, 'Y方向线速度'),
+    FieldInfo('state_floating_mode.sta_floating_vel_z', 'state_floating_mode', 'sta_floating_vel_z', None, 'float32', 'f', 'm/s', 40, 'Z方向线速度'),
+    FieldInfo('state_floating_mode.sta_floating_angular_x', 'state_floating_mode', 'sta_floating_angular_x', None, 'float32', 'f', 'rad/s', 44, 'X轴角速度'),
+    FieldInfo('state_floating_mode.sta_floating_angular_y', 'state_floating_mode', 'sta_floating_angular_y', None, 'float32', 'f', 'rad/s', 48, 'Y轴角速度'),
+    FieldInfo('state_floating_mode.sta_floating_angular_z', 'state_floating_mode', 'sta_floating_angular_z', None, 'float32', 'f', 'rad/s', 52, 'Z轴角速度'),
+    FieldInfo('state_floating_mode.sta_thruster_power[0]', 'state_floating_mode', 'sta_thruster_power', 0, 'float32', 'f', '', 56, '4个推进器功率百分比'),
+    FieldInfo('state_floating_mode.sta_thruster_power[1]', 'state_floating_mode', 'sta_thruster_power', 1, 'float32', 'f', '', 60, '4个推进器功率百分比'),
+    FieldInfo('state_floating_mode.sta_thruster_power[2]', 'state_floating_mode', 'sta_thruster_power', 2, 'float32', 'f', '', 64, '4个推进器功率百分比'),
+    FieldInfo('state_floating_mode.sta_thruster_power[3]', 'state_floating_mode', 'sta_thruster_power', 3, 'float32', 'f', '', 68, '4个推进器功率百分比'),
+    FieldInfo('state_floating_mode.sta_thruster_temp[0]', 'state_floating_mode', 'sta_thruster_temp', 0, 'float32', 'f', '', 72, '4个推进器温度'),
+    FieldInfo('state_floating_mode.sta_thruster_temp[1]', 'state_floating_mode', 'sta_thruster_temp', 1, 'float32', 'f', '', 76, '4个推进器温度'),
+    FieldInfo('state_floating_mode.sta_thruster_temp[2]', 'state_floating_mode', 'sta_thruster_temp', 2, 'float32', 'f', '', 80, '4个推进器温度'),
+    FieldInfo('state_floating_mode.sta_thruster_temp[3]', 'state_floating_mode', 'sta_thruster_temp', 3, 'float32', 'f', '', 84, '4个推进器温度'),
+    FieldInfo('state_wheel_mode.sta_wheel_linear_vel', 'state_wheel_mode', 'sta_wheel_linear_vel', None, 'float32', 'f', 'm/s', 88, '线速度'),
+    FieldInfo('state_wheel_mode.sta_wheel_angular_vel', 'state_wheel_mode', 'sta_wheel_angular_vel', None, 'float32', 'f', 'rad/s', 92, '角速度'),
+    FieldInfo('state_wheel_mode.sta_motor_data[0]', 'state_wheel_mode', 'sta_motor_data', 0, 'float32', 'f', 'm/s', 96, '3个电机数据 0-舵机角度 (°), 1-1号电机速度 (m/s), 2-1号电机速度'),
+    FieldInfo('state_wheel_mode.sta_motor_data[1]', 'state_wheel_mode', 'sta_motor_data', 1, 'float32', 'f', 'm/s', 100, '3个电机数据 0-舵机角度 (°), 1-1号电机速度 (m/s), 2-1号电机速度'),
+    FieldInfo('state_wheel_mode.sta_motor_data[2]', 'state_wheel_mode', 'sta_motor_data', 2, 'float32', 'f', 'm/s', 104, '3个电机数据 0-舵机角度 (°), 1-1号电机速度 (m/s), 2-1号电机速度'),
+    FieldInfo('state_wheel_mode.sta_motor_temp[0]', 'state_wheel_mode', 'sta_motor_temp', 0, 'float32', 'f', '', 108, '3个电机温度'),
+    FieldInfo('state_wheel_mode.sta_motor_temp[1]', 'state_wheel_mode', 'sta_motor_temp', 1, 'float32', 'f', '', 112, '3个电机温度'),
+    FieldInfo('state_wheel_mode.sta_motor_temp[2]', 'state_wheel_mode', 'sta_motor_temp', 2, 'float32', 'f', '', 116, '3个电机温度'),
+    FieldInfo('state_electromagnet.sta_electromagnet_enable', 'state_electromagnet', 'sta_electromagnet_enable', None, 'int32', 'i', '', 120, '电磁铁状态: 0-关闭, 1-开启'),
+    FieldInfo('state_electromagnet.sta_electromagnet_voltage', 'state_electromagnet', 'sta_electromagnet_voltage', None, 'int32', 'i', '%', 124, '电磁铁电压: 0-100%'),
+    FieldInfo('state_brush.sta_brush_power', 'state_brush', 'sta_brush_power', None, 'int32', 'i', '%', 128, '滚刷功率: 0-100%'),
+    FieldInfo('state_brush.sta_brush_enable', 'state_brush', 'sta_brush_enable', None, 'int32', 'i', '', 132, '滚刷开关: 0-关闭, 1-开启'),
+    FieldInfo('state_brush.sta_water_flow', 'state_brush', 'sta_water_flow', None, 'int32', 'i', '%', 136, '水流强度: 0-100%'),
+    FieldInfo('state_brush.sta_water_enable', 'state_brush', 'sta_water_enable', None, 'int32', 'i', '', 140, '水流开关: 0-关闭, 1-开启'),
+    FieldInfo('state_system.sta_system_voltage', 'state_system', 'sta_system_voltage', None, 'float32', 'f', 'V', 144, '电压'),
+    FieldInfo('state_system.sta_system_current', 'state_system', 'sta_system_current', None, 'float32', 'f', 'A', 148, '电流'),
+    FieldInfo('state_system.sta_system_power', 'state_system', 'sta_system_power', None, 'float32', 'f', 'W', 152, '功耗'),
+    FieldInfo('state_system.sta_comm_status', 'state_system', 'sta_comm_status', None, 'int32', 'i', '', 156, '通信状态: 0-断开, 1-正常, 2-延迟高, 3-不稳定'),
+    FieldInfo('state_system.sta_communication_status', 'state_system', 'sta_communication_status', None, 'int32', 'i', '', 160, '通信状态别名，兼容性'),
+    FieldInfo('state_system.sta_send_time', 'state_system', 'sta_send_time', None, 'int64', 'q', 'ms', 164, '发送时间'),
+    FieldInfo('state_system.sta_packet_loss', 'state_system', 'sta_packet_loss', None, 'int32', 'i', '', 172, '丢包计数'),
+    FieldInfo('state_system.sta_leak_detected', 'state_system', 'sta_leak_detected', None, 'int32', 'i', '', 176, '漏水检测: 0-正常, 1-检测到漏水'),
+    FieldInfo('state_system.sta_uptime', 'state_system', 'sta_uptime', None, 'int32', 'i', 's', 180, '系统运行时间'),
+)
+
+CMD_FIELDS = (
+    FieldInfo('cmd_floating_mode.cmd_floating_vel_x', 'cmd_floating_mode', 'cmd_floating_vel_x', None, 'float32', 'f', 'm/s', 8, 'X方向线速度'),
+    FieldInfo('cmd_floating_mode.cmd_floating_vel_y', 'cmd_floating_mode', 'cmd_floating_vel_y', None, 'float32', 'f', 'm/s', 12, 'Y方向线速度'),
+    FieldInfo('cmd_floating_mode.cmd_floating_vel_z', 'cmd_floating_mode', 'cmd_floating_vel_z', None, 'float32', 'f', 'm/s', 16, 'Z方向线速度'),
+    FieldInfo('cmd_floating_mode.cmd_floating_angular_roll', 'cmd_floating_mode', 'cmd_floating_angular_roll', None, 'float32', 'f', 'rad', 20, '横滚角度'),
+    FieldInfo('cmd_floating_mode.cmd_floating_angular_yaw', 'cmd_floating_mode', 'cmd_floating_angular_yaw', None, 'float32', 'f', 'rad', 24, '航向角度'),
+    FieldInfo('cmd_floating_mode.cmd_floating_angular_pitch', 'cmd_floating_mode', 'cmd_floating_angular_pitch', None, 'float32', 'f', 'rad', 28, '俯仰角度'),
+    FieldInfo('cmd_floating_mode.cmd_depth_hold', 'cmd_floating_mode', 'cmd_depth_hold', None, 'int32', 'i', '', 32, '定深功能: 0-关闭, 1-开启'),
+    FieldInfo('cmd_floating_mode.cmd_target_depth', 'cmd_floating_mode', 'cmd_target_depth', None, 'float32', 'f', 'm', 36, '目标深度'),
+    FieldInfo('cmd_floating_mode.cmd_floating_heading_hold', 'cmd_floating_mode', 'cmd_floating_heading_hold', None, 'int32', 'i', '', 40, '定向功能: 0-关闭, 1-开启'),
+    FieldInfo('cmd_floating_mode.cmd_target_roll', 'cmd_floating_mode', 'cmd_target_roll', None, 'float32', 'f', 'rad', 44, '目标横滚角'),
+    FieldInfo('cmd_floating_mode.cmd_target_yaw', 'cmd_floating_mode', 'cmd_target_yaw', None, 'float32', 'f', 'rad', 48, '目标航向角'),
+    FieldInfo('cmd_floating_mode.cmd_target_pitch', 'cmd_floating_mode', 'cmd_target_pitch', None, 'float32', 'f', 'rad', 52, '目标俯仰角'),
+    FieldInfo('cmd_wheel_mode.cmd_wheel_linear_vel', 'cmd_wheel_mode', 'cmd_wheel_linear_vel', None, 'float32', 'f', 'm/s', 56, '线速度'),
+    FieldInfo('cmd_wheel_mode.cmd_wheel_angular_vel', 'cmd_wheel_mode', 'cmd_wheel_angular_vel', None, 'float32', 'f', 'rad/s', 60, '角速度'),
+    FieldInfo('cmd_wheel_mode.cmd_wheel_heading_hold', 'cmd_wheel_mode', 'cmd_wheel_heading_hold', None, 'int32', 'i', '', 64, '定向功能: 0-关闭, 1-开启'),
+    FieldInfo('cmd_wheel_mode.cmd_target_heading', 'cmd_wheel_mode', 'cmd_target_heading', None, 'float32', 'f', 'rad', 68, '目标方向'),
+    FieldInfo('cmd_electromagnet.cmd_electromagnet_enable', 'cmd_electromagnet', 'cmd_electromagnet_enable', None, 'int32', 'i', '', 72, '电磁铁状态: 0-关闭, 1-开启'),
+    FieldInfo('cmd_electromagnet.cmd_electromagnet_voltage', 'cmd_electromagnet', 'cmd_electromagnet_voltage', None, 'int32', 'i', '%', 76, '电磁铁电压: 0-100%'),
+    FieldInfo('cmd_brush.cmd_brush_power', 'cmd_brush', 'cmd_brush_power', None, 'int32', 'i', '%', 80, '滚刷功率: 0-100%'),
+    FieldInfo('cmd_brush.cmd_brush_enable', 'cmd_brush', 'cmd_brush_enable', None, 'int32', 'i', '', 84, '滚刷开关: 0-关闭, 1-开启'),
+    FieldInfo('cmd_brush.cmd_water_flow', 'cmd_brush', 'cmd_water_flow', None, 'int32', 'i', '%', 88, '水流强度: 0-100%'),
+    FieldInfo('cmd_brush.cmd_water_enable', 'cmd_brush', 'cmd_water_enable', None, 'int32', 'i', '', 92, '水流开关: 0-关闭, 1-开启'),
+    FieldInfo('cmd_camera.cmd_camera_enable[0]', 'cmd_camera', 'cmd_camera_enable', 0, 'int32', 'i', '', 96, '相机开关: [前置, 后置] 0-关闭, 1-开启'),
+    FieldInfo('cmd_camera.cmd_camera_enable[1]', 'cmd_camera', 'cmd_camera_enable', 1, 'int32', 'i', '', 100, '相机开关: [前置, 后置] 0-关闭, 1-开启'),
+    FieldInfo('cmd_camera.cmd_camera_zoom[0]', 'cmd_camera', 'cmd_camera_zoom', 0, 'int32', 'i', '%', 104, '相机缩放: [前置, 后置] 0-100%'),
+    FieldInfo('cmd_camera.cmd_camera_zoom[1]', 'cmd_camera', 'cmd_camera_zoom', 1, 'int32', 'i', '%', 108, '相机缩放: [前置, 后置] 0-100%'),
+    FieldInfo('cmd_camera.cmd_camera_record[0]', 'cmd_camera', 'cmd_camera_record', 0, 'int32', 'i', '', 112, '录制功能: [前置, 后置] 0-停止, 1-开始'),
+    FieldInfo('cmd_camera.cmd_camera_record[1]', 'cmd_camera', 'cmd_camera_record', 1, 'int32', 'i', '', 116, '录制功能: [前置, 后置] 0-停止, 1-开始'),
+    FieldInfo('cmd_camera.cmd_camera_record_time[0]', 'cmd_camera', 'cmd_camera_record_time', 0, 'int32', 'i', '', 120, '录制时间: [前置, 后置]'),
+    FieldInfo('cmd_camera.cmd_camera_record_time[1]', 'cmd_camera', 'cmd_camera_record_time', 1, 'int32', 'i', '', 124, '录制时间: [前置, 后置]'),
+    FieldInfo('cmd_camera.cmd_camera_snapshot[0]', 'cmd_camera', 'cmd_camera_snapshot', 0, 'int32', 'i', '', 128, '截图功能: [前置, 后置] 0-无操作, 1-截图'),
+    FieldInfo('cmd_camera.cmd_camera_snapshot[1]', 'cmd_camera', 'cmd_camera_snapshot', 1, 'int32', 'i', '', 132, '截图功能: [前置, 后置] 0-无操作, 1-截图'),
+    FieldInfo('cmd_camera.cmd_storage_path[0]', 'cmd_camera', 'cmd_storage_path', 0, 'string', None, '', None, '储存路径'),
+    FieldInfo('cmd_camera.cmd_storage_path[1]', 'cmd_camera', 'cmd_storage_path', 1, 'string', None, '', None, '储存路径'),
+    FieldInfo('cmd_camera.cmd_camera_path[0]', 'cmd_camera', 'cmd_camera_path', 0, 'string', None, '', None, '储存名称'),
+    FieldInfo('cmd_camera.cmd_camera_path[1]', 'cmd_camera', 'cmd_camera_path', 1, 'string', None, '', None, '储存名称'),
+)
+
+FIELDS_BY_PATH = {field.path: field for field in STATE_FIELDS + CMD_FIELDS}
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+扁平编解码微基准：与lcm-gen逐层实现对比状态原地解码和命令编码的耗时，以及命令编码缓存的效果
+用法（项目根目录）: python benchmarks/bench_flat_codec.py
+"""
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.append(os.path.join(ROOT, "messages"))
+
+from LCM.lcm_type.LowlevelState_t import LowlevelState_t
+from LCM.lcm_type.LowlevelCmd_t import LowlevelCmd_t
+from LCM.flat_codec import decode_state_into, decode_state_changes, encode_cmd, CmdEncodeCache
+from LowlevelCmd import LowlevelCmd
+
+
+def bench(old, new, n=2000, repeat=50):
+    """交替计时两种实现，取最小值以减小调度抖动的影响"""
+    t_old = t_new = float("inf")
+    for _ in range(repeat):
+        t_old = min(t_old, timeit.timeit(old, number=n) / n)
+        t_new = min(t_new, timeit.timeit(new, number=n) / n)
+    return t_old, t_new
+
+
+def report(name, t_old, t_new, old_label="lcm-gen", new_label="扁平"):
+    print(f"{name}: {old_label} {t_old * 1e6:.2f} us, {new_label} {t_new * 1e6:.2f} us, 加速 {t_old / t_new:.1f}x")
+
+
+def main():
+    state = LowlevelState_t()
+    state.state_robot.sta_roll = 0.5
+    state.state_floating_mode.sta_thruster_power = [10.0, 20.0, 30.0, 40.0]
+    state.state_system.sta_send_time = 1700000000000
+    data = state.encode()
+    target = LowlevelState_t()
+    previous = LowlevelState_t()
+    report("原地解码", *bench(lambda: LowlevelState_t.decode(data), lambda: decode_state_into(data, target)))
+    report("原地解码+变化检测", *bench(lambda: LowlevelState_t.decode(data),
+                                     lambda: decode_state_changes(data, target, previous)))
+
+    cmd = LowlevelCmd_t()
+    cmd.cmd_floating_mode.cmd_floating_vel_x = 1.5
+    cmd.cmd_camera.cmd_storage_path = ["/data/前置", ""]
+    report("命令编码", *bench(cmd.encode, lambda: encode_cmd(cmd)))
+
+    ui_cmd = LowlevelCmd()
+    cache = CmdEncodeCache()
+    report("缓存编码(未变化)", *bench(lambda: encode_cmd(ui_cmd), lambda: cache.encode(ui_cmd)), "扁平", "缓存")
+
+    floating = ui_cmd.cmd_floating_mode
+
+    def full_tick():
+        floating.cmd_floating_vel_x += 0.01
+        return encode_cmd(ui_cmd)
+
+    def cached_tick():
+        floating.cmd_floating_vel_x += 0.01
+        return cache.encode(ui_cmd)
+
+    report("缓存编码(浮游模式变化)", *bench(full_tick, cached_tick), "扁平", "缓存")
+    print(f"缓存统计: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
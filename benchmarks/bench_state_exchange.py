@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+状态交换基准
+- 三缓冲压力测试：模拟2 kHz的接收线程，UI端分别以50 Hz和全速读取，检查快照一致性与读延迟，并与互斥锁方案对照；
+- update_data单帧基准：每帧都有新数据包的最坏情况，对比逐帧拷贝与直接使用快照的耗时和内存分配。
+用法（项目根目录）: python benchmarks/bench_state_exchange.py
+"""
+import os
+import struct
+import sys
+import threading
+import time
+import timeit
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.append(os.path.join(ROOT, "messages"))
+
+from LCM.lcm import StateTripleBuffer
+from LCM.lcm_type.LowlevelState_t import LowlevelState_t
+from LCM.lcm_type.LowlevelCmd_t import LowlevelCmd_t
+from LCM.flat_codec import (
+    STATE_LAYOUT, STATE_STRUCT, STATE_GROUP_SPANS, CmdEncodeCache, decode_state_into, copy_state, copy_cmd
+)
+from robot_data import RobotDataManager
+from LowlevelState import LowlevelState
+
+
+def main():
+    fingerprint = struct.unpack(">Q", LowlevelState_t._get_packed_fingerprint())[0]
+    field_count = len(STATE_STRUCT.unpack(bytes(STATE_STRUCT.size))) - 1
+
+    def make_packet(k):
+        # 所有字段都等于k，读到的快照中若出现不同的值即为撕裂
+        return STATE_STRUCT.pack(fingerprint, *([k] * field_count))
+
+    def snapshot_values(state):
+        values = []
+        for group, _, fields in STATE_LAYOUT:
+            sub = getattr(state, group)
+            for name, _, dim in fields:
+                value = getattr(sub, name)
+                values.extend(value if dim else (value,))
+        return values
+
+    def percentile(samples, p):
+        samples = sorted(samples)
+        return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+    def run(exchange_read, exchange_write, duration, period):
+        stop = threading.Event()
+        published = [0]
+
+        def writer():
+            k = 0
+            next_time = time.perf_counter()
+            while not stop.is_set():
+                k += 1
+                exchange_write(make_packet(k))
+                published[0] = k
+                next_time += 0.0005  # 2 kHz
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+        thread = threading.Thread(target=writer, daemon=True)
+        thread.start()
+        latencies = []
+        torn = 0
+        reads = 0
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end:
+            t0 = time.perf_counter()
+            seq, state = exchange_read()
+            latencies.append(time.perf_counter() - t0)
+            values = snapshot_values(state)
+            if seq and (min(values) != max(values) or values[0] != seq):
+                torn += 1
+            reads += 1
+            if period:
+                time.sleep(period)
+        stop.set()
+        thread.join()
+        return reads, torn, published[0], latencies
+
+    def triple_buffer_exchange():
+        buffer = StateTripleBuffer(LowlevelState_t)
+
+        def write(data):
+            decode_state_into(data, buffer.begin_write())
+            buffer.publish()
+        return buffer.read, write
+
+    def locked_exchange():
+        # 对照组：单缓冲原地解码加互斥锁，锁只能保护取引用，快照在锁外使用时仍会被改写
+        lock = threading.Lock()
+        state = LowlevelState_t()
+        seq = [0]
+
+        def write(data):
+            with lock:
+                decode_state_into(data, state)
+                seq[0] += 1
+
+        def read():
+            with lock:
+                return seq[0], state
+        return read, write
+
+    for name, factory in (("三缓冲", triple_buffer_exchange), ("互斥锁", locked_exchange)):
+        for label, period, duration in (("50 Hz读取", 0.02, 3.0), ("全速读取", 0, 1.0)):
+            reads, torn, published, latencies = run(*factory(), duration, period)
+            print(f"{name} {label}: 读取{reads}次, 发布{published}条, 撕裂{torn}次, "
+                  f"读延迟 p50 {percentile(latencies, 0.5) * 1e6:.2f} us, "
+                  f"p99 {percentile(latencies, 0.99) * 1e6:.2f} us, "
+                  f"max {max(latencies) * 1e6:.1f} us")
+
+    # update_data单帧基准：每帧都有新数据包的最坏情况，对比逐帧拷贝与直接使用快照
+    robot_data = RobotDataManager()
+    robot_data.state = LowlevelState()
+    robot_data.subscribe(lambda seq, mask: None)
+    buffer = StateTripleBuffer(LowlevelState_t)
+    cache = CmdEncodeCache()
+    packets = [make_packet(k) for k in range(1, 65)]
+    group_seq = [0] * len(STATE_GROUP_SPANS)
+    tick_state = {"seq": -1, "k": 0}
+
+    def receive():
+        k = tick_state["k"] = tick_state["k"] + 1
+        decode_state_into(packets[k & 63], buffer.begin_write())
+        seq = buffer.publish()
+        group_seq[k % len(group_seq)] = seq
+
+    def changed_mask(since_seq):
+        mask = 0
+        for index in range(len(group_seq)):
+            if group_seq[index] > since_seq:
+                mask |= 1 << index
+        return mask
+
+    def tick_copy():
+        # 改动前：每个新数据包拷贝出新的状态对象，命令先转换为LowlevelCmd_t再编码
+        seq, state = buffer.read()
+        if seq != tick_state["seq"]:
+            changed = changed_mask(tick_state["seq"])
+            tick_state["seq"] = seq
+            robot_data.set_state(copy_state(state, LowlevelState_t()), seq, changed)
+        cache.encode(copy_cmd(robot_data.cmd, LowlevelCmd_t()))
+        robot_data.flush_events()
+
+    def tick_direct():
+        # 改动后：快照直接交给robot_data，命令直接从robot_data.cmd编码
+        seq, state = buffer.read()
+        if seq != tick_state["seq"]:
+            changed = changed_mask(tick_state["seq"])
+            tick_state["seq"] = seq
+            robot_data.set_state(state, seq, changed)
+        cache.encode(robot_data.cmd)
+        robot_data.flush_events()
+
+    def tick_alloc(tick, n=2000):
+        """返回UI线程单帧的峰值新增内存与n帧后仍存活的新增内存块数（接收端解码不计入）"""
+        for _ in range(100):
+            receive()
+            tick()
+        tracemalloc.start()
+        peak = 0
+        blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+        for _ in range(n):
+            receive()
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            tick()
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        return sum(stat.count for stat in snapshot.statistics("filename")) - blocks, peak
+
+    for name, tick in (("逐帧拷贝", tick_copy), ("直接快照", tick_direct)):
+        per_tick = min(timeit.repeat(tick, setup=receive, number=1, repeat=20000))
+        leaked, peak = tick_alloc(tick)
+        print(f"update_data单帧({name}): {per_tick * 1e6:.2f} us, 单帧峰值新增内存 {peak} B, 2000帧后存活新增内存块 {leaked}")
+
+
+if __name__ == "__main__":
+    main()
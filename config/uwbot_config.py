@@ -18,7 +18,18 @@ class MainConfig:
     WINDOW_TITLE = "水下机器人控制系统"
     
     # 定时器配置
-    UPDATE_TIMER_INTERVAL = 20  # ms, 50Hz
+    UPDATE_TIMER_INTERVAL = 20  # ms, 50Hz，帧调度器的帧间隔
+    FRAME_BUDGET = 15  # ms，每帧的工作预算，超出后本帧推迟剩余的普通/低优先级任务
+
+    # 性能统计面板（各组件耗时p50/p99、界面线程负载、事件循环延迟）
+    PROFILER_SHORTCUT = "F12"  # 显示/隐藏性能统计面板，面板隐藏时不做任何统计
+    PROFILER_REFRESH_INTERVAL = 1000  # ms，面板刷新间隔，也是统计窗口长度
+    PROFILER_LAG_PROBE_INTERVAL = 50  # ms，事件循环延迟探测间隔
+
+    # LCM接收配置
+    LCM_RECEIVE_MODE = "thread"  # "thread"-独立接收线程, "notifier"-在Qt事件循环中通过QSocketNotifier接收
+    LCM_HANDLE_TIMEOUT = 100  # ms，线程模式下单次等待的超时时间，决定停止接收的响应速度
+    LCM_MAX_DRAIN = 256  # notifier模式下单次事件最多处理的消息数，避免阻塞界面
 
 # =============================================================================
 # 相机配置 (ui_modules/control_mode/camera/)
@@ -48,6 +59,11 @@ class CameraConfig:
     MOCK_FRAME_WIDTH = 1920
     MOCK_FRAME_HEIGHT = 1080
     
+    # 真实相机采集配置（只显示最新帧，积压的旧帧直接丢弃）
+    CAPTURE_DRAIN_THRESHOLD = 10  # ms，后端不支持限制缓冲帧数时，grab()在此时间内返回视为缓冲中积压的旧帧
+    CAPTURE_MAX_DRAIN = 4  # 每显示一帧之前最多丢弃的帧数；FFmpeg后端grab()本身要解码，按耗时判断并不可靠，只做有限的丢弃
+    CAPTURE_STOP_TIMEOUT = 2000  # ms，停止相机时等待采集线程退出的时长，超时后强制释放相机
+    
     # 文件路径配置
     DEFAULT_SCREENSHOT_DIR = "camera_data/camera{}_screenshots"
     DEFAULT_RECORDING_DIR = "camera_data/camera{}_recordings"
@@ -183,12 +199,47 @@ class RobotDataConfig:
     APP_DT = 20  # ms, 50Hz
     
     # 数据历史配置
-    MAX_DATA_HISTORY = 1000
+    MAX_DATA_HISTORY = 30000  # 遥测历史行数（每个数据包一行），约20MB，200Hz时约2.5分钟
+    # 多级汇总历史: (桶秒数, 桶数)，依次为1小时、12小时、24小时，共约17MB
+    HISTORY_LEVELS = ((1, 3600), (10, 4320), (60, 1440))
+    # 滚动统计配置
+    STATS_WINDOW_SECONDS = 10.0  # 最小/最大/均值/标准差/变化率的统计窗口
+    STATS_REFRESH_INTERVAL = 200  # ms，状态表格中统计列的刷新间隔
     DATA_VALIDATION_ENABLED = True
     
     # 状态更新配置
     STATE_UPDATE_THRESHOLD = 0.001
     COMMAND_UPDATE_THRESHOLD = 0.001
+
+# =============================================================================
+# 绘图配置 (ui_modules/param_mode/plot_display.py)
+# =============================================================================
+class PlotConfig:
+    """绘图配置"""
+    # 实时绘图后端: "pyqtgraph"-常驻曲线只更新数据（未安装时退回matplotlib）, "matplotlib"
+    BACKEND = "pyqtgraph"
+    MATPLOTLIB_BLIT = True  # matplotlib后端每帧只blit发生变化的子图，False时每帧完整重绘
+    VIEW_MARGIN = 0.2  # 坐标范围两侧预留的比例，数据超出视图时才重新计算范围
+    
+    # 数据配置
+    MAX_POINTS = 30000  # 单条曲线最多取的原始点数，超过时改用更粗一级的汇总；绘制前再按像素宽度抽稀
+    # 按坐标轴像素宽度抽稀: "minmax"-每个像素列保留最小/最大值, "lttb"-Largest-Triangle-Three-Buckets, "none"-不抽稀
+    DECIMATION = "minmax"
+    SAMPLE_CAPACITY = 3000  # 无遥测历史时每个参数本地缓存的采样数，50Hz时约1分钟
+    
+    # 导出配置（导出图片始终使用matplotlib）
+    EXPORT_DPI = 300
+
+    # 触发采集配置（按遥测历史逐包判断，不受界面刷新频率限制）
+    TRIGGER_PRE_SECONDS = 2.0  # 默认触发前保留的时长
+    TRIGGER_POST_SECONDS = 3.0  # 默认触发后继续采集的时长
+
+    # 频谱模式配置（Welch平均周期图，按遥测历史逐包增量计算）
+    SPECTRUM_SEGMENT = 256  # 每段FFT的采样点数，200Hz时约1.3秒，频率分辨率约0.8Hz
+    SPECTRUM_OVERLAP = 0.5  # 相邻两段重叠的比例
+    SPECTRUM_AVERAGES = 16  # 参与平均的最近段数，越多曲线越平滑、响应越慢
+    SPECTRUM_MAX_GAP = 0.5  # s，相邻两包间隔超过该值视为断链，此前未成段的数据丢弃
+
 # =============================================================================
 # 配置管理器
 # =============================================================================
@@ -204,6 +255,7 @@ class ConfigManager:
         self.main_status_bar = MainStatusBarConfig()
         self.log = LogConfig()
         self.robot_data = RobotDataConfig()
+        self.plot = PlotConfig()
     
     def get_config_dict(self):
         """获取所有配置的字典形式"""
@@ -216,6 +268,7 @@ class ConfigManager:
             'main_status_bar': self._class_to_dict(self.main_status_bar),
             'log': self._class_to_dict(self.log),
             'robot_data': self._class_to_dict(self.robot_data),
+            'plot': self._class_to_dict(self.plot),
         }
     
     def _class_to_dict(self, cls):
@@ -237,6 +290,7 @@ KEYBOARD_CONTROL_CONFIG = config.keyboard_control
 MAIN_STATUS_BAR_CONFIG = config.main_status_bar
 LOG_CONFIG = config.log
 ROBOT_DATA_CONFIG = config.robot_data
+PLOT_CONFIG = config.plot
 
 if __name__ == "__main__":
     # 测试配置
@@ -8,13 +8,13 @@
 import sys
 import os
 import json
-import threading 
+import logging
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QTabWidget, QLabel, QDesktopWidget
+    QTabWidget, QLabel, QDesktopWidget, QShortcut
 )
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QFont
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont, QKeySequence
 
 # 添加messages目录到路径
 sys.path.append(os.path.join(os.path.dirname(__file__), 'messages'))
@@ -30,6 +30,9 @@ from ui_modules.control_mode.motion.motion_control import MotionControlWidget
 from ui_modules.control_mode.camera import DualCameraWidget
 from ui_modules.param_mode.parameters_view import ParametersViewWidget
 from ui_modules.log_mode.log_view import LogViewWidget
+from ui_modules.frame_scheduler import FrameScheduler, PRIORITY_CRITICAL
+from ui_modules.frame_profiler import get_profiler
+from ui_modules.performance_hud import PerformanceHud
 from LCM.lcm import LCMInterface
 
 
@@ -44,18 +47,27 @@ class MainWindow(QMainWindow):
         self.config = self.load_config()
         # 注释：uptime参数现在在robot_data中统一管理
         self.uptime_counter = 0.0  # 独立的运行时间计数器
+        self.state_seq = -1  # 已交给robot_data的最新状态序号
         self.init_lcm()  # 初始化LCM通信线程
         self.setup_logging()  # 初始化日志系统
         self.init_ui()
         self.setup_timer()
+        self.setup_profiler()
 
     def init_lcm(self):
         """初始化LCM通信"""
-        self.lcm.lcm_stop_flag = False #开启lcm
-        self.lcm.receiveData()
-        # 创建新线程运行LCM接收循环
-        self.lcm_thread = threading.Thread(target=self.lcm.handle_receive, daemon=True)
-        self.lcm_thread.start()
+        # 每个数据包都写入遥测历史（完整包率，不受UI定时器限制）
+        history = self.robot_data.history
+        self.lcm.add_state_listener(lambda data, seq: history.append_state_packet(data))
+        # 滚动统计同样逐包增量更新，显示时不再扫描历史
+        stats = self.robot_data.stats
+        self.lcm.add_state_listener(lambda data, seq: stats.append_state_packet(data))
+        if MAIN_CONFIG.LCM_RECEIVE_MODE == "notifier":
+            # 在Qt事件循环中接收，消息到达时立即在UI线程处理
+            self.lcm.start_receive_notifier(self, MAIN_CONFIG.LCM_MAX_DRAIN)
+        else:
+            # 创建新线程运行LCM接收循环
+            self.lcm.start_receive_thread(MAIN_CONFIG.LCM_HANDLE_TIMEOUT)
 
     def load_config(self):
         """加载配置文件"""
@@ -194,8 +206,6 @@ class MainWindow(QMainWindow):
         self.tab_widget.setTabPosition(QTabWidget.North)  # 移至上方
         self.tab_widget.setMovable(False)
         self.tab_widget.setTabsClosable(False)
-        # 连接标签页切换信号以优化性能
-        self.tab_widget.currentChanged.connect(self.on_tab_changed)
         main_layout.addWidget(self.tab_widget)
         
         # 创建主界面状态栏
@@ -253,55 +263,52 @@ class MainWindow(QMainWindow):
         self.tab_widget.addTab(self.log_widget, "📋 日志")
         
     def setup_timer(self):
-        """设置定时器用于数据更新"""
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_data)
-        self.update_timer.start(MAIN_CONFIG.UPDATE_TIMER_INTERVAL)  # 使用配置的定时器间隔
-        
-    def on_tab_changed(self, index):
-        """标签页切换时的处理"""
-        # 暂停非活动标签页的定时器以提升性能
-        if hasattr(self, 'parameters_widget'):
-            if index == 1:  # 参数界面
-                self.parameters_widget.update_timer.start(MAIN_CONFIG.UPDATE_TIMER_INTERVAL)  # 使用配置的定时器间隔
-            else:
-                self.parameters_widget.update_timer.stop()
+        """设置帧调度器：数据收发和各界面组件的周期性工作在同一个帧定时器中依次执行"""
+        self.scheduler = FrameScheduler(MAIN_CONFIG.UPDATE_TIMER_INTERVAL, MAIN_CONFIG.FRAME_BUDGET)
+        # 数据收发每帧最先执行，之后的组件看到的是本帧的最新数据
+        # （每次按名称查找方法，性能统计启用时替换的计时包装才能生效）
+        self.scheduler.register("数据收发", lambda: self.update_data(), 1000.0 / MAIN_CONFIG.UPDATE_TIMER_INTERVAL,
+                                PRIORITY_CRITICAL)
+        self.motion_widget.keyboard_controller.register_frame_tasks(self.scheduler)
+        self.parameters_widget.plot_display.plot_widget.register_frame_tasks(self.scheduler)
+        self.log_widget.register_frame_tasks(self.scheduler)
+        self.scheduler.start()
     
+    def setup_profiler(self):
+        """性能统计面板：默认隐藏，按快捷键显示；显示期间统计各组件耗时和命令发送节拍抖动"""
+        get_profiler().add_tick(MainWindow, "update_data", MAIN_CONFIG.UPDATE_TIMER_INTERVAL, "命令发送(update_data)")
+        self.performance_hud = PerformanceHud(self.scheduler, self)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.performance_hud)
+        self.performance_hud.hide()
+        shortcut = QShortcut(QKeySequence(MAIN_CONFIG.PROFILER_SHORTCUT), self)
+        shortcut.activated.connect(self.performance_hud.toggle)
+        
     def update_data(self):
-        """更新数据显示"""
+        """更新数据并分发变化事件，各界面组件只在所订阅的数据变化时刷新"""
 
-        # 发送LCM数据
-        self.robot_data.state = self.lcm._convert_state_to_ui_format(self.lcm.state_simple)
-        self.lcm.command_simple = self.lcm._convert_cmd_to_lcm_format(self.robot_data.cmd)
-        self.lcm.send_data_once()
+        # 无锁读取最新状态快照，收到新数据包时直接把快照交给robot_data，不再逐字段拷贝
+        state_seq, state = self.lcm.read_state()
+        if state_seq != self.state_seq:
+            changed = self.lcm.changed_mask(self.state_seq)
+            self.state_seq = state_seq
+            self.robot_data.set_state(state, state_seq, changed)
+        # 直接发送robot_data中的命令（未变化时复用缓存的编码字节），并作为遥测历史的命令列
+        self.robot_data.history.set_cmd_packet(self.lcm.send_data_once(self.robot_data.cmd))
 
         # 更新系统运行时间
         self.uptime_counter += MAIN_CONFIG.UPDATE_TIMER_INTERVAL / 1000.0  # 根据配置的定时器间隔增加时间
         self.robot_data.update_uptime(self.uptime_counter)
 
-        # 始终更新主状态栏
-        if hasattr(self, 'main_status_bar'):
-            self.main_status_bar.update_display()
-        
-        # 只更新当前活动标签页的数据
-        current_tab = self.tab_widget.currentIndex()
-        
-        # 控制界面 (index 0) - 始终更新状态和运动控制
-        if current_tab == 0:
-            if hasattr(self, 'status_widget'):
-                self.status_widget.update_display()
-            if hasattr(self, 'motion_widget'):
-                self.motion_widget.update_display()
-        
-        # 双相机模块自行处理更新
-        # 参数界面的更新由其自己的定时器处理
+        # 本帧内累积的变化合并为一次通知；隐藏标签页中的组件在重新显示时自行补刷新
+        self.robot_data.flush_events()
             
     def closeEvent(self, event):
         """关闭事件处理"""
-        self.update_timer.stop()
-        # 停止所有子模块的定时器
-        if hasattr(self, 'parameters_widget') and hasattr(self.parameters_widget, 'update_timer'):
-            self.parameters_widget.update_timer.stop()
+        self.scheduler.stop()
+        self.scheduler.log_stats()
+        stats = self.lcm.get_cmd_cache_stats()
+        logging.info(f"命令编码缓存: 命中{stats['hits']}次, 未命中{stats['misses']}次, 命中率{stats['hit_rate']:.1%}")
+        self.lcm.stop_receive()
         if hasattr(self, 'dual_camera_widget'):
             self.dual_camera_widget.close()
         event.accept()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+字段写入分发表
+由lowlevel_schema的字段元数据一次性生成：字段路径（如"cmd_camera.cmd_camera_zoom[1]"）-> 带类型转换、校验和限幅的写入器，
+参数界面按路径直接查表写入，不再逐级比较分组名和字段名。
+
+取值范围来自：字段类型（int32/float32的表示范围）、字段说明（"0-100%"、"0-关闭, 1-开启"等），
+以及MotionControlConfig中的速度、深度限制。
+
+批量写入（预设、粘贴的一组数值）作为一个事务提交：同一个子结构体无论改了几个字段，版本号只递增一次，
+发送端只重新编码、发送一次。
+"""
+import math
+import re
+from collections import namedtuple, OrderedDict
+from LCM.lowlevel_schema import STATE_FIELDS, CMD_FIELDS
+from config.uwbot_config import MOTION_CONTROL_CONFIG
+
+FieldSetter = namedtuple("FieldSetter", "path group name index convert low high")
+
+INT_RANGES = {
+    "int8": (-2 ** 7, 2 ** 7 - 1),
+    "int16": (-2 ** 15, 2 ** 15 - 1),
+    "int32": (-2 ** 31, 2 ** 31 - 1),
+    "int64": (-2 ** 63, 2 ** 63 - 1),
+}
+FLOAT32_MAX = 3.4028234663852886e38
+PERCENT_PATTERN = re.compile(r"(\d+)\s*-\s*(\d+)\s*%")  # 0-100%
+ENUM_PATTERN = re.compile(r"(\d+)-[^\d\s,]")  # 0-关闭, 1-开启
+# 按单位或字段名附加的控制限制
+UNIT_LIMITS = {
+    "m/s": (-MOTION_CONTROL_CONFIG.MAX_LINEAR_VELOCITY, MOTION_CONTROL_CONFIG.MAX_LINEAR_VELOCITY),
+    "rad/s": (-MOTION_CONTROL_CONFIG.MAX_ANGULAR_VELOCITY, MOTION_CONTROL_CONFIG.MAX_ANGULAR_VELOCITY),
+}
+NAME_LIMITS = {
+    "cmd_target_depth": (MOTION_CONTROL_CONFIG.MIN_DEPTH, MOTION_CONTROL_CONFIG.MAX_DEPTH),
+}
+READ_ONLY_PATHS = frozenset(("state_system.sta_uptime",))  # 由系统自动更新，不允许手动修改
+
+
+def to_int(value):
+    """转换为整数：接受整数、整数值的浮点数和数字字符串，拒绝小数"""
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError(f"需要整数: {value}")
+    return int(number)
+
+
+def to_float(value):
+    """转换为有限的浮点数"""
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"数值无效: {value}")
+    return number
+
+
+def _field_range(field, limits):
+    """由类型、说明和附加限制求字段的取值范围"""
+    if field.dtype in INT_RANGES:
+        low, high = INT_RANGES[field.dtype]
+    else:
+        low, high = -FLOAT32_MAX, FLOAT32_MAX
+    match = PERCENT_PATTERN.search(field.description)
+    if match:
+        low, high = int(match.group(1)), int(match.group(2))
+    else:
+        codes = [int(code) for code in ENUM_PATTERN.findall(field.description)]
+        if len(codes) > 1:
+            low, high = min(codes), max(codes)
+    if limits:
+        extra = NAME_LIMITS.get(field.name) or UNIT_LIMITS.get(field.unit)
+        if extra:
+            low, high = max(low, extra[0]), min(high, extra[1])
+    return low, high
+
+
+def build_setters(fields, limits=False):
+    """为可写字段（不含字符串和只读字段）生成{字段路径: FieldSetter}，limits为True时附加控制限制"""
+    setters = {}
+    for field in fields:
+        if field.dtype == "string" or field.path in READ_ONLY_PATHS:
+            continue
+        convert = to_int if field.dtype in INT_RANGES else to_float
+        low, high = _field_range(field, limits)
+        setters[field.path] = FieldSetter(field.path, field.group, field.name, field.index, convert, low, high)
+    return setters
+
+
+CMD_SETTERS = build_setters(CMD_FIELDS, limits=True)
+STATE_SETTERS = build_setters(STATE_FIELDS)
+
+
+def coerce(setter, value):
+    """按字段类型转换并限幅，返回(写入值, 是否被限幅)；无法转换时抛出ValueError"""
+    value = setter.convert(value)
+    clamped = min(max(value, setter.low), setter.high)
+    return clamped, clamped != value
+
+
+def apply_values(root, setters, values):
+    """把[(字段路径, 数值), ...]作为一个事务写入root（LowlevelCmd或LowlevelState）
+
+    先校验全部数值，任何一个无效都不写入并抛出ValueError（KeyError表示未知或只读字段）；
+    然后按子结构体分组，每组一次性写入：支持修改追踪的子结构体版本号只递增一次。
+    返回(实际写入[(字段路径, 写入值, 是否被限幅), ...], 发生变化的子结构体属性名列表)。
+    """
+    applied = []
+    by_group = OrderedDict()
+    for path, value in values:
+        setter = setters.get(path)
+        if setter is None:
+            raise KeyError(path)
+        try:
+            written, clamped = coerce(setter, value)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"{path}: {e}")
+        applied.append((path, written, clamped))
+        by_group.setdefault(setter.group, []).append((setter.name, setter.index, written))
+
+    changed_groups = []
+    for group, changes in by_group.items():
+        struct = getattr(root, group)
+        assign = getattr(struct, "assign", None)
+        if assign is not None:
+            changed = assign(changes)
+        else:
+            changed = _assign_plain(struct, changes)
+        if changed:
+            changed_groups.append(group)
+    return applied, changed_groups
+
+
+def _assign_plain(struct, changes):
+    """写入不带修改追踪的子结构体（如LCM解码得到的状态快照），返回是否有字段变化"""
+    changed = False
+    for name, index, value in changes:
+        if index is None:
+            if getattr(struct, name) != value:
+                setattr(struct, name, value)
+                changed = True
+        else:
+            array = getattr(struct, name)
+            if array[index] != value:
+                array[index] = value
+                changed = True
+    return changed
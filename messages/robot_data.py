@@ -3,10 +3,83 @@
 """
 水下机器人数据结构定义
 """
+import logging
 from LowlevelState import LowlevelState
 from LowlevelCmd import LowlevelCmd
+from telemetry_history import TelemetryHistory
+from rolling_stats import RollingStats
 from config.uwbot_config import ROBOT_DATA_CONFIG
 
+# 事件分组：状态子结构体（顺序与LowlevelState一致）以及控制命令"cmd"，每组占掩码中的一位
+STATE_GROUPS = (
+    "state_robot",
+    "state_floating_mode",
+    "state_wheel_mode",
+    "state_electromagnet",
+    "state_brush",
+    "state_system",
+)
+CMD_GROUPS = (
+    "cmd_floating_mode",
+    "cmd_wheel_mode",
+    "cmd_electromagnet",
+    "cmd_brush",
+    "cmd_camera",
+)
+EVENT_GROUPS = STATE_GROUPS + ("cmd",)
+GROUP_BITS = {name: 1 << index for index, name in enumerate(EVENT_GROUPS)}
+STATE_MASK = (1 << len(STATE_GROUPS)) - 1  # 状态分组位于掩码低位，第i位对应STATE_GROUPS[i]
+
+
+class StateOverlay:
+    """状态子结构体的叠加视图：有覆盖值的字段取覆盖值，其余字段取LCM快照
+
+    LCM快照由接收端解码、不允许修改，界面的运行时间和手动修改的状态值记在这里，新的数据包不会冲掉它们。
+    values为{字段名: 数值}，数组字段为{字段名: {下标: 数值}}。
+    """
+    __slots__ = ("base", "values")
+
+    def __init__(self):
+        self.base = None
+        self.values = {}
+
+    def __getattr__(self, name):
+        value = getattr(self.base, name)
+        override = self.values.get(name)
+        if override is None:
+            return value
+        if isinstance(override, dict):
+            value = list(value)
+            for index, item in override.items():
+                value[index] = item
+            return value
+        return override
+
+    def assign(self, changes):
+        """写入覆盖值，changes为[(字段名, 数组下标或None, 新值), ...]，返回是否有变化（供field_setters.apply_values调用）"""
+        changed = False
+        for name, index, value in changes:
+            if index is None:
+                if self.values.get(name) != value:
+                    self.values[name] = value
+                    changed = True
+            else:
+                items = self.values.setdefault(name, {})
+                if items.get(index) != value:
+                    items[index] = value
+                    changed = True
+        return changed
+
+
+class StateOverrides:
+    """各状态子结构体的叠加视图，属性名与LowlevelState一致，可直接作为field_setters.apply_values的写入对象"""
+    __slots__ = STATE_GROUPS
+
+    def __init__(self):
+        for group in STATE_GROUPS:
+            setattr(self, group, StateOverlay())
+
+
 class RobotDataManager:
     """机器人数据管理器"""
     _instance = None
@@ -22,6 +95,18 @@ class RobotDataManager:
             self.cmd = LowlevelCmd()
             self.state = LowlevelState()
             self.app_dt = ROBOT_DATA_CONFIG.APP_DT  # 使用配置的定时器间隔
+            self.state_seq = 0  # 当前state对应的数据包序号
+            self.uptime = 0.0  # 界面运行时间（s），显示为state_system.sta_uptime
+            self.state_overrides = StateOverrides()  # 界面运行时间和手动修改的状态值，不写入LCM快照
+            self.state_overrides.state_system.values["sta_uptime"] = 0
+            # 遥测历史：每个数据包一行，并逐级汇总为1s/10s/60s的min/max/mean，绘图、统计、导出共享
+            self.history = TelemetryHistory(ROBOT_DATA_CONFIG.MAX_DATA_HISTORY, ROBOT_DATA_CONFIG.HISTORY_LEVELS)
+            # 各状态字段最近N秒的滚动统计：均值/标准差/变化率逐包增量更新，最小/最大值读取时从遥测历史求得
+            self.stats = RollingStats(ROBOT_DATA_CONFIG.STATS_WINDOW_SECONDS, self.history)
+            self._subscribers = []  # [(掩码, 回调), ...]
+            self._pending_mask = 0  # 自上次flush_events以来发生变化的分组
+            self._cmd_ref = None  # 上次检查时的命令对象
+            self._cmd_versions = [None] * len(CMD_GROUPS)  # 上次检查时各命令子结构体的版本号
             self._initialized = True
     
     def get_cmd_data(self):
@@ -32,9 +117,85 @@ class RobotDataManager:
         """获取状态数据"""
         return self.state
     
+    def get_state_group(self, group):
+        """获取状态子结构体的当前值：没有覆盖值时直接返回LCM快照中的子结构体，否则返回叠加视图（复用同一对象）"""
+        overlay = getattr(self.state_overrides, group)
+        base = getattr(self.state, group)
+        if not overlay.values:
+            return base
+        overlay.base = base
+        return overlay
+
+    def group_mask(self, *groups):
+        """由分组名称计算事件掩码"""
+        mask = 0
+        for group in groups:
+            mask |= GROUP_BITS[group]
+        return mask
+
+    def subscribe(self, callback, groups=STATE_GROUPS):
+        """订阅数据变化事件，callback(seq, mask)仅在所订阅的分组发生变化时被调用
+
+        同一帧内的多次变化会合并为一次回调，mask为本帧内所有发生变化的分组。
+        """
+        self._subscribers.append((self.group_mask(*groups), callback))
+
+    def unsubscribe(self, callback):
+        """取消订阅"""
+        self._subscribers = [(mask, cb) for mask, cb in self._subscribers if cb != callback]
+
+    def mark_changed(self, *groups):
+        """标记分组已变化，在下一次flush_events时通知订阅者"""
+        self._pending_mask |= self.group_mask(*groups)
+
+    def set_state(self, state, seq, changed_mask=STATE_MASK):
+        """更新状态快照及其序号，并标记发生变化的子结构体
+
+        state直接使用LCM接收端解码好的快照（LowlevelState_t，字段与LowlevelState一致），
+        不做拷贝；该快照在下一次set_state之前保持不变。
+        changed_mask为发生变化的状态分组掩码，第i位对应STATE_GROUPS[i]。
+        """
+        self.state = state
+        self.state_seq = seq
+        self._pending_mask |= changed_mask & STATE_MASK
+
+    def _cmd_changed(self):
+        """命令对象被替换或任一子结构体版本号变化时返回True，检查过程不分配新对象"""
+        cmd = self.cmd
+        versions = self._cmd_versions
+        changed = cmd is not self._cmd_ref
+        self._cmd_ref = cmd
+        for index, group in enumerate(CMD_GROUPS):
+            version = getattr(cmd, group)._version
+            if version != versions[index]:
+                versions[index] = version
+                changed = True
+        return changed
+
+    def flush_events(self):
+        """每帧调用一次：检查命令是否变化，并把本帧累积的变化分发给订阅者"""
+        if self._cmd_changed():
+            self._pending_mask |= GROUP_BITS["cmd"]
+        mask = self._pending_mask
+        if not mask:
+            return
+        self._pending_mask = 0
+        for subscribed, callback in self._subscribers:
+            if subscribed & mask:
+                try:
+                    callback(self.state_seq, mask)
+                except Exception as e:
+                    logging.error(f"数据变化事件处理失败: {callback}, 错误: {e}")
+
     def update_uptime(self, uptime):
-        """更新系统运行时间"""
-        self.state.state_system.sta_uptime = uptime
+        """更新界面运行时间，整秒变化时标记state_system已变化
+
+        运行时间记在state_overrides中，不写入LCM快照（快照在下一次set_state之前保持不变）。
+        """
+        if int(uptime) != int(self.uptime):
+            self.state_overrides.state_system.values["sta_uptime"] = int(uptime)
+            self.mark_changed("state_system")
+        self.uptime = uptime
     
     def reset_commands(self):
         """重置所有命令"""
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+遥测滚动统计：每个状态字段最近N秒的最小值、最大值、均值、标准差和变化率
+
+均值、方差和变化率由LCM接收端逐包更新，每个数据包的开销与窗口长度无关（均摊O(1)）：
+- 均值和方差：Welford算法，样本进入窗口时累加、移出窗口时反向扣除，所有字段一次向量运算；
+  样本先减去基准值（上次重新计算时的窗口均值）再累加，数值大而波动小的字段（如sta_send_time）不再因相消损失精度；
+  反向扣除的舍入误差仍会累积，每追加一个窗口的样本数后用窗口内的样本重新计算基准值和平方和，均摊到每包仍是O(1)；
+- 变化率：窗口内最早与最新样本之差除以时间差；
+- 最小/最大值：不逐包维护（逐字段的单调队列是每包数十微秒的Python循环），读取时对遥测历史中
+  窗口内的原始行做一次向量化min/max，只在状态表格可见、按统计刷新间隔读取时计算。
+
+单写者（LCM接收端）无锁：写端每包结束时把结果打包成一个元组整体替换，读端只读这个元组，不会读到更新了一半的数据。
+"""
+import math
+import time
+from collections import deque
+import numpy as np
+from LCM.flat_codec import STATE_STRUCT
+from telemetry_history import STATE_RECORD_DTYPE, STATE_FLOAT_DTYPE
+
+
+class RollingStats:
+    """LowlevelState全部字段（数组元素单独成列）的滑动时间窗口统计"""
+
+    def __init__(self, window_seconds, history):
+        self.window_seconds = window_seconds
+        self.history = history  # 同样逐包追加的TelemetryHistory，读取时从中求最小/最大值
+        self.paths = STATE_RECORD_DTYPE.names
+        self.index = {path: i for i, path in enumerate(self.paths)}
+        self._samples = deque()  # 窗口内的(时间戳, 数值数组)，移出窗口时用于扣除
+        self._n = 0
+        self._shift = np.zeros(len(self.paths))  # 基准值，_mean为减去基准值后的均值
+        self._mean = np.zeros(len(self.paths))
+        self._m2 = np.zeros(len(self.paths))  # 与均值之差的平方和
+        self._since_rebase = 0  # 上次重新计算均值和平方和以来追加的样本数
+        self._last_time = -math.inf
+        self._published = None  # 最近一次发布的结果，见summary()
+
+    # ------------------------------------------------------------------
+    # 写端
+    # ------------------------------------------------------------------
+    def append_state_packet(self, data, timestamp=None):
+        """追加一包uwbot_state报文"""
+        # 预编译的整包Struct一次解出全部字段（去掉指纹），顺序与paths一致；比结构化数组逐包转换快一个数量级
+        row = STATE_STRUCT.unpack_from(data)[1:]
+        self.append(time.time() if timestamp is None else timestamp, row)
+
+    def append(self, t, row):
+        """追加一个样本：row为按paths顺序排列的数值序列"""
+        # 系统时钟回拨时沿用上一个时间戳，窗口内的样本保持有序
+        t = max(t, self._last_time)
+        self._last_time = t
+        cutoff = t - self.window_seconds
+
+        # Welford：先加入新样本，再扣除移出窗口的样本（最新样本不会移出，n始终不小于1）
+        values = np.array(row, dtype=np.float64)
+        n, shift, mean, m2 = self._n + 1, self._shift, self._mean, self._m2
+        x = values - shift
+        delta = x - mean
+        mean = mean + delta / n
+        m2 = m2 + delta * (x - mean)
+        samples = self._samples
+        samples.append((t, values))
+        while samples[0][0] < cutoff:
+            _, old = samples.popleft()
+            n -= 1
+            x = old - shift
+            delta = x - mean
+            mean = mean - delta / n
+            m2 = m2 - delta * (x - mean)
+        self._since_rebase += 1
+        if self._since_rebase >= n:
+            # 窗口内的样本已全部换过一遍，重新计算以消除累积的舍入误差
+            self._since_rebase = 0
+            window = np.array([sample for _, sample in samples])
+            shift = self._shift = window.mean(axis=0)
+            mean = np.zeros_like(shift)
+            m2 = np.square(window - shift).sum(axis=0)
+        self._n, self._mean, self._m2 = n, mean, m2
+
+        first_time, first_values = samples[0]
+        # 整体替换引用，读端拿到的总是同一包的完整结果
+        self._published = (n, shift + mean, m2, first_time, first_values, t, values)
+
+    # ------------------------------------------------------------------
+    # 读端
+    # ------------------------------------------------------------------
+    def summary(self):
+        """返回各字段的(最小值, 最大值, 均值, 标准差, 变化率/秒)数组，按paths顺序；尚无数据时返回None"""
+        published = self._published
+        if published is None:
+            return None
+        n, mean, m2, first_time, first_values, last_time, last_values = published
+        # 总体标准差；反复增减可能让m2略小于0
+        std = np.sqrt(np.maximum(m2, 0.0) / n)
+        span = last_time - first_time
+        rate = (last_values - first_values) / span if span > 0 else np.zeros_like(mean)
+        mins, maxs = self._extrema(last_time, last_values)
+        return mins, maxs, mean, std, rate
+
+    def _extrema(self, last_time, last_values):
+        """遥测历史中截至last_time的窗口内各字段的最小值和最大值"""
+        _, state, _ = self.history.window(self.window_seconds, last_time)
+        if not len(state):
+            return last_values.copy(), last_values.copy()
+        values = state.astype(STATE_FLOAT_DTYPE).view(np.float64).reshape(len(state), len(self.paths))
+        return values.min(axis=0), values.max(axis=0)
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+遥测历史数据：预分配的列式环形缓冲，以及多级min/max/mean汇总
+
+每收到一包uwbot_state追加一行：一列float64时间戳（time.time()秒），
+以及每个展开后的状态/命令字段各一列（数组元素如sta_thruster_power[2]单独成列）。
+行直接采用LCM报文的字节布局（大端，字段偏移与报文一致），追加时只做一次整行字节拷贝；
+按字段名取列得到的是零拷贝的带步长视图，绘图、统计、导出共享同一份历史。
+
+原始行之上按时间分桶逐级汇总（默认1秒、10秒、60秒），每个桶保存各列的最小值、最大值和均值。
+写端在一个桶结束后的第一次追加时把它汇总进上一级，每秒只做一次向量化计算；
+各级桶数固定，内存有上限，任意时间窗口都可以从点数不超过上限的那一级直接取数据。
+
+缓冲按2倍容量镜像存储（每行同时写入i与i+capacity），任意不超过容量的最近窗口都是连续切片。
+单写者（LCM接收端）多读者（UI线程）无锁：写端先写数据再发布计数，读端只访问已发布的行。
+读端最多取最近readable = capacity - capacity/READ_MARGIN_DIVISOR行：写端的下一行正好覆盖满容量视图的第一行，
+留出余量后，读到的视图在写端再追加(capacity - 视图长度)行（至少余量行）之前保持有效，需要长期保存的数据请先copy()。
+"""
+import math
+import time
+import numpy as np
+from LCM.lowlevel_schema import STATE_FIELDS, CMD_FIELDS, STATE_SIZE, CMD_FIXED_SIZE
+
+
+def _record_dtype(fields, itemsize):
+    """由字段元数据构造与报文字节布局一致的记录类型，字段名为字段路径"""
+    fields = [field for field in fields if field.offset is not None]
+    return np.dtype({
+        "names": [field.path for field in fields],
+        "formats": [np.dtype(field.dtype).newbyteorder(">") for field in fields],
+        "offsets": [field.offset for field in fields],
+        "itemsize": itemsize,
+    })
+
+
+STATE_RECORD_DTYPE = _record_dtype(STATE_FIELDS, STATE_SIZE)
+CMD_RECORD_DTYPE = _record_dtype(CMD_FIELDS, CMD_FIXED_SIZE)
+# 汇总时先整块转换为同名的float64记录（按字段位置赋值），再视为二维数组
+STATE_FLOAT_DTYPE = np.dtype([(name, np.float64) for name in STATE_RECORD_DTYPE.names])
+CMD_FLOAT_DTYPE = np.dtype([(name, np.float64) for name in CMD_RECORD_DTYPE.names])
+# 汇总级的列顺序：状态字段在前，命令字段在后
+COLUMN_INDEX = {path: index for index, path in enumerate(STATE_RECORD_DTYPE.names + CMD_RECORD_DTYPE.names)}
+READ_MARGIN_DIVISOR = 20  # 读端留出容量的1/20作为余量（30000行、200Hz时约7.5秒）
+
+
+class _MirroredRing:
+    """镜像环形缓冲的公共部分：时间戳列、发布计数以及按时间窗口定位切片"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        # 读端可见的最多行数，留出的余量行在读端使用视图期间可以被写端安全覆盖
+        self.readable = max(1, capacity - max(1, capacity // READ_MARGIN_DIVISOR))
+        self.times = np.zeros(2 * capacity, dtype=np.float64)
+        self._count = 0  # 已追加的总行数，只由写端修改
+        self._cleared = 0  # clear()时的_count，只由读端修改
+        self._last_time = -math.inf  # 最近一行的时间戳，只由写端修改
+
+    def __len__(self):
+        return min(self._count - self._cleared, self.readable)
+
+    @property
+    def count(self):
+        """已追加的总行数（含已被覆盖的行）"""
+        return self._count
+
+    def clear(self):
+        """清空历史（只移动读端起点，不与写端竞争）"""
+        self._cleared = self._count
+
+    def complete(self):
+        """自上次clear()以来的行是否都还能被读端读到（没有被覆盖或落入余量）"""
+        return self._count - self._cleared <= self.readable
+
+    def _latest_slice(self, n=None):
+        count = self._count
+        available = min(count - self._cleared, self.readable)
+        n = available if n is None else max(0, min(n, available))
+        end = count % self.capacity + self.capacity
+        return slice(end - n, end)
+
+    def window_slice(self, seconds=None, now=None):
+        """返回最近seconds秒的数据在缓冲中的切片，seconds为None时返回全部历史"""
+        latest = self._latest_slice()
+        if seconds is None:
+            return latest
+        times = self.times[latest]
+        cutoff = (time.time() if now is None else now) - seconds
+        start = latest.start + int(np.searchsorted(times, cutoff, side="left"))
+        return slice(start, latest.stop)
+
+    def covers(self, seconds=None, now=None):
+        """缓冲中的数据是否覆盖了最近seconds秒（或自clear()以来的全部数据）"""
+        if self.complete():
+            return True
+        if seconds is None:
+            return False
+        cutoff = (time.time() if now is None else now) - seconds
+        return self.times[self._latest_slice().start] <= cutoff
+
+    def _rows_since(self, first):
+        """写端：第first行（总行号）至今的切片，已被覆盖的部分略去"""
+        count = self._count
+        n = min(count - first, self.capacity)
+        end = count % self.capacity + self.capacity
+        return slice(end - n, end)
+
+
+class AggregateLevel(_MirroredRing):
+    """一级时间分桶汇总：每个桶一行，保存各列在桶内的最小值、最大值、均值和原始行数
+
+    source为下一级（原始历史或更细的汇总级），时间戳为桶的中心时刻。
+    """
+
+    def __init__(self, source, seconds, capacity):
+        super().__init__(capacity)
+        self.source = source
+        self.seconds = seconds
+        columns = len(COLUMN_INDEX)
+        # float32足够绘图使用，内存减半；int64的sta_send_time在汇总级会损失精度
+        self.min = np.zeros((2 * capacity, columns), dtype=np.float32)
+        self.max = np.zeros((2 * capacity, columns), dtype=np.float32)
+        self.mean = np.zeros((2 * capacity, columns), dtype=np.float32)
+        self.counts = np.zeros(2 * capacity, dtype=np.int64)
+        self.parent = None  # 更粗的一级，由TelemetryHistory串联
+        self._bucket_start = None  # 正在累积的桶的起始时刻
+        self._bucket_end = -math.inf
+        self._bucket_first = 0  # 正在累积的桶在source中的首行（总行号）
+
+    def advance(self, t):
+        """写端：source即将追加时间为t的一行；t越过当前桶的结束时刻时，先把该桶汇总为一行"""
+        if t < self._bucket_end:
+            return
+        first = self._bucket_first
+        source_count = self.source.count
+        if self._bucket_start is not None and source_count > first:
+            self._append(self._bucket_start, *self.source.aggregate(first))
+        self._bucket_first = source_count
+        self._bucket_start = math.floor(t / self.seconds) * self.seconds
+        self._bucket_end = self._bucket_start + self.seconds
+
+    def _append(self, start, lo, hi, mean, n):
+        if self.parent is not None:
+            self.parent.advance(start)
+        count = self._count
+        index = count % self.capacity
+        for i in (index, index + self.capacity):
+            self.min[i] = lo
+            self.max[i] = hi
+            self.mean[i] = mean
+            self.counts[i] = n
+            self.times[i] = start + 0.5 * self.seconds
+        self._count = count + 1  # 数据写完后再发布
+
+    def aggregate(self, first):
+        """写端：把第first行至今的桶合并为(最小值, 最大值, 均值, 原始行数)"""
+        rows = self._rows_since(first)
+        counts = self.counts[rows]
+        n = int(counts.sum())
+        mean = counts @ self.mean[rows].astype(np.float64) / n
+        return self.min[rows].min(axis=0), self.max[rows].max(axis=0), mean, n
+
+    def column(self, path, seconds=None, now=None):
+        """按字段路径返回(时间戳, 最小值, 最大值, 均值)视图"""
+        rows = self.window_slice(seconds, now)
+        j = COLUMN_INDEX[path]
+        return self.times[rows], self.min[rows, j], self.max[rows, j], self.mean[rows, j]
+
+
+class TelemetryHistory(_MirroredRing):
+    """遥测历史环形缓冲
+
+    levels为((桶秒数, 桶数), ...)，按桶秒数从细到粗排列，每一级由上一级汇总而来。
+    """
+
+    def __init__(self, capacity, levels=()):
+        super().__init__(capacity)
+        self.state = np.zeros(2 * capacity, dtype=STATE_RECORD_DTYPE)
+        self.cmd = np.zeros(2 * capacity, dtype=CMD_RECORD_DTYPE)
+        self._state_bytes = self.state.view(np.uint8).reshape(2 * capacity, STATE_SIZE)
+        self._cmd_bytes = self.cmd.view(np.uint8).reshape(2 * capacity, CMD_FIXED_SIZE)
+        self._cmd_packet = None
+        self._cmd_row = np.zeros(CMD_FIXED_SIZE, dtype=np.uint8)  # 当前命令的定长部分，由UI线程整体替换
+        self.levels = []
+        source = self
+        for seconds, level_capacity in levels:
+            level = AggregateLevel(source, seconds, level_capacity)
+            if source is not self:
+                source.parent = level
+            self.levels.append(level)
+            source = level
+
+    # ------------------------------------------------------------------
+    # 写端
+    # ------------------------------------------------------------------
+    def append_state_packet(self, data, timestamp=None):
+        """追加一行：data为uwbot_state报文，命令列取最近一次set_cmd_packet的内容"""
+        row = np.frombuffer(data, dtype=np.uint8, count=STATE_SIZE)
+        cmd_row = self._cmd_row
+        t = time.time() if timestamp is None else timestamp
+        # 系统时钟回拨时沿用上一行的时间戳，保证时间列单调不减，searchsorted才能正确定位窗口
+        t = max(t, self._last_time)
+        self._last_time = t
+        if self.levels:
+            self.levels[0].advance(t)  # 通常只是一次比较，每秒汇总一次
+        count = self._count
+        index = count % self.capacity
+        mirror = index + self.capacity
+        self._state_bytes[index] = row
+        self._state_bytes[mirror] = row
+        self._cmd_bytes[index] = cmd_row
+        self._cmd_bytes[mirror] = cmd_row
+        self.times[index] = t
+        self.times[mirror] = t
+        self._count = count + 1  # 数据写完后再发布
+
+    def set_cmd_packet(self, data):
+        """记录当前发送的uwbot_command报文，之后追加的行使用该命令；报文对象未变时直接返回"""
+        if data is self._cmd_packet:
+            return
+        self._cmd_packet = data
+        # 整体替换引用，接收线程不会读到写了一半的命令
+        self._cmd_row = np.frombuffer(data, dtype=np.uint8, count=CMD_FIXED_SIZE).copy()
+
+    def aggregate(self, first):
+        """写端：把第first行至今的原始行合并为(最小值, 最大值, 均值, 行数)"""
+        rows = self._rows_since(first)
+        values = self.to_float_matrix(self.state[rows], self.cmd[rows])
+        return values.min(axis=0), values.max(axis=0), values.mean(axis=0), len(values)
+
+    # ------------------------------------------------------------------
+    # 读端
+    # ------------------------------------------------------------------
+    def clear(self):
+        """清空历史及各级汇总（只移动读端起点，不与写端竞争）"""
+        super().clear()
+        for level in self.levels:
+            level.clear()
+
+    def latest(self, n=None):
+        """返回最近n行的(时间戳, 状态记录, 命令记录)视图"""
+        rows = self._latest_slice(n)
+        return self.times[rows], self.state[rows], self.cmd[rows]
+
+    def window(self, seconds=None, now=None):
+        """返回最近seconds秒的(时间戳, 状态记录, 命令记录)视图"""
+        rows = self.window_slice(seconds, now)
+        return self.times[rows], self.state[rows], self.cmd[rows]
+
+    def column(self, path, seconds=None, now=None):
+        """按字段路径（如"state_floating_mode.sta_thruster_power[2]"）返回(时间戳, 数值)视图"""
+        rows = self.window_slice(seconds, now)
+        records = self.state if path in STATE_RECORD_DTYPE.fields else self.cmd
+        return self.times[rows], records[path][rows]
+
+    def column_since(self, path, first):
+        """返回第first行（总行号）至今的(时间戳, 数值)视图以及当时的总行数，已被覆盖或清除的行略去
+
+        供按包扫描的读者使用：下次传入返回的总行数即可接着上次的位置继续读取。
+        """
+        times, (values,), count = self.columns_since((path,), first)
+        return times, values, count
+
+    def columns_since(self, paths, first):
+        """同column_since，多列按同一个总行数读取，返回(时间戳, [数值, ...], 总行数)，各列长度一致"""
+        count = self._count
+        n = max(0, min(count - max(first, self._cleared), self.readable))
+        end = count % self.capacity + self.capacity
+        rows = slice(end - n, end)
+        columns = [(self.state if path in STATE_RECORD_DTYPE.fields else self.cmd)[path][rows] for path in paths]
+        return self.times[rows], columns, count
+
+    def series(self, path, seconds=None, max_points=4000, now=None):
+        """按时间窗口取绘图数据，自动选择覆盖该窗口且点数不超过max_points的最细一级
+
+        返回(时间戳, 最小值, 最大值, 均值, 桶秒数)视图；取自原始行时三者是同一视图，桶秒数为0。
+        汇总级不含尚未结束的桶，最新的数据最多滞后一个桶的时长。
+        """
+        now = time.time() if now is None else now
+        rows = self.window_slice(seconds, now)
+        if not self.levels or (rows.stop - rows.start <= max_points and self.covers(seconds, now)):
+            times, values = self.column(path, seconds, now)
+            return times, values, values, values, 0
+        for level in self.levels:
+            rows = level.window_slice(seconds, now)
+            if rows.stop - rows.start <= max_points and level.covers(seconds, now):
+                break
+        # 没有任何一级同时满足两个条件时使用最粗的一级
+        return level.column(path, seconds, now) + (level.seconds,)
+
+    def snapshot(self):
+        """复制自clear()以来的全部历史（原始行及各级汇总），返回可直接交给np.savez的数组字典
+
+        供导出等后台任务使用：复制在调用线程完成，之后写端继续追加不会影响副本。
+        """
+        times, state, cmd = self.window()
+        data = {"times": times.copy(), "state": state.copy(), "cmd": cmd.copy(),
+                "columns": np.array(self.field_paths())}
+        for level in self.levels:
+            rows = level.window_slice()
+            prefix = f"level_{level.seconds}s_"
+            data[prefix + "times"] = level.times[rows].copy()
+            data[prefix + "min"] = level.min[rows].copy()
+            data[prefix + "max"] = level.max[rows].copy()
+            data[prefix + "mean"] = level.mean[rows].copy()
+            data[prefix + "counts"] = level.counts[rows].copy()
+        return data
+
+    @staticmethod
+    def to_float_matrix(state, cmd):
+        """把状态/命令记录整块转换为(行数, 列数)的float64矩阵，列顺序与field_paths()一致"""
+        n = len(state)
+        return np.hstack((
+            state.astype(STATE_FLOAT_DTYPE).view(np.float64).reshape(n, len(STATE_FLOAT_DTYPE.names)),
+            cmd.astype(CMD_FLOAT_DTYPE).view(np.float64).reshape(n, len(CMD_FLOAT_DTYPE.names)),
+        ))
+
+    @staticmethod
+    def has_field(path):
+        """path是否为历史中的一列"""
+        return path in COLUMN_INDEX
+
+    @staticmethod
+    def field_paths():
+        """可用的全部列名（状态字段在前，命令字段在后）"""
+        return STATE_RECORD_DTYPE.names + CMD_RECORD_DTYPE.names
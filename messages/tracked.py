@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+控制命令的修改追踪
+子结构体字段变化时递增_version，供LCM发送端判断是否需要重新编码、供界面判断命令是否变化
+"""
+from dataclasses import fields
+
+_MISSING = object()
+
+
+def slotted(cls):
+    """为dataclass补充__slots__，等价于Python 3.10的dataclass(slots=True)，兼容Python 3.7
+
+    字段默认值已写入dataclass生成的__init__，这里去掉同名类属性后按原基类重建类。
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = {key: value for key, value in cls.__dict__.items()
+                 if key not in names and key not in ("__dict__", "__weakref__")}
+    namespace["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+class TrackedList(list):
+    """带修改追踪的定长列表：元素被改写时递增所属结构体的版本号
+
+    LCM命令中的数组都是定长的，编码时按固定长度写出，所以这里禁止改变长度的操作
+    （append/extend/insert/pop/remove/clear/del/+=/*=及改变长度的切片赋值），直接抛TypeError；
+    sort/reverse和下标、等长切片赋值会递增版本号，保证发送端不会用到旧的编码缓存。
+    """
+    __slots__ = ("_owner",)
+
+    def __init__(self, iterable=(), owner=None):
+        super().__init__(iterable)
+        self._owner = owner
+
+    def _touch(self):
+        if self._owner is not None:
+            self._owner._touch()
+
+    def _resize(self, *args, **kwargs):
+        raise TypeError(f"定长数组不能改变长度（长度{len(self)}），请按下标修改元素或整体赋值")
+
+    append = extend = insert = pop = remove = clear = _resize
+    __delitem__ = __iadd__ = __imul__ = _resize
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            if len(value) != len(range(*index.indices(len(self)))):
+                self._resize()
+        super().__setitem__(index, value)
+        self._touch()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._touch()
+
+    def reverse(self):
+        super().reverse()
+        self._touch()
+
+    def __reduce__(self):
+        # list子类默认按append/extend逐项重建，这里改为整体构造；owner在赋回结构体时重新绑定
+        return TrackedList, (list(self),)
+
+
+class TrackedStruct:
+    """命令子结构体基类：字段值变化时递增_version
+
+    直接赋值的list会被包装为绑定到本结构体的TrackedList（复制一份），
+    之后通过下标修改元素同样会递增版本号。
+    """
+    __slots__ = ("_version",)
+
+    def _touch(self):
+        object.__setattr__(self, "_version", getattr(self, "_version", 0) + 1)
+
+    def assign(self, changes):
+        """批量修改字段，changes为[(字段名, 数组下标或None, 新值), ...]
+
+        所有字段写完后版本号只递增一次（没有任何变化时不递增），发送端只需重新编码一次。返回是否有变化。
+        """
+        changed = False
+        for name, index, value in changes:
+            if index is None:
+                if getattr(self, name) != value:
+                    object.__setattr__(self, name, value)
+                    changed = True
+            else:
+                array = getattr(self, name)
+                if array[index] != value:
+                    list.__setitem__(array, index, value)
+                    changed = True
+        if changed:
+            self._touch()
+        return changed
+
+    def __setattr__(self, name, value):
+        if isinstance(value, list) and getattr(value, "_owner", None) is not self:
+            value = TrackedList(value, self)
+        old = getattr(self, name, _MISSING)
+        object.__setattr__(self, name, value)
+        if old is _MISSING or old != value:
+            self._touch()
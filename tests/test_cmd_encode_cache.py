@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+命令编码缓存：命令未变化时复用上次的字节，变化时只重新编码变化的子结构体，结果与encode_cmd一致
+"""
+from LowlevelCmd import LowlevelCmd, cmd_wheel_mode
+from LCM.lcm_type.LowlevelCmd_t import LowlevelCmd_t
+from LCM.flat_codec import CmdEncodeCache, encode_cmd
+
+
+def test_unchanged_command_is_a_hit():
+    cmd = LowlevelCmd()
+    cache = CmdEncodeCache()
+    first = cache.encode(cmd)
+    assert first == encode_cmd(cmd)
+    assert cache.encode(cmd) is first
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_changed_field_reencodes_only_its_group():
+    cmd = LowlevelCmd()
+    cache = CmdEncodeCache()
+    cache.encode(cmd)
+    cmd.cmd_floating_mode.cmd_floating_vel_x = 0.5
+    assert cache.encode(cmd) == encode_cmd(cmd)
+    encodes = cache.stats()["group_encodes"]
+    assert encodes["cmd_floating_mode"] == 2
+    assert encodes["cmd_wheel_mode"] == encodes["cmd_camera"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_array_element_and_string_changes_are_detected():
+    cmd = LowlevelCmd()
+    cache = CmdEncodeCache()
+    cache.encode(cmd)
+    cmd.cmd_camera.cmd_camera_zoom[1] = 55
+    assert cache.encode(cmd) == encode_cmd(cmd)
+    cmd.cmd_camera.cmd_storage_path = ["/data", "/data"]
+    assert cache.encode(cmd) == encode_cmd(cmd)
+    assert cache.stats()["group_encodes"]["cmd_camera"] == 3
+
+
+def test_replaced_substruct_is_detected():
+    cmd = LowlevelCmd()
+    cache = CmdEncodeCache()
+    cache.encode(cmd)
+    replacement = cmd_wheel_mode()
+    replacement.cmd_wheel_linear_vel = 0.3
+    cmd.cmd_wheel_mode = replacement
+    assert cache.encode(cmd) == encode_cmd(cmd)
+    # 新对象的版本号可能与旧对象相同，按对象身份同样能识别
+    cmd.cmd_wheel_mode = cmd_wheel_mode()
+    assert cache.encode(cmd) == encode_cmd(cmd)
+
+
+def test_untracked_command_is_always_a_miss():
+    cmd = LowlevelCmd_t()
+    cache = CmdEncodeCache()
+    cache.encode(cmd)
+    cmd.cmd_brush.cmd_water_flow = 42
+    assert cache.encode(cmd) == cmd.encode()
+    assert cache.stats()["hits"] == 0
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+扁平编解码与lcm-gen参考实现（LowlevelState_t/LowlevelCmd_t的encode/decode）的字节兼容性
+"""
+import pytest
+from LCM.lcm_type.LowlevelState_t import LowlevelState_t
+from LCM.lcm_type.LowlevelCmd_t import LowlevelCmd_t
+from LCM.flat_codec import (
+    STATE_SIZE, STATE_GROUP_SPANS, decode_state_into, decode_state_changes, encode_cmd, copy_state, copy_cmd
+)
+
+
+def make_state():
+    state = LowlevelState_t()
+    state.state_robot.sta_roll = 0.5
+    state.state_floating_mode.sta_thruster_power = [10.0, 20.0, 30.0, 40.0]
+    state.state_wheel_mode.sta_motor_data = [1.0, 2.0, 3.0]
+    state.state_brush.sta_water_flow = 7
+    state.state_system.sta_send_time = 1700000000000
+    state.state_system.sta_leak_detected = 1
+    return state
+
+
+def make_cmd(cmd):
+    cmd.cmd_floating_mode.cmd_floating_vel_x = 1.5
+    cmd.cmd_floating_mode.cmd_depth_hold = 1
+    cmd.cmd_wheel_mode.cmd_target_heading = 1.25
+    cmd.cmd_brush.cmd_water_flow = 42
+    cmd.cmd_camera.cmd_camera_zoom = [30, 70]
+    cmd.cmd_camera.cmd_storage_path = ["/data/前置", ""]
+    cmd.cmd_camera.cmd_camera_path = ["cam0.mp4", "cam1.mp4"]
+    return cmd
+
+
+def test_decode_state_into_round_trip():
+    data = make_state().encode()
+    assert len(data) == STATE_SIZE
+    target = LowlevelState_t()
+    arrays = target.state_floating_mode.sta_thruster_power
+    assert decode_state_into(data, target) is target
+    assert target.encode() == data
+    # 数组原地写入，不替换list对象
+    assert target.state_floating_mode.sta_thruster_power is arrays
+    reference = LowlevelState_t.decode(data)
+    assert reference.encode() == target.encode()
+
+
+def test_decode_state_into_rejects_wrong_fingerprint():
+    data = bytearray(make_state().encode())
+    data[0] ^= 0xFF
+    with pytest.raises(ValueError):
+        decode_state_into(bytes(data), LowlevelState_t())
+
+
+def test_decode_state_changes_matches_bytewise_comparison():
+    data = make_state().encode()
+    previous = LowlevelState_t()
+    decode_state_into(data, previous)
+    target = LowlevelState_t()
+    assert decode_state_changes(data, target, previous) == 0
+    assert target.encode() == data
+
+    zero = LowlevelState_t().encode()
+    expected = sum(1 << i for i, (_, start, end) in enumerate(STATE_GROUP_SPANS) if zero[start:end] != data[start:end])
+    assert expected
+    assert decode_state_changes(zero, target, previous) == expected
+    assert target.encode() == zero
+
+
+def test_encode_cmd_matches_lcm_gen():
+    cmd = make_cmd(LowlevelCmd_t())
+    assert encode_cmd(cmd) == cmd.encode()
+    assert LowlevelCmd_t.decode(encode_cmd(cmd)).encode() == cmd.encode()
+
+
+def test_encode_cmd_accepts_ui_dataclass():
+    from LowlevelCmd import LowlevelCmd
+    ui_cmd = make_cmd(LowlevelCmd())
+    reference = copy_cmd(ui_cmd, LowlevelCmd_t())
+    assert encode_cmd(ui_cmd) == reference.encode()
+
+
+def test_copy_state_and_cmd():
+    state = make_state()
+    assert copy_state(state, LowlevelState_t()).encode() == state.encode()
+    cmd = make_cmd(LowlevelCmd_t())
+    assert copy_cmd(cmd, LowlevelCmd_t()).encode() == cmd.encode()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+界面性能统计：启用前注册的帧任务同样计时，不同模块中的同名组件类分别统计
+"""
+import sys
+import types
+
+import pytest
+from PyQt5.QtWidgets import QWidget
+from ui_modules.frame_profiler import FrameProfiler
+from ui_modules.frame_scheduler import FrameScheduler
+
+
+class Worker:
+    def __init__(self):
+        self.calls = 0
+
+    def tick(self):
+        self.calls += 1
+
+
+def section_names(profiler):
+    return [name for name, *_ in profiler.snapshot()["sections"]]
+
+
+def test_tasks_registered_before_enabling_are_timed(qapp):
+    scheduler = FrameScheduler(20, 16)
+    worker = Worker()
+    scheduler.register("工作", worker.tick, 50)  # 绑定方法在启用统计之前注册
+    profiler = FrameProfiler()
+    profiler.attach_scheduler(scheduler)
+    profiler.set_enabled(True)
+    try:
+        scheduler.run_frame()
+        assert worker.calls == 1
+        assert "帧任务:工作" in section_names(profiler)
+    finally:
+        profiler.set_enabled(False)
+    assert scheduler.task_observer is None
+
+
+def make_widget_module(name):
+    module = types.ModuleType(name)
+
+    class Panel(QWidget):
+        def update_display(self):
+            pass
+
+    Panel.__module__ = name
+    Panel.__qualname__ = "Panel"
+    module.Panel = Panel
+    return module
+
+
+def test_same_class_name_in_different_modules_kept_apart(qapp, monkeypatch):
+    first = make_widget_module("ui_modules._profiler_test_a")
+    second = make_widget_module("ui_modules._profiler_test_b")
+    monkeypatch.setitem(sys.modules, first.__name__, first)
+    monkeypatch.setitem(sys.modules, second.__name__, second)
+    profiler = FrameProfiler()
+    profiler.set_enabled(True)
+    try:
+        first.Panel().update_display()
+        second.Panel().update_display()
+        second.Panel().update_display()
+        rates = {name: rate for name, rate, *_ in profiler.snapshot()["sections"]}
+        first_rate = rates["ui_modules._profiler_test_a.Panel.update_display"]
+        second_rate = rates["ui_modules._profiler_test_b.Panel.update_display"]
+        assert second_rate == pytest.approx(2 * first_rate)
+    finally:
+        profiler.set_enabled(False)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+lcm_gen命令行：--check只对比不写盘，输出路径可显式指定
+"""
+import os
+
+import pytest
+
+from LCM import lcm_gen
+
+
+def _snapshot(paths):
+    return {p: (os.path.getmtime(p), open(p, encoding="utf-8").read()) for p in paths}
+
+
+def test_check_reports_up_to_date_without_writing(capsys):
+    paths = (lcm_gen.SCHEMA_OUTPUT, lcm_gen.STATE_OUTPUT, lcm_gen.CMD_OUTPUT)
+    before = _snapshot(paths)
+    assert lcm_gen.main(["--check"]) == 0
+    assert _snapshot(paths) == before
+    assert "已是最新" in capsys.readouterr().out
+
+
+def test_check_detects_stale_file(tmp_path, capsys):
+    stale = tmp_path / "LowlevelCmd.py"
+    stale.write_text("# stale\n", encoding="utf-8")
+    rc = lcm_gen.main(["--check", "--cmd-out", str(stale),
+                       "--schema-out", lcm_gen.SCHEMA_OUTPUT, "--state-out", lcm_gen.STATE_OUTPUT])
+    assert rc == 1
+    assert stale.read_text(encoding="utf-8") == "# stale\n"
+    assert "-# stale" in capsys.readouterr().out
+
+
+def test_help_does_not_write(capsys):
+    paths = (lcm_gen.SCHEMA_OUTPUT, lcm_gen.STATE_OUTPUT, lcm_gen.CMD_OUTPUT)
+    before = _snapshot(paths)
+    with pytest.raises(SystemExit) as exc:
+        lcm_gen.main(["--help"])
+    assert exc.value.code == 0
+    assert _snapshot(paths) == before
+
+
+def test_explicit_output_paths(tmp_path):
+    outs = [tmp_path / "schema.py", tmp_path / "state.py", tmp_path / "cmd.py"]
+    assert lcm_gen.main(["--schema-out", str(outs[0]), "--state-out", str(outs[1]),
+                         "--cmd-out", str(outs[2])]) == 0
+    with open(lcm_gen.CMD_OUTPUT, encoding="utf-8") as f:
+        assert outs[2].read_text(encoding="utf-8") == f.read()
+    assert outs[0].exists() and outs[1].exists()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+实时绘图刷新：全部字段都是遥测历史中的列时，新到的数据包同样要触发重绘
+"""
+import time
+
+
+def test_render_frame_redraws_when_history_grows(qapp, monkeypatch):
+    from robot_data import get_robot_data
+    from LCM.lcm_type.LowlevelState_t import LowlevelState_t
+    from ui_modules.param_mode.parameters_view import ParametersViewWidget
+    from ui_modules.param_mode.plot_display import PlotWidget
+
+    robot_data = get_robot_data()
+    view = ParametersViewWidget(robot_data)
+    view.resize(1600, 900)
+    view.show()
+    qapp.processEvents()
+    plot = view.plot_display.plot_widget
+    plot.set_plot_parameter(0, "robot_status.sta_yaw", "state_robot.sta_yaw")
+
+    calls = []
+    original = PlotWidget.update_plot
+    monkeypatch.setattr(PlotWidget, "update_plot", lambda self: (calls.append(1), original(self)))
+
+    # 没有新数据时不重绘
+    plot.on_render_frame()
+    calls.clear()
+    plot.on_render_frame()
+    assert not calls
+
+    state = LowlevelState_t()
+    now = time.time()
+    for k in range(20):
+        state.state_robot.sta_yaw = 0.01 * k
+        robot_data.history.append_state_packet(state.encode(), now + k * 0.005)
+    robot_data.mark_changed("state_robot")
+    robot_data.flush_events()
+    qapp.processEvents()
+
+    plot.on_render_frame()
+    assert len(calls) == 1
+    assert not plot._data_dirty
+    # 已绘制过的行不再触发重绘
+    plot.on_render_frame()
+    assert len(calls) == 1
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TrackedList：定长数组的所有原地修改都递增版本号，改变长度的操作直接报错，编码缓存不会拿到旧字节
+"""
+import copy
+
+import pytest
+from LowlevelCmd import LowlevelCmd
+from LCM.flat_codec import CmdEncodeCache, encode_cmd
+
+RESIZERS = [
+    lambda a: a.append(1),
+    lambda a: a.extend([1]),
+    lambda a: a.insert(0, 1),
+    lambda a: a.pop(),
+    lambda a: a.remove(a[0]),
+    lambda a: a.clear(),
+    lambda a: a.__delitem__(0),
+    lambda a: a.__iadd__([1]),
+    lambda a: a.__imul__(2),
+    lambda a: a.__setitem__(slice(0, 1), [1, 2]),
+]
+
+
+@pytest.mark.parametrize("resize", RESIZERS)
+def test_resizing_raises_and_keeps_array(resize):
+    camera = LowlevelCmd().cmd_camera
+    camera.cmd_camera_zoom = [10, 20]
+    version = camera._version
+    with pytest.raises(TypeError):
+        resize(camera.cmd_camera_zoom)
+    assert camera.cmd_camera_zoom == [10, 20]
+    assert camera._version == version
+
+
+def test_augmented_assignment_through_struct_raises():
+    camera = LowlevelCmd().cmd_camera
+    with pytest.raises(TypeError):
+        camera.cmd_camera_zoom += [1]
+
+
+@pytest.mark.parametrize("mutate", [
+    lambda a: a.sort(),
+    lambda a: a.reverse(),
+    lambda a: a.__setitem__(slice(None), [7, 8]),
+])
+def test_in_place_mutators_invalidate_encode_cache(mutate):
+    cmd = LowlevelCmd()
+    cmd.cmd_camera.cmd_camera_zoom = [30, 10]
+    cache = CmdEncodeCache()
+    cache.encode(cmd)
+    mutate(cmd.cmd_camera.cmd_camera_zoom)
+    assert cache.encode(cmd) == encode_cmd(cmd)
+    assert cache.stats()["misses"] == 2
+
+
+def test_deepcopy_rebinds_owner():
+    cmd = LowlevelCmd()
+    clone = copy.deepcopy(cmd)
+    version = clone.cmd_camera._version
+    clone.cmd_camera.cmd_camera_zoom[0] = 42
+    assert clone.cmd_camera._version > version
+    assert cmd.cmd_camera.cmd_camera_zoom[0] != 42
@@ -3,8 +3,19 @@
 """
 相机线程模块
 负责相机数据采集和模拟画面生成
+
+真实相机按帧到达的速度读取（不再每帧固定休眠），只保留最新的一帧：
+- 后端支持CAP_PROP_BUFFERSIZE时把内部缓冲限制为1帧，不会积压，每次grab()即是最新帧；
+- 不支持时，grab()很快返回说明读到的是缓冲中积压的旧帧，直接丢弃；FFmpeg等后端的grab()本身要解码，
+  耗时判断并不可靠，每显示一帧最多丢弃CAPTURE_MAX_DRAIN帧，只对要显示的帧retrieve()解码/转换；
+- 读到的帧放入单槽的LatestFrameMailbox，界面来不及取走的旧帧被新帧覆盖并计数；
+- 只在信箱由空变满时通知界面，界面队列中最多有一个待处理的通知，显示帧率随界面的处理能力自动调整，
+  画面延迟不会因积压而无限增长。
 """
 
+import logging
+import threading
+import time
 import cv2
 import numpy as np
 from datetime import datetime
@@ -13,9 +24,35 @@ from PyQt5.QtCore import QThread, pyqtSignal
 # 导入配置文件
 from config.uwbot_config import CAMERA_CONFIG
 
+class LatestFrameMailbox:
+    """单槽的最新帧信箱：采集线程写入、界面线程取走，未被取走的旧帧直接被覆盖"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frame = None
+        self.published = 0  # 写入的帧数
+        self.dropped = 0  # 未被取走就被覆盖的帧数
+        
+    def put(self, frame):
+        """写入一帧，返回信箱此前是否为空（为空时需要通知界面）"""
+        with self._lock:
+            was_empty = self._frame is None
+            if not was_empty:
+                self.dropped += 1
+            self._frame = frame
+            self.published += 1
+        return was_empty
+    
+    def take(self):
+        """取走最新的一帧，没有新帧时返回None"""
+        with self._lock:
+            frame, self._frame = self._frame, None
+        return frame
+
+
 class CameraThread(QThread):
     """相机线程类"""
-    frame_ready = pyqtSignal(np.ndarray, int)  # 帧数据, 相机ID
+    frame_available = pyqtSignal(int)  # 相机ID，新帧已放入mailbox（信箱由空变满时才发出）
     
     def __init__(self, camera_id, use_rtsp=True):
         super().__init__()
@@ -23,6 +60,9 @@ class CameraThread(QThread):
         self.use_rtsp = use_rtsp
         self.running = False
         self.cap = None
+        self.mailbox = LatestFrameMailbox()
+        self.drained = 0  # 采集端从缓冲中丢弃的积压帧数
+        self.buffer_limited = False  # 后端是否接受了CAP_PROP_BUFFERSIZE=1（不会积压旧帧）
         
         # 配置RTSP流地址
         if self.use_rtsp:
@@ -36,12 +76,30 @@ class CameraThread(QThread):
         self.start()
         
     def stop_camera(self):
-        """停止相机"""
+        """停止相机：等待采集循环退出后由线程自己释放相机，避免在grab()过程中释放
+
+        grab()卡在断开的RTSP流上时，等待CAPTURE_STOP_TIMEOUT后强制释放相机使其返回，
+        仍不退出则终止线程，关闭窗口不会被一直阻塞。
+        """
         self.running = False
-        if self.cap:
-            self.cap.release()
         self.quit()
-        self.wait()
+        timeout = CAMERA_CONFIG.CAPTURE_STOP_TIMEOUT
+        if not self.wait(timeout):
+            logging.warning(f"相机 {self.camera_id} 采集线程未在{timeout}ms内退出，强制释放相机")
+            cap = self.cap
+            if cap is not None:
+                cap.release()
+            if not self.wait(timeout):
+                logging.error(f"相机 {self.camera_id} 采集线程仍未退出，终止线程")
+                self.terminate()
+                self.wait(timeout)
+        logging.info(f"相机 {self.camera_id} 已停止: 显示{self.mailbox.published - self.mailbox.dropped}帧, "
+                     f"界面未取走丢弃{self.mailbox.dropped}帧, 采集端丢弃积压{self.drained}帧")
+        
+    def publish(self, frame):
+        """把帧放入信箱，信箱此前为空时通知界面"""
+        if self.mailbox.put(frame):
+            self.frame_available.emit(self.camera_id)
         
     def run(self):
         """线程运行函数"""
@@ -71,6 +129,8 @@ class CameraThread(QThread):
                 self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_CONFIG.DEFAULT_WIDTH)
                 self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_CONFIG.DEFAULT_HEIGHT)
                 self.cap.set(cv2.CAP_PROP_FPS, CAMERA_CONFIG.DEFAULT_FPS)
+                # 部分后端支持限制内部缓冲帧数，不支持时积压由采集循环丢弃
+                self.buffer_limited = bool(self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1))
                 print(f"相机 {self.camera_id} 设置参数: {CAMERA_CONFIG.DEFAULT_WIDTH}x{CAMERA_CONFIG.DEFAULT_HEIGHT}@{CAMERA_CONFIG.DEFAULT_FPS}fps")
             
             # 尝试读取一帧来验证摄像头是否正常工作
@@ -91,11 +151,34 @@ class CameraThread(QThread):
             self.generate_mock_frames()
             return
             
+        self.publish(test_frame)
+        try:
+            self.capture_latest_frames()
+        finally:
+            self.cap.release()
+    
+    def capture_latest_frames(self):
+        """按帧到达的速度读取：丢弃缓冲中积压的旧帧（每显示一帧最多丢弃CAPTURE_MAX_DRAIN帧），只解码要显示的帧"""
+        drain_threshold = CAMERA_CONFIG.CAPTURE_DRAIN_THRESHOLD / 1000.0
+        # 后端已把缓冲限制为1帧时不会积压，每帧都显示
+        max_drain = 0 if self.buffer_limited else CAMERA_CONFIG.CAPTURE_MAX_DRAIN
+        drained = 0
         while self.running:
-            ret, frame = self.cap.read()
+            start = time.perf_counter()
+            if not self.cap.grab():
+                # 读取失败（断流等）时稍后重试，不空转
+                drained = 0
+                self.msleep(CAMERA_CONFIG.MOCK_FRAME_INTERVAL)
+                continue
+            # 立即返回的是缓冲中积压的旧帧，丢弃后继续读；需要等待才返回的是刚到达的最新帧
+            if drained < max_drain and time.perf_counter() - start < drain_threshold:
+                drained += 1
+                self.drained += 1
+                continue
+            drained = 0
+            ret, frame = self.cap.retrieve()
             if ret:
-                self.frame_ready.emit(frame, self.camera_id)
-            self.msleep(CAMERA_CONFIG.MOCK_FRAME_INTERVAL)  # 使用配置的帧间隔
+                self.publish(frame)
             
     def generate_mock_frames(self):
         """生成模拟相机画面"""
@@ -127,5 +210,5 @@ class CameraThread(QThread):
             y = int(CAMERA_CONFIG.MOCK_FRAME_HEIGHT//2 + 200 * np.cos(t * 1.5))  # 中心y
             cv2.circle(frame, (x, y), 40, (0, 255, 255), -1)
             
-            self.frame_ready.emit(frame, self.camera_id)
+            self.publish(frame)
             self.msleep(CAMERA_CONFIG.MOCK_FRAME_INTERVAL)  # 使用配置的帧间隔
\ No newline at end of file
@@ -178,7 +178,7 @@ class CameraWidget(QWidget):
         """启动相机"""
         if self.camera_thread is None:
             self.camera_thread = CameraThread(self.camera_id, self.use_rtsp)
-            self.camera_thread.frame_ready.connect(self.update_frame)
+            self.camera_thread.frame_available.connect(self.on_frame_available)
             self.camera_thread.start_camera()
             
     def stop_camera(self):
@@ -187,11 +187,19 @@ class CameraWidget(QWidget):
             self.camera_thread.stop_camera()
             self.camera_thread = None
             
-    @pyqtSlot(object, int)
+    @pyqtSlot(int)
+    def on_frame_available(self, camera_id):
+        """相机信箱中有新帧：取走最新的一帧显示，界面处理期间到达的旧帧已在信箱中被覆盖"""
+        if self.camera_thread is None:
+            return
+        frame = self.camera_thread.mailbox.take()
+        if frame is not None:
+            self.update_frame(frame, camera_id)
+    
     def update_frame(self, frame, camera_id):
         """更新视频帧"""
         if camera_id == self.camera_id:
-            self.current_frame = frame.copy()
+            self.current_frame = frame  # 从信箱取走的帧只归界面所有，无需复制
             
             # 如果正在录制，写入帧
             if self.recorder.is_recording():
@@ -1,9 +1,10 @@
 import sys
 import logging
-from PyQt5.QtCore import QObject, QTimer, pyqtSignal, Qt
+from PyQt5.QtCore import QObject, pyqtSignal, Qt
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QCheckBox, QLabel, QFrame, QTextEdit
 from PyQt5.QtGui import QKeyEvent
 from config.uwbot_config import KEYBOARD_CONTROL_CONFIG
+from ui_modules.frame_scheduler import PRIORITY_HIGH
 """
 浮游模式控制:
   移动控制: W(前进) S(后退) A(左移) D(右移) Q(上升) E(下降)
@@ -74,9 +75,7 @@ class KeyboardController(QObject):
             Qt.Key_Right: ('wheel_angular_vel', self.step_size), # 轮式右转
         }
         
-        # 设置定时器用于持续按键检测
-        self.key_timer = QTimer()
-        self.key_timer.timeout.connect(self.process_continuous_keys)
+        # 持续按键检测由帧调度器按KEY_TIMER_INTERVAL周期调用（见register_frame_tasks）
         self.pressed_keys = set()
         
         logging.info("键盘控制器初始化完成")
@@ -85,13 +84,16 @@ class KeyboardController(QObject):
         """设置键盘控制是否启用"""
         self.enabled = enabled
         if enabled:
-            self.key_timer.start(KEYBOARD_CONTROL_CONFIG.KEY_TIMER_INTERVAL)  # 使用配置的定时器间隔
             logging.info("键盘控制已启用")
         else:
-            self.key_timer.stop()
             self.pressed_keys.clear()
             logging.info("键盘控制已禁用")
     
+    def register_frame_tasks(self, scheduler):
+        """注册到帧调度器：持续按键检测直接改变控制命令，按高优先级执行"""
+        scheduler.register("键盘控制", self.process_continuous_keys,
+                           1000.0 / KEYBOARD_CONTROL_CONFIG.KEY_TIMER_INTERVAL, PRIORITY_HIGH, budget_ms=1)
+    
     def handle_key_press(self, key):
         """处理按键按下事件"""
         if not self.enabled:
@@ -766,14 +766,23 @@ class MotionControlWidget(QWidget):
         
     def setup_real_time_feedback(self):
         """设置实时反馈"""
-        # 设置定时器用于更新状态显示
-        from PyQt5.QtCore import QTimer
-        self.status_timer = QTimer()
-        self.status_timer.timeout.connect(self.update_status_indicators)
-        self.status_timer.start(self.robot_data.app_dt)  # 使用统一的app_dt参数，50Hz更新一次
+        # 控制命令变化时（参数界面、键盘等修改）同步控件并更新状态指示器，不再定时轮询
+        self._cmd_changed_pending = False
+        self.robot_data.subscribe(self.on_cmd_changed, ("cmd",))
         
         logging.info("实时状态反馈系统已启动")
     
+    def on_cmd_changed(self, seq, mask):
+        """控制命令变化事件：可见时立即同步，否则留待显示时同步"""
+        self._cmd_changed_pending = True
+        if self.isVisible():
+            self.update_display()
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._cmd_changed_pending:
+            self.update_display()
+    
     def create_status_indicators(self):
         """创建状态指示器"""
         # 在浮游模式组中添加状态标签
@@ -1070,6 +1079,7 @@ class MotionControlWidget(QWidget):
         
         # 记录浮游模式参数变更到日志
         logging.info(f"浮游模式参数更新: vel_x={floating_cmd.cmd_floating_vel_x}, vel_y={floating_cmd.cmd_floating_vel_y}, vel_z={floating_cmd.cmd_floating_vel_z}, ang_roll={floating_cmd.cmd_floating_angular_roll}, ang_yaw={floating_cmd.cmd_floating_angular_yaw}, ang_pitch={floating_cmd.cmd_floating_angular_pitch}, depth_hold={floating_cmd.cmd_depth_hold}, target_depth={floating_cmd.cmd_target_depth}")
+        self.update_status_indicators()
         
     def update_wheel_commands(self):
         """更新轮式模式命令"""
@@ -1084,6 +1094,7 @@ class MotionControlWidget(QWidget):
         
         # 记录轮式模式参数变更到日志
         logging.info(f"轮式模式参数更新: linear_vel={wheel_cmd.cmd_wheel_linear_vel}, angular_vel={wheel_cmd.cmd_wheel_angular_vel}, heading_hold={wheel_cmd.cmd_wheel_heading_hold}, target_heading={wheel_cmd.cmd_target_heading}")
+        self.update_status_indicators()
         
     def update_brush_commands(self):
         """更新清洗功能命令"""
@@ -1101,6 +1112,7 @@ class MotionControlWidget(QWidget):
         
     def update_display(self):
         """更新显示数据"""
+        self._cmd_changed_pending = False
         cmd_data = self.robot_data.get_cmd_data()
         
         # 更新浮游模式显示
@@ -1189,4 +1201,6 @@ class MotionControlWidget(QWidget):
         
         self.water_flow_spinbox.blockSignals(True)
         self.water_flow_spinbox.setValue(brush_cmd.cmd_water_flow)
-        self.water_flow_spinbox.blockSignals(False)
\ No newline at end of file
+        self.water_flow_spinbox.blockSignals(False)
+        
+        self.update_status_indicators()
@@ -11,6 +11,12 @@ class MainStatusBar(QWidget):
         super().__init__()
         self.robot_data = robot_data
         self.init_ui()
+        # 系统状态变化时刷新（链路空闲时运行时间每秒变化一次，延迟显示随之更新）
+        self.robot_data.subscribe(self.on_state_changed, ("state_system",))
+    
+    def on_state_changed(self, seq, mask):
+        """系统状态变化事件"""
+        self.update_display()
     
     def init_ui(self):
         """初始化UI"""
@@ -181,8 +187,7 @@ class MainStatusBar(QWidget):
     def update_display(self):
         """更新显示数据"""
         try:
-            state_data = self.robot_data.get_state_data()
-            system_state = state_data.state_system
+            system_state = self.robot_data.get_state_group("state_system")
             
             # 数值
             voltage = float(getattr(system_state, 'sta_system_voltage', 0.0))
@@ -10,16 +10,71 @@ from PyQt5.QtWidgets import (
     QFrame, QGroupBox, QScrollArea, QSpacerItem, QSizePolicy
 )
 from PyQt5.QtCore import Qt, QSize, QRectF
-from PyQt5.QtGui import QFont, QPalette, QPainter
+from PyQt5.QtGui import QFont, QPalette, QPainter, QPixmap
 from PyQt5.QtSvg import QSvgRenderer
 import math
 import os
 from pathlib import Path
 
+
+class SvgPixmapCache:
+    """SVG图层的位图缓存
+
+    矢量渲染（带抗锯齿）只在组件尺寸或设备像素比变化、或更换SVG时进行一次，
+    之后每次paintEvent只绘制缓存的位图，旋转层以变换绘制同一张位图。
+    多个固定图层可合成为一张位图。
+    """
+    def __init__(self):
+        self._key = None
+        self._pixmaps = {}
+
+    def invalidate(self):
+        self._pixmaps.clear()
+
+    def get(self, name, renderers, widget):
+        """返回按当前尺寸渲染的图层位图，renderers按绘制顺序排列，都无效时返回None"""
+        ratio = widget.devicePixelRatioF()
+        key = (widget.width(), widget.height(), ratio)
+        if key != self._key:
+            self._key = key
+            self._pixmaps.clear()
+        if name not in self._pixmaps:
+            self._pixmaps[name] = self._render(renderers, widget.width(), widget.height(), ratio)
+        return self._pixmaps[name]
+
+    @staticmethod
+    def _render(renderers, width, height, ratio):
+        renderers = [renderer for renderer in renderers if renderer and renderer.isValid()]
+        if not renderers or width <= 0 or height <= 0:
+            return None
+        pixmap = QPixmap(int(round(width * ratio)), int(round(height * ratio)))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        for renderer in renderers:
+            renderer.render(painter, QRectF(0, 0, width, height))
+        painter.end()
+        return pixmap
+
+
+def draw_rotated(painter, widget, pixmap, angle_deg):
+    """以组件中心为轴旋转绘制缓存的位图"""
+    cx, cy = widget.width() / 2.0, widget.height() / 2.0
+    painter.save()
+    painter.translate(cx, cy)
+    painter.rotate(angle_deg)
+    painter.translate(-cx, -cy)
+    painter.drawPixmap(0, 0, pixmap)
+    painter.restore()
+
+
 class RotatingSvgWidget(QWidget):
     """用于显示并根据角度旋转的SVG绘制组件"""
     def __init__(self, svg_path: str, size: QSize = QSize(120, 120), parent=None):
         super().__init__(parent)
+        self._cache = SvgPixmapCache()
         self._renderer = None
         self._angle_deg = 0.0
         self._size = size
@@ -29,38 +84,39 @@ class RotatingSvgWidget(QWidget):
     def set_svg(self, svg_path: str):
         if svg_path and os.path.exists(svg_path):
             self._renderer = QSvgRenderer(svg_path)
-            self.update()
         else:
             self._renderer = None
-            self.update()
+        self._cache.invalidate()
+        self.update()
 
     def set_angle(self, angle_deg: float):
         if abs(angle_deg - self._angle_deg) > 0.01:
             self._angle_deg = angle_deg
             self.update()
 
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._cache.invalidate()
+
     def paintEvent(self, event):
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
         painter.setRenderHint(QPainter.SmoothPixmapTransform)
-        if not self._renderer or not self._renderer.isValid():
+        pixmap = self._cache.get("svg", [self._renderer], self)
+        if pixmap is None:
             # 无资源时画一个占位圆圈
+            painter.setRenderHint(QPainter.Antialiasing)
             painter.setPen(Qt.gray)
             painter.drawEllipse(2, 2, self.width()-4, self.height()-4)
             return
-        # 以中心旋转
-        cx, cy = self.width() / 2.0, self.height() / 2.0
-        painter.translate(cx, cy)
-        painter.rotate(self._angle_deg)
-        painter.translate(-cx, -cy)
-        # 将SVG等比渲染至当前区域
-        self._renderer.render(painter, QRectF(self.rect()))
+        # 以中心旋转绘制缓存的位图
+        draw_rotated(painter, self, pixmap, self._angle_deg)
         painter.end()
 
 class CompositeHsiWidget(QWidget):
     """复合HSI组件：固定背景 + 旋转前景"""
     def __init__(self, background_path: str, foreground_path: str, size: QSize = QSize(120, 120), parent=None):
         super().__init__(parent)
+        self._cache = SvgPixmapCache()
         self._background_renderer = None
         self._foreground_renderer = None
         self._angle_deg = 0.0
@@ -72,44 +128,45 @@ class CompositeHsiWidget(QWidget):
     def set_background(self, svg_path: str):
         if svg_path and os.path.exists(svg_path):
             self._background_renderer = QSvgRenderer(svg_path)
-            self.update()
         else:
             self._background_renderer = None
-            self.update()
+        self._cache.invalidate()
+        self.update()
 
     def set_foreground(self, svg_path: str):
         if svg_path and os.path.exists(svg_path):
             self._foreground_renderer = QSvgRenderer(svg_path)
-            self.update()
         else:
             self._foreground_renderer = None
-            self.update()
+        self._cache.invalidate()
+        self.update()
 
     def set_angle(self, angle_deg: float):
         if abs(angle_deg - self._angle_deg) > 0.01:
             self._angle_deg = angle_deg
             self.update()
 
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._cache.invalidate()
+
     def paintEvent(self, event):
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
         painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        background = self._cache.get("background", [self._background_renderer], self)
+        foreground = self._cache.get("foreground", [self._foreground_renderer], self)
         
         # 绘制固定背景
-        if self._background_renderer and self._background_renderer.isValid():
-            self._background_renderer.render(painter, QRectF(self.rect()))
+        if background is not None:
+            painter.drawPixmap(0, 0, background)
         
         # 绘制旋转前景
-        if self._foreground_renderer and self._foreground_renderer.isValid():
-            cx, cy = self.width() / 2.0, self.height() / 2.0
-            painter.translate(cx, cy)
-            painter.rotate(self._angle_deg)
-            painter.translate(-cx, -cy)
-            self._foreground_renderer.render(painter, QRectF(self.rect()))
+        if foreground is not None:
+            draw_rotated(painter, self, foreground, self._angle_deg)
         
         # 如果都没有资源，画占位圆圈
-        if (not self._background_renderer or not self._background_renderer.isValid()) and \
-           (not self._foreground_renderer or not self._foreground_renderer.isValid()):
+        if background is None and foreground is None:
+            painter.setRenderHint(QPainter.Antialiasing)
             painter.setPen(Qt.gray)
             painter.drawEllipse(2, 2, self.width()-4, self.height()-4)
         
@@ -119,6 +176,7 @@ class CompositeAdiWidget(QWidget):
     """复合ADI组件：多层固定背景 + 旋转前景"""
     def __init__(self, back_path: str, face_path: str, ring_path: str, case_path: str, size: QSize = QSize(120, 120), parent=None):
         super().__init__(parent)
+        self._cache = SvgPixmapCache()
         self._back_renderer = None
         self._face_renderer = None
         self._ring_renderer = None
@@ -134,68 +192,62 @@ class CompositeAdiWidget(QWidget):
     def set_back(self, svg_path: str):
         if svg_path and os.path.exists(svg_path):
             self._back_renderer = QSvgRenderer(svg_path)
-            self.update()
         else:
             self._back_renderer = None
-            self.update()
+        self._cache.invalidate()
+        self.update()
 
     def set_face(self, svg_path: str):
         if svg_path and os.path.exists(svg_path):
             self._face_renderer = QSvgRenderer(svg_path)
-            self.update()
         else:
             self._face_renderer = None
-            self.update()
+        self._cache.invalidate()
+        self.update()
 
     def set_ring(self, svg_path: str):
         if svg_path and os.path.exists(svg_path):
             self._ring_renderer = QSvgRenderer(svg_path)
-            self.update()
         else:
             self._ring_renderer = None
-            self.update()
+        self._cache.invalidate()
+        self.update()
 
     def set_case(self, svg_path: str):
         if svg_path and os.path.exists(svg_path):
             self._case_renderer = QSvgRenderer(svg_path)
-            self.update()
         else:
             self._case_renderer = None
-            self.update()
+        self._cache.invalidate()
+        self.update()
 
     def set_angle(self, angle_deg: float):
         if abs(angle_deg - self._angle_deg) > 0.01:
             self._angle_deg = angle_deg
             self.update()
 
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._cache.invalidate()
+
     def paintEvent(self, event):
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
         painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        # 固定的back、face、ring三层合成为一张位图
+        background = self._cache.get("background",
+                                     [self._back_renderer, self._face_renderer, self._ring_renderer], self)
+        case = self._cache.get("case", [self._case_renderer], self)
         
-        # 按层次顺序绘制固定背景
-        if self._back_renderer and self._back_renderer.isValid():
-            self._back_renderer.render(painter, QRectF(self.rect()))
-        
-        if self._face_renderer and self._face_renderer.isValid():
-            self._face_renderer.render(painter, QRectF(self.rect()))
-        
-        if self._ring_renderer and self._ring_renderer.isValid():
-            self._ring_renderer.render(painter, QRectF(self.rect()))
+        if background is not None:
+            painter.drawPixmap(0, 0, background)
         
         # 绘制旋转前景（case）
-        if self._case_renderer and self._case_renderer.isValid():
-            cx, cy = self.width() / 2.0, self.height() / 2.0
-            painter.translate(cx, cy)
-            painter.rotate(self._angle_deg)
-            painter.translate(-cx, -cy)
-            self._case_renderer.render(painter, QRectF(self.rect()))
+        if case is not None:
+            draw_rotated(painter, self, case, self._angle_deg)
         
         # 如果都没有资源，画占位圆圈
-        if (not self._back_renderer or not self._back_renderer.isValid()) and \
-           (not self._face_renderer or not self._face_renderer.isValid()) and \
-           (not self._ring_renderer or not self._ring_renderer.isValid()) and \
-           (not self._case_renderer or not self._case_renderer.isValid()):
+        if background is None and case is None:
+            painter.setRenderHint(QPainter.Antialiasing)
             painter.setPen(Qt.gray)
             painter.drawEllipse(2, 2, self.width()-4, self.height()-4)
         
@@ -207,7 +259,24 @@ class StatusDisplayWidget(QWidget):
     def __init__(self, robot_data):
         super().__init__()
         self.robot_data = robot_data
+        self._pending_mask = 0  # 隐藏期间累积的变化，重新显示时补刷新
         self.init_ui()
+        # 只订阅本组件显示的子结构体，系统状态由主界面状态栏负责
+        self.robot_data.subscribe(self.on_state_changed, (
+            "state_robot", "state_floating_mode", "state_wheel_mode",
+            "state_electromagnet", "state_brush",
+        ))
+        
+    def on_state_changed(self, seq, mask):
+        """状态变化事件：可见时立即刷新变化的部分，否则留待显示时刷新"""
+        self._pending_mask |= mask
+        if self.isVisible():
+            self.update_display()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._pending_mask:
+            self.update_display()
         
     def _resource_path(self, rel_path: str) -> str:
         """智能定位资源路径: 优先cwd相对路径, 不存在则基于项目根(相对当前文件上上上级)"""
@@ -634,11 +703,23 @@ class StatusDisplayWidget(QWidget):
             )
         
     def update_display(self):
-        """更新显示数据"""
-        state_data = self.robot_data.get_state_data()
-        
-        # 更新机器人状态
-        robot_state = state_data.state_robot
+        """刷新自上次刷新以来发生变化的子结构体"""
+        mask = self._pending_mask
+        self._pending_mask = 0
+        group_mask = self.robot_data.group_mask
+        get_state_group = self.robot_data.get_state_group
+        if mask & group_mask("state_robot"):
+            self._update_robot_display(get_state_group("state_robot"))
+        if mask & group_mask("state_floating_mode"):
+            self._update_floating_display(get_state_group("state_floating_mode"))
+        if mask & group_mask("state_wheel_mode"):
+            self._update_wheel_display(get_state_group("state_wheel_mode"))
+        if mask & group_mask("state_electromagnet", "state_brush"):
+            self._update_feature_display(get_state_group("state_electromagnet"), get_state_group("state_brush"))
+        # 系统状态信息由主界面底部状态栏统一更新显示
+
+    def _update_robot_display(self, robot_state):
+        """更新机器人状态"""
         self.pos_x_label.setText(f"{robot_state.sta_position_x:.2f}")
         self.pos_y_label.setText(f"{robot_state.sta_position_y:.2f}")
         self.pos_z_label.setText(f"{robot_state.sta_position_z:.2f}")
@@ -656,8 +737,8 @@ class StatusDisplayWidget(QWidget):
             self.hsi_widget.set_angle(yaw_deg)
             self.hsi_value_label.setText(f"{yaw_deg:.1f}°")
         
-        # 更新浮游模式状态
-        floating_state = state_data.state_floating_mode
+    def _update_floating_display(self, floating_state):
+        """更新浮游模式状态"""
         self.float_vel_x_label.setText(f"{floating_state.sta_floating_vel_x:.2f}")
         self.float_vel_y_label.setText(f"{floating_state.sta_floating_vel_y:.2f}")
         self.float_vel_z_label.setText(f"{floating_state.sta_floating_vel_z:.2f}")
@@ -676,8 +757,8 @@ class StatusDisplayWidget(QWidget):
             else:
                 temp_label.setText("25.0")
         
-        # 更新轮式模式状态
-        wheel_state = state_data.state_wheel_mode
+    def _update_wheel_display(self, wheel_state):
+        """更新轮式模式状态"""
         self.wheel_linear_vel_label.setText(f"{wheel_state.sta_wheel_linear_vel:.2f}")
         self.wheel_angular_vel_label.setText(f"{wheel_state.sta_wheel_angular_vel:.2f}")
         
@@ -697,14 +778,12 @@ class StatusDisplayWidget(QWidget):
             else:
                 temp_label.setText("25.0")
         
-        # 更新电磁铁状态 (底部行)
-        electromagnet_state = state_data.state_electromagnet
+    def _update_feature_display(self, electromagnet_state, brush_state):
+        """更新电磁铁与清洗功能状态 (底部行)"""
         em_on = bool(electromagnet_state.sta_electromagnet_enable)
         self.electromagnet_enable_label.setText("开启" if em_on else "关闭")
         self._set_badge_style(self.electromagnet_enable_label, em_on)
         self.electromagnet_voltage_label.setText(f"{electromagnet_state.sta_electromagnet_voltage}")
-        # 更新清洗功能状态 (底部行)
-        brush_state = state_data.state_brush
         self.brush_power_label.setText(f"{brush_state.sta_brush_power}")
         br_on = bool(brush_state.sta_brush_enable)
         self.brush_enable_label.setText("开启" if br_on else "关闭")
@@ -714,5 +793,3 @@ class StatusDisplayWidget(QWidget):
         self.water_enable_label.setText("开启" if wt_on else "关闭")
         self._set_badge_style(self.water_enable_label, wt_on)
         
-        # 系统状态信息由主界面底部状态栏统一更新显示
-        
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+界面性能统计
+用于找出50Hz刷新的众多组件中是哪一个造成了卡顿：
+- 组件耗时：ui_modules中各QWidget子类自己实现的update_display/update_plot/paintEvent在启用时被替换为计时包装，
+  每次调用的耗时记入该方法的直方图（对数分桶，约12%分辨率，按"模块.类.方法"区分同名类），停用时恢复原方法，平时没有任何额外开销；
+- 帧任务耗时：已关联的帧调度器中每个任务的耗时记入"帧任务:名称"的直方图。调度器保存的是注册时的回调
+  （多为绑定方法），替换类上的方法对它们无效，所以直接由调度器在执行任务后回报耗时，先注册的任务同样计入；
+- 节拍抖动：MainWindow.update_data等按固定周期调用的方法，记录实际调用间隔与标称间隔之差；
+- 界面线程负载：界面线程消耗的CPU时间占窗口时长的比例（事件循环阻塞等待时不消耗CPU）；
+- 事件循环延迟：高精度探测定时器实际触发时刻比预定时刻晚了多少。
+统计按窗口累计，每次snapshot()取出当前窗口的p50/p99并开始新窗口。
+"""
+import bisect
+import sys
+import time
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import QWidget
+from config.uwbot_config import MAIN_CONFIG
+
+INSTRUMENTED_METHODS = ("update_display", "update_plot", "paintEvent")
+# 直方图分桶上沿：0.001ms~1000ms，每10倍20个桶
+BUCKET_EDGES = [10 ** (exponent / 20.0) for exponent in range(-60, 61)]
+
+
+class DurationHistogram:
+    """耗时直方图（毫秒），对数分桶，记录一次只做一次二分查找"""
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_EDGES) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms):
+        self.counts[bisect.bisect_left(BUCKET_EDGES, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, fraction):
+        """返回第fraction分位所在桶的上沿（不超过实际最大值），没有数据时返回0"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target:
+                break
+        return min(BUCKET_EDGES[index], self.max) if index < len(BUCKET_EDGES) else self.max
+
+
+class FrameProfiler:
+    """界面性能统计（只在界面线程中使用，snapshot()须在界面线程中调用）"""
+
+    def __init__(self, lag_probe_interval_ms=50):
+        self.enabled = False
+        self.lag_probe_interval = lag_probe_interval_ms
+        self._sections = {}  # 名称 -> DurationHistogram
+        self._ticks = {}  # 名称 -> (标称间隔ms, 上次调用时刻, 抖动直方图)
+        self._lag = DurationHistogram()
+        self._patched = []  # (类, 方法名, 原方法)
+        self._tick_targets = []  # (类, 方法名, 标称间隔ms, 名称)
+        self._schedulers = []  # 已关联的帧调度器
+        self._window_start = time.perf_counter()
+        self._window_cpu = time.thread_time()  # 窗口开始时界面线程已消耗的CPU时间
+        self._probe_due = 0.0
+        self._probe = QTimer()
+        self._probe.setTimerType(Qt.PreciseTimer)
+        self._probe.timeout.connect(self._on_probe)
+
+    # ------------------------------------------------------------------
+    # 启用/停用
+    # ------------------------------------------------------------------
+    def add_tick(self, cls, method_name, nominal_ms, name=None):
+        """登记按固定周期调用的方法，启用时记录其耗时和调用间隔抖动"""
+        self._tick_targets.append((cls, method_name, nominal_ms, name or qualified_name(cls, method_name)))
+        if self.enabled:
+            self._patch_tick(*self._tick_targets[-1])
+
+    def attach_scheduler(self, scheduler):
+        """关联帧调度器，启用期间统计其全部帧任务（包括关联前已注册的）的耗时"""
+        self._schedulers.append(scheduler)
+        if self.enabled:
+            scheduler.task_observer = self._on_task
+
+    def set_enabled(self, enabled):
+        if enabled == self.enabled:
+            return
+        self.enabled = enabled
+        if enabled:
+            for cls in discover_widget_classes():
+                for method_name in INSTRUMENTED_METHODS:
+                    if method_name in cls.__dict__:
+                        self._patch_section(cls, method_name)
+            for target in self._tick_targets:
+                self._patch_tick(*target)
+            for scheduler in self._schedulers:
+                scheduler.task_observer = self._on_task
+            self.reset()
+            self._probe_due = time.perf_counter() + self.lag_probe_interval / 1000.0
+            self._probe.start(self.lag_probe_interval)
+        else:
+            self._probe.stop()
+            for scheduler in self._schedulers:
+                scheduler.task_observer = None
+            for cls, method_name, original in reversed(self._patched):
+                setattr(cls, method_name, original)
+            self._patched.clear()
+
+    def reset(self):
+        """开始新的统计窗口"""
+        self._sections.clear()
+        for name, (nominal, _, _) in self._ticks.items():
+            self._ticks[name] = (nominal, None, DurationHistogram())
+        self._lag = DurationHistogram()
+        self._window_start = time.perf_counter()
+        self._window_cpu = time.thread_time()
+
+    # ------------------------------------------------------------------
+    # 计时包装
+    # ------------------------------------------------------------------
+    def _patch_section(self, cls, method_name):
+        original = cls.__dict__[method_name]
+        name = qualified_name(cls, method_name)
+        record = self.record
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                record(name, (perf_counter() - start) * 1000.0)
+
+        setattr(cls, method_name, timed)
+        self._patched.append((cls, method_name, original))
+
+    def _patch_tick(self, cls, method_name, nominal_ms, name):
+        original = cls.__dict__[method_name]
+        self._ticks[name] = (nominal_ms, None, DurationHistogram())
+        record = self.record
+        ticks = self._ticks
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            nominal, last, jitter = ticks[name]
+            if last is not None:
+                jitter.add(abs((start - last) * 1000.0 - nominal))
+            ticks[name] = (nominal, start, jitter)
+            try:
+                return original(*args, **kwargs)
+            finally:
+                record(name, (perf_counter() - start) * 1000.0)
+
+        setattr(cls, method_name, timed)
+        self._patched.append((cls, method_name, original))
+
+    def _on_task(self, task, ms):
+        self.record(f"帧任务:{task.name}", ms)
+
+    def record(self, name, ms):
+        histogram = self._sections.get(name)
+        if histogram is None:
+            histogram = self._sections[name] = DurationHistogram()
+        histogram.add(ms)
+
+    # ------------------------------------------------------------------
+    # 事件循环延迟
+    # ------------------------------------------------------------------
+    def _on_probe(self):
+        now = time.perf_counter()
+        self._lag.add(max(0.0, (now - self._probe_due) * 1000.0))
+        self._probe_due = now + self.lag_probe_interval / 1000.0
+
+    # ------------------------------------------------------------------
+    # 结果
+    # ------------------------------------------------------------------
+    def snapshot(self, reset=True):
+        """返回当前窗口的统计并（默认）开始新窗口
+
+        {"window": 窗口秒数, "load": 界面线程负载(0~1), "lag_p50", "lag_p99", "lag_max": 事件循环延迟ms,
+         "ticks": [(名称, 抖动p50, 抖动p99, 抖动最大), ...],
+         "sections": [(名称, 每秒调用次数, p50, p99, 最大, 占用比例), ...]（按总耗时从大到小）}
+        """
+        now = time.perf_counter()
+        window = max(now - self._window_start, 1e-6)
+        cpu = time.thread_time() - self._window_cpu
+        sections = sorted(self._sections.items(), key=lambda item: item[1].total, reverse=True)
+        result = {
+            "window": window,
+            "load": min(1.0, cpu / window),
+            "lag_p50": self._lag.percentile(0.5),
+            "lag_p99": self._lag.percentile(0.99),
+            "lag_max": self._lag.max,
+            "ticks": [(name, jitter.percentile(0.5), jitter.percentile(0.99), jitter.max)
+                      for name, (_, _, jitter) in self._ticks.items()],
+            "sections": [(name, h.count / window, h.percentile(0.5), h.percentile(0.99), h.max,
+                          h.total / 1000.0 / window) for name, h in sections],
+        }
+        if reset:
+            self.reset()
+        return result
+
+
+def qualified_name(cls, method_name):
+    """统计项名称：模块.类.方法，不同模块中的同名类不会混在同一个直方图里"""
+    return f"{cls.__module__}.{cls.__qualname__}.{method_name}"
+
+
+def discover_widget_classes(package="ui_modules"):
+    """已导入的package各模块中定义的QWidget子类"""
+    classes = []
+    for module_name, module in list(sys.modules.items()):
+        if module is None or not (module_name == package or module_name.startswith(package + ".")):
+            continue
+        for value in list(vars(module).values()):
+            if isinstance(value, type) and issubclass(value, QWidget) and value.__module__ == module_name:
+                classes.append(value)
+    return classes
+
+
+_profiler = None
+
+
+def get_profiler():
+    """获取界面性能统计单例（首次调用须在QApplication创建之后）"""
+    global _profiler
+    if _profiler is None:
+        _profiler = FrameProfiler(MAIN_CONFIG.PROFILER_LAG_PROBE_INTERVAL)
+    return _profiler
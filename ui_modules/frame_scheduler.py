@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+帧调度器
+主程序只保留一个按帧间隔（MAIN_CONFIG.UPDATE_TIMER_INTERVAL）触发的定时器，各界面组件把周期性工作注册为帧任务，
+不再各自创建互不同步的QTimer：事件循环只在帧边界被唤醒，各组件在同一帧内依次刷新。
+
+每个任务有目标频率、优先级和单次耗时预算：
+- 目标频率低于帧率的任务按累计的到期时刻执行，平均频率与目标一致；
+- 绑定了组件的任务在组件不可见时跳过；
+- 本帧已用时间超过帧预算后，本帧剩余的普通/低优先级任务推迟到下一帧（记为丢弃），关键和高优先级任务照常执行；
+- 每个任务记录最近、平均、最大耗时以及超出自身预算、被丢弃的次数，供性能统计显示和退出时的日志使用。
+"""
+import logging
+import time
+from PyQt5.QtCore import Qt, QTimer
+
+PRIORITY_CRITICAL = 0  # 数据收发等每帧必须执行的工作
+PRIORITY_HIGH = 1  # 直接影响控制命令的工作（如键盘控制）
+PRIORITY_NORMAL = 2  # 可见组件的重绘
+PRIORITY_LOW = 3  # 日志刷新等可推迟的工作
+PRIORITY_NAMES = {PRIORITY_CRITICAL: "关键", PRIORITY_HIGH: "高", PRIORITY_NORMAL: "普通", PRIORITY_LOW: "低"}
+AVERAGE_WEIGHT = 0.1  # 平均耗时的指数滑动权重
+
+
+class FrameTask:
+    """注册到帧调度器的一项周期性工作"""
+    __slots__ = ("name", "callback", "period", "priority", "budget", "widget", "enabled",
+                 "next_due", "last_ms", "avg_ms", "max_ms", "runs", "overruns", "drops")
+
+    def __init__(self, name, callback, rate, priority, budget_ms, widget):
+        self.name = name
+        self.callback = callback
+        self.period = 1.0 / rate
+        self.priority = priority
+        self.budget = budget_ms
+        self.widget = widget  # 不可见时跳过，None表示不受可见性限制
+        self.enabled = True
+        self.next_due = 0.0
+        self.last_ms = 0.0
+        self.avg_ms = 0.0
+        self.max_ms = 0.0
+        self.runs = 0
+        self.overruns = 0  # 单次耗时超出自身预算的次数
+        self.drops = 0  # 因帧超时被推迟的次数
+
+    def record(self, elapsed_ms):
+        self.last_ms = elapsed_ms
+        self.avg_ms = elapsed_ms if not self.runs else self.avg_ms + AVERAGE_WEIGHT * (elapsed_ms - self.avg_ms)
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.runs += 1
+        if elapsed_ms > self.budget:
+            self.overruns += 1
+
+
+class FrameScheduler:
+    """统一的帧定时器，按优先级依次执行到期的帧任务"""
+
+    def __init__(self, interval_ms, frame_budget_ms):
+        self.interval = interval_ms / 1000.0
+        self.frame_budget = frame_budget_ms
+        self.tasks = []  # 按优先级排序，同优先级按注册顺序
+        self.frames = 0
+        self.late_frames = 0  # 超出帧预算的帧数
+        self.last_frame_ms = 0.0
+        self.task_observer = None  # 每个任务执行后以(任务, 耗时ms)调用，性能统计启用期间设置
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.run_frame)
+
+    def register(self, name, callback, rate, priority=PRIORITY_NORMAL, budget_ms=None, widget=None):
+        """注册帧任务，rate为目标频率（Hz，不高于帧率），budget_ms默认为帧预算；返回FrameTask，可通过enabled暂停"""
+        rate = min(rate, 1.0 / self.interval)
+        task = FrameTask(name, callback, rate, priority,
+                         self.frame_budget if budget_ms is None else budget_ms, widget)
+        task.next_due = time.perf_counter()
+        self.tasks.append(task)
+        self.tasks.sort(key=lambda t: t.priority)
+        return task
+
+    def unregister(self, task):
+        if task in self.tasks:
+            self.tasks.remove(task)
+
+    def start(self):
+        self.timer.start(int(round(self.interval * 1000)))
+
+    def stop(self):
+        self.timer.stop()
+
+    def run_frame(self):
+        """执行一帧：到期且可见的任务按优先级执行，帧超时后推迟剩余的普通/低优先级任务"""
+        frame_start = time.perf_counter()
+        # 容许半帧的误差，避免频率为帧率整数分之一的任务因定时抖动被推迟一帧
+        horizon = frame_start + self.interval / 2
+        for task in self.tasks:
+            if not task.enabled or task.next_due > horizon:
+                continue
+            # 按到期时刻累计，保持平均频率；落后超过一个周期（如暂停后）则从现在重新计时
+            task.next_due = max(task.next_due + task.period, frame_start)
+            if task.widget is not None and not task.widget.isVisible():
+                continue
+            if task.priority > PRIORITY_HIGH and (time.perf_counter() - frame_start) * 1000.0 > self.frame_budget:
+                task.drops += 1
+                task.next_due = frame_start  # 下一帧优先补上
+                continue
+            start = time.perf_counter()
+            try:
+                task.callback()
+            except Exception:
+                logging.exception(f"帧任务执行失败: {task.name}")
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            task.record(elapsed_ms)
+            if self.task_observer is not None:
+                self.task_observer(task, elapsed_ms)
+
+        self.last_frame_ms = (time.perf_counter() - frame_start) * 1000.0
+        self.frames += 1
+        if self.last_frame_ms > self.frame_budget:
+            self.late_frames += 1
+
+    def stats(self):
+        """各任务的耗时统计，按优先级排列"""
+        return [{
+            "name": task.name,
+            "priority": PRIORITY_NAMES.get(task.priority, str(task.priority)),
+            "rate": 1.0 / task.period,
+            "last_ms": task.last_ms,
+            "avg_ms": task.avg_ms,
+            "max_ms": task.max_ms,
+            "budget_ms": task.budget,
+            "runs": task.runs,
+            "overruns": task.overruns,
+            "drops": task.drops,
+        } for task in self.tasks]
+
+    def log_stats(self):
+        """把各任务的耗时统计写入日志"""
+        logging.info(f"帧调度: 共{self.frames}帧, 超出预算{self.late_frames}帧")
+        for item in self.stats():
+            logging.info(f"帧任务 {item['name']}({item['priority']}, {item['rate']:.0f}Hz): "
+                         f"执行{item['runs']}次, 平均{item['avg_ms']:.2f}ms, 最大{item['max_ms']:.2f}ms, "
+                         f"超预算{item['overruns']}次, 推迟{item['drops']}次")
@@ -15,8 +15,9 @@ from PyQt5.QtWidgets import (
     QCheckBox, QTextEdit, QFileDialog, QMessageBox, QScrollArea,
     QSizePolicy, QSpacerItem
 )
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QThread, pyqtSlot
+from PyQt5.QtCore import Qt, pyqtSignal, QThread, pyqtSlot
 from PyQt5.QtGui import QFont, QPalette, QColor, QTextCursor
+from ui_modules.frame_scheduler import PRIORITY_LOW
 
 class LogHandler(logging.Handler):
     """自定义日志处理器，用于将日志输出到GUI"""
@@ -344,9 +345,8 @@ class LogViewWidget(QWidget):
         self.logger.addHandler(self.gui_handler)
         self.logger.addHandler(self.file_handler)
         
-        # 设置自动刷新定时器
-        self.refresh_timer = QTimer()
-        self.refresh_timer.timeout.connect(self.refresh_logs)
+        # 自动刷新由帧调度器按refresh_interval周期调用（见register_frame_tasks）
+        self.refresh_task = None
         
         # 加载现有日志
         self.load_existing_logs()
@@ -431,13 +431,19 @@ class LogViewWidget(QWidget):
         else:
             self.status_label.setText("就绪")
     
+    def register_frame_tasks(self, scheduler):
+        """注册到帧调度器：自动刷新按低优先级执行，日志界面隐藏时跳过"""
+        self.refresh_task = scheduler.register("日志刷新", self.refresh_logs, 1000.0 / self.refresh_interval,
+                                               PRIORITY_LOW, widget=self)
+        self.refresh_task.enabled = self.auto_refresh_check.isChecked()
+    
     def toggle_auto_refresh(self, enabled):
         """切换自动刷新"""
+        if self.refresh_task is not None:
+            self.refresh_task.enabled = enabled
         if enabled:
-            self.refresh_timer.start(self.refresh_interval)
             self.status_label.setText(f"自动刷新已启用 ({self.refresh_interval//1000}秒)")
         else:
-            self.refresh_timer.stop()
             self.status_label.setText("自动刷新已禁用")
     
     def update_line_count(self):
@@ -8,11 +8,29 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QGroupBox, QScrollArea, QSpinBox, QDoubleSpinBox,
-    QCheckBox, QFrame, QLineEdit, QTableWidget, QTableWidgetItem,
-    QHeaderView, QAbstractItemView, QComboBox
+    QCheckBox, QFrame, QLineEdit, QTableView,
+    QHeaderView, QAbstractItemView, QComboBox, QShortcut, QApplication
 )
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QFont
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QFont, QKeySequence
+import re
+import time
+from config.uwbot_config import ROBOT_DATA_CONFIG
+from .parameter_model import ParameterTableModel
+
+# 参数表分组名 -> LowlevelState子结构体属性名（字段路径前缀）
+STATE_GROUP_ATTRS = {
+    "robot_status": "state_robot",
+    "floating_status": "state_floating_mode",
+    "wheel_status": "state_wheel_mode",
+    "electromagnet_status": "state_electromagnet",
+    "brush_status": "state_brush",
+    "system_status": "state_system",
+}
+# 粘贴的一行"参数名<分隔符>数值"，分隔符为制表符、等号、逗号或空白
+PASTE_LINE_PATTERN = re.compile(r"^\s*([\w\[\]]+)\s*[\t=,\s]\s*(\S+)\s*$")
+# 滚动统计列：表头, RollingStats.summary()中的下标
+STATS_COLUMNS = (("最小", 0), ("最大", 1), ("均值", 2), ("标准差", 3), ("变化率/s", 4))
 
 
 class ParameterWidget(QWidget):
@@ -135,15 +153,17 @@ class ParameterWidget(QWidget):
 
 
 class ParameterTableWidget(QWidget):
-    """参数表格显示组件"""
+    """参数表格显示组件（QTableView + ParameterTableModel）"""
     parameterChanged = pyqtSignal(str, str, object)  # 组名, 参数名, 新值
     plotSelectionChanged = pyqtSignal(str, str, int)  # 组名, 参数名, plot索引
+    parametersPasted = pyqtSignal(list)  # [(组名, 参数名, 新值), ...]，作为一次修改提交
     
-    def __init__(self, group_name, title, editable=False):
+    def __init__(self, group_name, title, editable=False, show_stats=False):
         super().__init__()
         self.group_name = group_name
         self.title = title
         self.editable = editable
+        self.show_stats = show_stats  # 是否在单位之后显示滚动统计列
         self.parameters = {}  # 存储参数信息
         self.init_ui()
         
@@ -173,14 +193,19 @@ class ParameterTableWidget(QWidget):
             }
         """)
         
-        # 创建表格
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)  # 参数名、值、单位、plot选择
-        self.table.setHorizontalHeaderLabels(["参数名称", "数值", "单位", "Plot选择"])
+        # 创建表格：参数名、值、单位、[滚动统计]、plot选择
+        stats_headers = [header for header, _ in STATS_COLUMNS] if self.show_stats else []
+        self.model = ParameterTableModel(stats_headers, self.editable, self)
+        if self.show_stats:
+            self.model.header_tooltip = f"最近{ROBOT_DATA_CONFIG.STATS_WINDOW_SECONDS:g}秒的统计"
+        self.model.valueEdited.connect(self.on_value_edited)
+        self.plot_column = self.model.plot_column
+        self.table = QTableView()
+        self.table.setModel(self.model)
         
         # 设置表格样式
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 gridline-color: #e9ecef;
                 background-color: #ffffff;
                 alternate-background-color: #f8f9fa;
@@ -188,11 +213,11 @@ class ParameterTableWidget(QWidget):
                 selection-color: #ffffff;
                 border: 1px solid #dee2e6;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 8px;
                 border: none;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #007bff;
                 color: #ffffff;
             }
@@ -209,10 +234,15 @@ class ParameterTableWidget(QWidget):
         self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table.horizontalHeader().setStretchLastSection(False)
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
-        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        # 数值和统计列每帧都在变，按内容自适应会让每次dataChanged都重新测量整列，改为固定初始宽度、可手动调整
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Interactive)
+        self.table.setColumnWidth(1, 120)
         self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Fixed)
-        self.table.setColumnWidth(3, 100)  # Plot选择列固定宽度100px
+        for column in range(3, self.plot_column):
+            self.table.horizontalHeader().setSectionResizeMode(column, QHeaderView.Interactive)
+            self.table.setColumnWidth(column, 80)
+        self.table.horizontalHeader().setSectionResizeMode(self.plot_column, QHeaderView.Fixed)
+        self.table.setColumnWidth(self.plot_column, 100)  # Plot选择列固定宽度100px
         
         # 设置表格大小策略，使其能够扩展填充空间
         from PyQt5.QtWidgets import QSizePolicy
@@ -223,8 +253,10 @@ class ParameterTableWidget(QWidget):
         self.table.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.table.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         
-        # 连接信号
-        self.table.itemChanged.connect(self.on_item_changed)
+        # Ctrl+V粘贴一组数值
+        paste_shortcut = QShortcut(QKeySequence.Paste, self.table)
+        paste_shortcut.setContext(Qt.WidgetShortcut)
+        paste_shortcut.activated.connect(self.paste_values)
         
         group_layout = QVBoxLayout(self.group_box)
         group_layout.setContentsMargins(10, 15, 10, 10)
@@ -234,8 +266,7 @@ class ParameterTableWidget(QWidget):
         
     def add_parameter(self, param_name, display_name, value, unit="", param_type="float", editable=None):
         """添加参数"""
-        row = self.table.rowCount()
-        self.table.insertRow(row)
+        row = self.model.add_parameter(param_name, display_name, value, unit, param_type, editable)
         
         # 存储参数信息
         self.parameters[param_name] = {
@@ -245,25 +276,6 @@ class ParameterTableWidget(QWidget):
             'row': row
         }
         
-        # 参数名称（不可编辑）
-        name_item = QTableWidgetItem(display_name)
-        name_item.setFlags(name_item.flags() & ~Qt.ItemIsEditable)
-        self.table.setItem(row, 0, name_item)
-        
-        # 参数值（根据editable设置是否可编辑）
-        value_item = QTableWidgetItem(str(value))
-        # 如果指定了editable参数，使用它；否则使用self.editable
-        param_editable = editable if editable is not None else self.editable
-        if not param_editable:
-            value_item.setFlags(value_item.flags() & ~Qt.ItemIsEditable)
-        value_item.setData(Qt.UserRole, param_name)  # 存储参数名
-        self.table.setItem(row, 1, value_item)
-        
-        # 单位（不可编辑）
-        unit_item = QTableWidgetItem(unit)
-        unit_item.setFlags(unit_item.flags() & ~Qt.ItemIsEditable)
-        self.table.setItem(row, 2, unit_item)
-        
         # Plot选择下拉框
         plot_combo = QComboBox()
         plot_combo.addItems(["-- 不显示 --", "图表 1", "图表 2", "图表 3", "图表 4"])
@@ -292,14 +304,14 @@ class ParameterTableWidget(QWidget):
             }
         """)
         plot_combo.currentIndexChanged.connect(lambda index, pname=param_name: self.on_plot_selection_changed(pname, index))
-        self.table.setCellWidget(row, 3, plot_combo)
+        self.table.setIndexWidget(self.model.index(row, self.plot_column), plot_combo)
         
         # 自动调整表格高度以显示所有行
         self.adjust_table_height()
     
     def adjust_table_height(self):
         """自动调整表格高度以显示所有行"""
-        if self.table.rowCount() > 0:
+        if self.model.rowCount() > 0:
             # 计算所有行的总高度
             total_height = 0
             
@@ -307,7 +319,7 @@ class ParameterTableWidget(QWidget):
             total_height += self.table.horizontalHeader().height()
             
             # 添加所有行的高度
-            for i in range(self.table.rowCount()):
+            for i in range(self.model.rowCount()):
                 total_height += self.table.rowHeight(i)
             
             # 添加一些边距
@@ -315,61 +327,82 @@ class ParameterTableWidget(QWidget):
             
             # 设置表格的固定高度
             self.table.setFixedHeight(total_height)
+    
+    def visible_rows(self):
+        """表格在滚动区域中实际可见的行范围(first, last)，完全不可见时返回None
+
+        表格完全展开、由外层滚动区域滚动，可见部分由视口未被裁剪的区域决定。
+        """
+        if not self.table.isVisible():
+            return None
+        rect = self.table.viewport().visibleRegion().boundingRect()
+        if rect.isEmpty():
+            return None
+        last_row = self.model.rowCount() - 1
+        first = self.table.rowAt(rect.top())
+        last = self.table.rowAt(rect.bottom())
+        if first < 0:
+            return None
+        return first, (last if last >= 0 else last_row)
+    
+    def refresh(self, group_obj):
+        """从子结构体刷新可见行的数值，只重绘文本变化的单元格"""
+        rows = self.visible_rows()
+        if rows is not None:
+            self.model.refresh(group_obj, *rows)
+    
+    def refresh_stats(self, columns):
+        """刷新可见行的滚动统计列，columns按STATS_COLUMNS顺序排列"""
+        rows = self.visible_rows()
+        if rows is not None:
+            self.model.refresh_stats(columns, *rows)
         
     def update_parameter(self, param_name, value):
         """更新参数值"""
         if param_name in self.parameters:
-            row = self.parameters[param_name]['row']
-            item = self.table.item(row, 1)
-            if item:
-                # 对于只读参数（如sta_uptime），暂时阻止信号发射以避免触发警告
-                if not (item.flags() & Qt.ItemIsEditable):
-                    self.table.blockSignals(True)
-                    item.setText(str(value))
-                    self.table.blockSignals(False)
-                else:
-                    item.setText(str(value))
+            self.model.set_value(self.parameters[param_name]['row'], value)
     
     def get_parameter_value(self, param_name):
         """获取参数值"""
         if param_name in self.parameters:
-            row = self.parameters[param_name]['row']
-            item = self.table.item(row, 1)
-            if item:
-                param_type = self.parameters[param_name]['param_type']
-                try:
-                    if param_type == "int":
-                        return int(item.text())
-                    elif param_type == "float":
-                        return float(item.text())
-                    elif param_type == "bool":
-                        return bool(int(item.text()))
-                    else:
-                        return item.text()
-                except ValueError:
-                    return 0
+            return self.model.value(self.parameters[param_name]['row'])
         return None
     
-    def on_item_changed(self, item):
-        """表格项改变时的处理"""
-        if item.column() == 1:  # 只处理值列的改变
-            param_name = item.data(Qt.UserRole)
-            if param_name and param_name in self.parameters:
-                param_type = self.parameters[param_name]['param_type']
-                try:
-                    if param_type == "int":
-                        value = int(item.text())
-                    elif param_type == "float":
-                        value = float(item.text())
-                    elif param_type == "bool":
-                        value = bool(int(item.text()))
-                    else:
-                        value = item.text()
-                    
-                    self.parameterChanged.emit(self.group_name, param_name, value)
-                except ValueError:
-                    # 如果转换失败，恢复原值
-                    item.setText("0")
+    def parse_pasted(self, text):
+        """解析粘贴的文本，返回[(参数名, 数值文本), ...]
+
+        每行为"参数名 数值"（按参数名写入）或单独的数值（从当前选中行起依次写入后续可编辑的行）。
+        """
+        names = self.model.param_names()
+        row = max(self.table.currentIndex().row(), 0)
+        values = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            match = PASTE_LINE_PATTERN.match(line)
+            if match and match.group(1) in self.parameters:
+                values.append((match.group(1), match.group(2)))
+                continue
+            while row < len(names) and not self.model.flags(self.model.index(row, 1)) & Qt.ItemIsEditable:
+                row += 1
+            if row >= len(names):
+                break
+            values.append((names[row], line))
+            row += 1
+        return values
+    
+    def paste_values(self):
+        """粘贴剪贴板中的一组数值，整组作为一次修改发出"""
+        if not self.editable:
+            return
+        values = self.parse_pasted(QApplication.clipboard().text())
+        if values:
+            self.parametersPasted.emit([(self.group_name, name, value) for name, value in values])
+    
+    def on_value_edited(self, param_name, value):
+        """用户编辑了数值（格式无效的输入已被模型拒绝）"""
+        self.parameterChanged.emit(self.group_name, param_name, value)
     
     def on_plot_selection_changed(self, param_name, plot_index):
         """Plot选择变化回调"""
@@ -380,11 +413,13 @@ class CmdDataDisplayWidget(QWidget):
     """CMD控制参数显示组件"""
     parameterChanged = pyqtSignal(str, str, object)  # 组名, 参数名, 新值
     plotSelectionChanged = pyqtSignal(str, str, int)  # 组名, 参数名, 图表索引
+    parametersPasted = pyqtSignal(list)  # [(组名, 参数名, 新值), ...]
     
     def __init__(self, robot_data=None):
         super().__init__()
         self.robot_data = robot_data
         self.parameter_groups = {}
+        self._refresh_scheduled = False
         self.init_ui()
         self.setup_parameters()
         
@@ -419,6 +454,8 @@ class CmdDataDisplayWidget(QWidget):
         self.scroll_layout.setContentsMargins(5, 5, 5, 5)
         
         scroll_area.setWidget(self.scroll_widget)
+        # 表格只刷新可见的行，滚动后立即补刷新新露出的行
+        scroll_area.verticalScrollBar().valueChanged.connect(self.schedule_refresh)
         layout.addWidget(scroll_area, 1)  # 设置拉伸因子为1，使滚动区域铺满剩余空间
         
     def setup_parameters(self):
@@ -441,6 +478,7 @@ class CmdDataDisplayWidget(QWidget):
         floating_group.add_parameter("cmd_target_pitch", "Target Pitch", 0.0, "rad", "float")
         floating_group.parameterChanged.connect(self.parameterChanged.emit)
         floating_group.plotSelectionChanged.connect(self.plotSelectionChanged.emit)
+        floating_group.parametersPasted.connect(self.parametersPasted.emit)
         self.parameter_groups["cmd_floating_mode"] = floating_group
         self.scroll_layout.addWidget(floating_group)
         
@@ -453,6 +491,7 @@ class CmdDataDisplayWidget(QWidget):
         wheel_group.add_parameter("cmd_target_heading", "Target Heading", 0.0, "rad", "float")
         wheel_group.parameterChanged.connect(self.parameterChanged.emit)
         wheel_group.plotSelectionChanged.connect(self.plotSelectionChanged.emit)
+        wheel_group.parametersPasted.connect(self.parametersPasted.emit)
         self.parameter_groups["cmd_wheel_mode"] = wheel_group
         self.scroll_layout.addWidget(wheel_group)
         
@@ -462,6 +501,7 @@ class CmdDataDisplayWidget(QWidget):
         electromagnet_group.add_parameter("cmd_electromagnet_voltage", "Electromagnet Voltage", 0, "%", "int")
         electromagnet_group.parameterChanged.connect(self.parameterChanged.emit)
         electromagnet_group.plotSelectionChanged.connect(self.plotSelectionChanged.emit)
+        electromagnet_group.parametersPasted.connect(self.parametersPasted.emit)
         self.parameter_groups["cmd_electromagnet"] = electromagnet_group
         self.scroll_layout.addWidget(electromagnet_group)
         
@@ -473,6 +513,7 @@ class CmdDataDisplayWidget(QWidget):
         brush_group.add_parameter("cmd_water_flow", "Water Flow Rate", 0, "%", "int")
         brush_group.parameterChanged.connect(self.parameterChanged.emit)
         brush_group.plotSelectionChanged.connect(self.plotSelectionChanged.emit)
+        brush_group.parametersPasted.connect(self.parametersPasted.emit)
         self.parameter_groups["cmd_brush"] = brush_group
         self.scroll_layout.addWidget(brush_group)
         
@@ -488,75 +529,39 @@ class CmdDataDisplayWidget(QWidget):
         camera_group.add_parameter("cmd_camera_snapshot[1]", "Rear Camera Snapshot", 0, "", "int")
         camera_group.parameterChanged.connect(self.parameterChanged.emit)
         camera_group.plotSelectionChanged.connect(self.plotSelectionChanged.emit)
+        camera_group.parametersPasted.connect(self.parametersPasted.emit)
         self.parameter_groups["cmd_camera"] = camera_group
         self.scroll_layout.addWidget(camera_group)
         
         self.scroll_layout.addStretch()
         
+    def schedule_refresh(self, *args):
+        """在下一次事件循环中刷新（等布局和可见区域更新之后），连续的滚动/缩放只刷新一次"""
+        if not self._refresh_scheduled:
+            self._refresh_scheduled = True
+            QTimer.singleShot(0, self._scheduled_refresh)
+    
+    def _scheduled_refresh(self):
+        self._refresh_scheduled = False
+        self.update_display()
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.schedule_refresh()
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_refresh()
+    
     def update_display(self):
-        """更新显示数据"""
+        """更新显示数据：参数组名即LowlevelCmd的子结构体属性名，各组只刷新可见且变化的单元格"""
         if not self.robot_data:
             return
             
         try:
             cmd_data = self.robot_data.get_cmd_data()
-            
-            # 更新浮游模式控制
-            floating_cmd = cmd_data.cmd_floating_mode
-            floating_group = self.parameter_groups["cmd_floating_mode"]
-            floating_group.update_parameter("cmd_floating_vel_x", floating_cmd.cmd_floating_vel_x)
-            floating_group.update_parameter("cmd_floating_vel_y", floating_cmd.cmd_floating_vel_y)
-            floating_group.update_parameter("cmd_floating_vel_z", floating_cmd.cmd_floating_vel_z)
-            floating_group.update_parameter("cmd_floating_angular_roll", floating_cmd.cmd_floating_angular_roll)
-            floating_group.update_parameter("cmd_floating_angular_yaw", floating_cmd.cmd_floating_angular_yaw)
-            floating_group.update_parameter("cmd_floating_angular_pitch", floating_cmd.cmd_floating_angular_pitch)
-            # 深度控制
-            floating_group.update_parameter("cmd_depth_hold", floating_cmd.cmd_depth_hold)
-            floating_group.update_parameter("cmd_target_depth", floating_cmd.cmd_target_depth)
-            # 定航控制
-            floating_group.update_parameter("cmd_floating_heading_hold", floating_cmd.cmd_floating_heading_hold)
-            floating_group.update_parameter("cmd_target_roll", floating_cmd.cmd_target_roll)
-            floating_group.update_parameter("cmd_target_yaw", floating_cmd.cmd_target_yaw)
-            floating_group.update_parameter("cmd_target_pitch", floating_cmd.cmd_target_pitch)
-            
-            # 更新轮式模式控制
-            wheel_cmd = cmd_data.cmd_wheel_mode
-            wheel_group = self.parameter_groups["cmd_wheel_mode"]
-            wheel_group.update_parameter("cmd_wheel_linear_vel", wheel_cmd.cmd_wheel_linear_vel)
-            wheel_group.update_parameter("cmd_wheel_angular_vel", wheel_cmd.cmd_wheel_angular_vel)
-            # 轮式定航控制
-            wheel_group.update_parameter("cmd_wheel_heading_hold", wheel_cmd.cmd_wheel_heading_hold)
-            wheel_group.update_parameter("cmd_target_heading", wheel_cmd.cmd_target_heading)
-            
-            # 更新电磁铁控制
-            electromagnet_cmd = cmd_data.cmd_electromagnet
-            electromagnet_group = self.parameter_groups["cmd_electromagnet"]
-            electromagnet_group.update_parameter("cmd_electromagnet_enable", electromagnet_cmd.cmd_electromagnet_enable)
-            electromagnet_group.update_parameter("cmd_electromagnet_voltage", electromagnet_cmd.cmd_electromagnet_voltage)
-            
-            # 更新清洗功能控制
-            brush_cmd = cmd_data.cmd_brush
-            brush_group = self.parameter_groups["cmd_brush"]
-            brush_group.update_parameter("cmd_brush_enable", brush_cmd.cmd_brush_enable)
-            brush_group.update_parameter("cmd_brush_power", brush_cmd.cmd_brush_power)
-            brush_group.update_parameter("cmd_water_enable", brush_cmd.cmd_water_enable)
-            brush_group.update_parameter("cmd_water_flow", brush_cmd.cmd_water_flow)
-            
-            # 更新相机控制
-            camera_cmd = cmd_data.cmd_camera
-            camera_group = self.parameter_groups["cmd_camera"]
-            if len(camera_cmd.cmd_camera_enable) >= 2:
-                camera_group.update_parameter("cmd_camera_enable[0]", camera_cmd.cmd_camera_enable[0])
-                camera_group.update_parameter("cmd_camera_enable[1]", camera_cmd.cmd_camera_enable[1])
-            if len(camera_cmd.cmd_camera_zoom) >= 2:
-                camera_group.update_parameter("cmd_camera_zoom[0]", camera_cmd.cmd_camera_zoom[0])
-                camera_group.update_parameter("cmd_camera_zoom[1]", camera_cmd.cmd_camera_zoom[1])
-            if len(camera_cmd.cmd_camera_record) >= 2:
-                camera_group.update_parameter("cmd_camera_record[0]", camera_cmd.cmd_camera_record[0])
-                camera_group.update_parameter("cmd_camera_record[1]", camera_cmd.cmd_camera_record[1])
-            if len(camera_cmd.cmd_camera_snapshot) >= 2:
-                camera_group.update_parameter("cmd_camera_snapshot[0]", camera_cmd.cmd_camera_snapshot[0])
-                camera_group.update_parameter("cmd_camera_snapshot[1]", camera_cmd.cmd_camera_snapshot[1])
+            for group_name, group in self.parameter_groups.items():
+                group.refresh(getattr(cmd_data, group_name))
                 
         except Exception as e:
             print(f"更新CMD数据失败: {e}")
@@ -565,13 +570,18 @@ class CmdDataDisplayWidget(QWidget):
 class StateDataDisplayWidget(QWidget):
     """STATE状态参数显示组件"""
     parameterChanged = pyqtSignal(str, str, object)  # 组名, 参数名, 新值
+    parametersPasted = pyqtSignal(list)  # [(组名, 参数名, 新值), ...]
     
     def __init__(self, robot_data=None):
         super().__init__()
         self.robot_data = robot_data
         self.parameter_groups = {}
+        self.stats_groups = []  # 含滚动统计列的参数组
+        self._refresh_scheduled = False
+        self._stats_updated_at = 0.0
         self.init_ui()
         self.setup_parameters()
+        self.setup_stats_rows()
         
     def init_ui(self):
         """初始化UI"""
@@ -604,13 +614,15 @@ class StateDataDisplayWidget(QWidget):
         self.scroll_layout.setContentsMargins(5, 5, 5, 5)
         
         scroll_area.setWidget(self.scroll_widget)
+        # 表格只刷新可见的行，滚动后立即补刷新新露出的行
+        scroll_area.verticalScrollBar().valueChanged.connect(self.schedule_refresh)
         layout.addWidget(scroll_area)
         
     def setup_parameters(self):
         """设置参数组 - 分模块显示状态参数"""
         
         # 机器人状态参数组
-        robot_group = ParameterTableWidget("robot_status", "🤖 机器人状态", True)
+        robot_group = ParameterTableWidget("robot_status", "🤖 机器人状态", True, show_stats=True)
         robot_group.add_parameter("sta_position_x", "Position X", 0.0, "m", "float")
         robot_group.add_parameter("sta_position_y", "Position Y", 0.0, "m", "float")
         robot_group.add_parameter("sta_position_z", "Position Z (Depth)", 0.0, "m", "float")
@@ -628,7 +640,7 @@ class StateDataDisplayWidget(QWidget):
         self.scroll_layout.addWidget(separator1)
         
         # 浮游模式状态参数组
-        floating_group = ParameterTableWidget("floating_status", "🏊 浮游模式状态", True)
+        floating_group = ParameterTableWidget("floating_status", "🏊 浮游模式状态", True, show_stats=True)
         floating_group.add_parameter("sta_floating_vel_x", "Linear Velocity X", 0.0, "m/s", "float")
         floating_group.add_parameter("sta_floating_vel_y", "Linear Velocity Y", 0.0, "m/s", "float")
         floating_group.add_parameter("sta_floating_vel_z", "Linear Velocity Z", 0.0, "m/s", "float")
@@ -650,7 +662,7 @@ class StateDataDisplayWidget(QWidget):
         self.scroll_layout.addWidget(separator2)
         
         # 轮式模式状态参数组
-        wheel_group = ParameterTableWidget("wheel_status", "🚗 轮式模式状态", True)
+        wheel_group = ParameterTableWidget("wheel_status", "🚗 轮式模式状态", True, show_stats=True)
         wheel_group.add_parameter("sta_wheel_linear_vel", "Linear Velocity", 0.0, "m/s", "float")
         wheel_group.add_parameter("sta_wheel_angular_vel", "Angular Velocity", 0.0, "rad/s", "float")
         # 电机数据和温度（数组参数）
@@ -670,7 +682,7 @@ class StateDataDisplayWidget(QWidget):
         self.scroll_layout.addWidget(separator3)
         
         # 电磁铁状态参数组
-        electromagnet_group = ParameterTableWidget("electromagnet_status", "🧲 电磁铁状态", True)
+        electromagnet_group = ParameterTableWidget("electromagnet_status", "🧲 电磁铁状态", True, show_stats=True)
         electromagnet_group.add_parameter("sta_electromagnet_enable", "Electromagnet Status", 0, "", "int")
         electromagnet_group.add_parameter("sta_electromagnet_voltage", "Electromagnet Voltage", 0, "%", "int")
         self.parameter_groups["electromagnet_status"] = electromagnet_group
@@ -684,7 +696,7 @@ class StateDataDisplayWidget(QWidget):
         self.scroll_layout.addWidget(separator4)
         
         # 清洗功能状态参数组
-        brush_group = ParameterTableWidget("brush_status", "🧽 清洗功能状态", True)
+        brush_group = ParameterTableWidget("brush_status", "🧽 清洗功能状态", True, show_stats=True)
         brush_group.add_parameter("sta_brush_enable", "Brush Status", 0, "", "int")
         brush_group.add_parameter("sta_brush_power", "Brush Power", 0, "%", "int")
         brush_group.add_parameter("sta_water_enable", "Water Flow Status", 0, "", "int")
@@ -700,7 +712,7 @@ class StateDataDisplayWidget(QWidget):
         self.scroll_layout.addWidget(separator5)
         
         # 系统状态参数组
-        system_group = ParameterTableWidget("system_status", "⚙️ 系统状态", True)
+        system_group = ParameterTableWidget("system_status", "⚙️ 系统状态", True, show_stats=True)
         system_group.add_parameter("sta_system_voltage", "System Voltage", 0.0, "V", "float")
         system_group.add_parameter("sta_system_current", "System Current", 0.0, "A", "float")
         system_group.add_parameter("sta_system_power", "System Power", 0.0, "W", "float")
@@ -719,80 +731,65 @@ class StateDataDisplayWidget(QWidget):
         electromagnet_group.parameterChanged.connect(self.parameterChanged.emit)
         brush_group.parameterChanged.connect(self.parameterChanged.emit)
         system_group.parameterChanged.connect(self.parameterChanged.emit)
+        for group in self.parameter_groups.values():
+            group.parametersPasted.connect(self.parametersPasted.emit)
         
         self.scroll_layout.addStretch()
-        
+    
+    def setup_stats_rows(self):
+        """预先计算每个参数在滚动统计中的列下标，刷新时不再拼接字段路径"""
+        stats = getattr(self.robot_data, "stats", None)
+        if stats is None:
+            return
+        for group_name, group in self.parameter_groups.items():
+            for param_name, info in group.parameters.items():
+                index = stats.index.get(f"{STATE_GROUP_ATTRS[group_name]}.{param_name}")
+                if index is not None:
+                    group.model.set_stats_index(info['row'], index)
+        self.stats_groups = [group for group in self.parameter_groups.values() if group.model.has_stats()]
+    
+    def update_stats(self):
+        """刷新滚动统计列；统计由接收端逐包增量更新，这里只读取结果，按STATS_REFRESH_INTERVAL限频"""
+        now = time.monotonic()
+        if now - self._stats_updated_at < ROBOT_DATA_CONFIG.STATS_REFRESH_INTERVAL / 1000.0:
+            return
+        summary = self.robot_data.stats.summary()
+        if summary is None:
+            return
+        self._stats_updated_at = now
+        columns = [summary[i] for _, i in STATS_COLUMNS]
+        for group in self.stats_groups:
+            group.refresh_stats(columns)
+        
+    def schedule_refresh(self, *args):
+        """在下一次事件循环中刷新（等布局和可见区域更新之后），连续的滚动/缩放只刷新一次"""
+        if not self._refresh_scheduled:
+            self._refresh_scheduled = True
+            QTimer.singleShot(0, self._scheduled_refresh)
+    
+    def _scheduled_refresh(self):
+        self._refresh_scheduled = False
+        self.update_display()
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.schedule_refresh()
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_refresh()
+    
     def update_display(self):
-        """更新显示数据"""
+        """更新显示数据：各组只刷新可见且文本变化的单元格"""
         if not self.robot_data:
             return
             
         try:
-            state_data = self.robot_data.get_state_data()
-            
-            # 更新机器人状态
-            robot_state = state_data.state_robot
-            robot_group = self.parameter_groups["robot_status"]
-            robot_group.update_parameter("sta_position_x", robot_state.sta_position_x)
-            robot_group.update_parameter("sta_position_y", robot_state.sta_position_y)
-            robot_group.update_parameter("sta_position_z", robot_state.sta_position_z)
-            robot_group.update_parameter("sta_roll", robot_state.sta_roll)
-            robot_group.update_parameter("sta_pitch", robot_state.sta_pitch)
-            robot_group.update_parameter("sta_yaw", robot_state.sta_yaw)
-            
-            # 更新浮游模式状态
-            floating_state = state_data.state_floating_mode
-            floating_group = self.parameter_groups["floating_status"]
-            floating_group.update_parameter("sta_floating_vel_x", floating_state.sta_floating_vel_x)
-            floating_group.update_parameter("sta_floating_vel_y", floating_state.sta_floating_vel_y)
-            floating_group.update_parameter("sta_floating_vel_z", floating_state.sta_floating_vel_z)
-            floating_group.update_parameter("sta_floating_angular_x", floating_state.sta_floating_angular_x)
-            floating_group.update_parameter("sta_floating_angular_y", floating_state.sta_floating_angular_y)
-            floating_group.update_parameter("sta_floating_angular_z", floating_state.sta_floating_angular_z)
-            
-            # 更新推进器数据
-            for i in range(min(4, len(floating_state.sta_thruster_power))):
-                floating_group.update_parameter(f"sta_thruster_power[{i}]", floating_state.sta_thruster_power[i])
-            for i in range(min(4, len(floating_state.sta_thruster_temp))):
-                floating_group.update_parameter(f"sta_thruster_temp[{i}]", floating_state.sta_thruster_temp[i])
-            
-            # 更新轮式模式状态
-            wheel_state = state_data.state_wheel_mode
-            wheel_group = self.parameter_groups["wheel_status"]
-            wheel_group.update_parameter("sta_wheel_linear_vel", wheel_state.sta_wheel_linear_vel)
-            wheel_group.update_parameter("sta_wheel_angular_vel", wheel_state.sta_wheel_angular_vel)
-            
-            # 更新电机数据
-            for i in range(min(3, len(wheel_state.sta_motor_data))):
-                wheel_group.update_parameter(f"sta_motor_data[{i}]", wheel_state.sta_motor_data[i])
-            for i in range(min(3, len(wheel_state.sta_motor_temp))):
-                wheel_group.update_parameter(f"sta_motor_temp[{i}]", wheel_state.sta_motor_temp[i])
-            
-            # 更新电磁铁状态
-            electromagnet_state = state_data.state_electromagnet
-            electromagnet_group = self.parameter_groups["electromagnet_status"]
-            electromagnet_group.update_parameter("sta_electromagnet_enable", electromagnet_state.sta_electromagnet_enable)
-            electromagnet_group.update_parameter("sta_electromagnet_voltage", electromagnet_state.sta_electromagnet_voltage)
-            
-            # 更新清洗功能状态
-            brush_state = state_data.state_brush
-            brush_group = self.parameter_groups["brush_status"]
-            brush_group.update_parameter("sta_brush_enable", brush_state.sta_brush_enable)
-            brush_group.update_parameter("sta_brush_power", brush_state.sta_brush_power)
-            brush_group.update_parameter("sta_water_enable", brush_state.sta_water_enable)
-            brush_group.update_parameter("sta_water_flow", brush_state.sta_water_flow)
-            
-            # 更新系统状态
-            system_state = state_data.state_system
-            system_group = self.parameter_groups["system_status"]
-            system_group.update_parameter("sta_system_voltage", system_state.sta_system_voltage)
-            system_group.update_parameter("sta_system_current", system_state.sta_system_current)
-            system_group.update_parameter("sta_system_power", system_state.sta_system_power)
-            system_group.update_parameter("sta_comm_status", system_state.sta_comm_status)
-            system_group.update_parameter("sta_send_time", system_state.sta_send_time)
-            system_group.update_parameter("sta_packet_loss", system_state.sta_packet_loss)
-            system_group.update_parameter("sta_leak_detected", system_state.sta_leak_detected)
-            system_group.update_parameter("sta_uptime", system_state.sta_uptime)
+            if self.stats_groups:
+                self.update_stats()
+            get_state_group = self.robot_data.get_state_group
+            for group_name, group in self.parameter_groups.items():
+                group.refresh(get_state_group(STATE_GROUP_ATTRS[group_name]))
                 
         except Exception as e:
             print(f"更新STATE数据失败: {e}")
\ No newline at end of file
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+参数表格数据模型
+每个参数组一个QAbstractTableModel：参数名、数值、单位、[滚动统计]、Plot选择。
+
+刷新时只对视图中可见的行读取数值并格式化，与缓存的文本比较，
+只对文本确实变化的连续行区间发出dataChanged；没有变化、不可见的行不产生任何绘制。
+数值读取器在添加参数时由参数名（如sta_thruster_power[2]）预先解析好，刷新时不再做字符串处理。
+"""
+import operator
+import re
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+
+# 数组参数名：字段名[下标]
+ARRAY_PARAM_PATTERN = re.compile(r"^(\w+)\[(\d+)\]$")
+BASE_HEADERS = ["参数名称", "数值", "单位"]
+VALUE_COLUMN = 1
+STATS_FIRST_COLUMN = 3
+
+
+def make_getter(param_name):
+    """由参数名生成从子结构体读取数值的函数，数组参数在这里解析一次下标"""
+    match = ARRAY_PARAM_PATTERN.match(param_name)
+    if not match:
+        return operator.attrgetter(param_name)
+    name, index = match.group(1), int(match.group(2))
+    get_array = operator.attrgetter(name)
+    return lambda obj: get_array(obj)[index]
+
+
+def parse_value(text, param_type):
+    """按参数类型解析编辑框中的文本，格式无效时抛出ValueError"""
+    if param_type == "int":
+        return int(text)
+    elif param_type == "float":
+        return float(text)
+    elif param_type == "bool":
+        return bool(int(text))
+    return text
+
+
+def changed_runs(rows):
+    """把升序的行号列表合并为连续区间[(起始行, 结束行), ...]"""
+    runs = []
+    for row in rows:
+        if runs and runs[-1][1] == row - 1:
+            runs[-1][1] = row
+        else:
+            runs.append([row, row])
+    return runs
+
+
+class ParameterTableModel(QAbstractTableModel):
+    """参数组的表格模型，行按添加顺序排列"""
+    valueEdited = pyqtSignal(str, object)  # 参数名, 用户输入的新值
+
+    def __init__(self, stats_headers=(), editable=False, parent=None):
+        super().__init__(parent)
+        self.headers = BASE_HEADERS + list(stats_headers) + ["Plot选择"]
+        self.plot_column = len(self.headers) - 1
+        self.stats_count = len(stats_headers)
+        self.editable = editable
+        self.header_tooltip = None  # 滚动统计列的表头提示
+        self._names = []  # 参数名
+        self._display_names = []
+        self._units = []
+        self._types = []
+        self._editable = []
+        self._getters = []
+        self._texts = []  # 当前显示的数值文本
+        self._stats_texts = []  # 当前显示的滚动统计文本，每行一个列表
+        self._stats_indices = []  # 每行在滚动统计中的列下标，不参与统计时为None
+
+    # ------------------------------------------------------------------
+    # 构造
+    # ------------------------------------------------------------------
+    def add_parameter(self, param_name, display_name, value, unit="", param_type="float", editable=None):
+        """追加一行，返回行号"""
+        row = len(self._names)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._names.append(param_name)
+        self._display_names.append(display_name)
+        self._units.append(unit)
+        self._types.append(param_type)
+        self._editable.append(self.editable if editable is None else editable)
+        self._getters.append(make_getter(param_name))
+        self._texts.append(str(value))
+        self._stats_texts.append(["-"] * self.stats_count)
+        self._stats_indices.append(None)
+        self.endInsertRows()
+        return row
+
+    def set_stats_index(self, row, index):
+        """设置该行在RollingStats.summary()数组中的下标"""
+        self._stats_indices[row] = index
+
+    def has_stats(self):
+        return any(index is not None for index in self._stats_indices)
+
+    # ------------------------------------------------------------------
+    # 刷新
+    # ------------------------------------------------------------------
+    def refresh(self, group_obj, first, last):
+        """从子结构体读取first~last行的数值，只对文本变化的行发出dataChanged"""
+        changed = []
+        texts = self._texts
+        getters = self._getters
+        for row in range(first, last + 1):
+            try:
+                text = str(getters[row](group_obj))
+            except (AttributeError, IndexError):
+                continue
+            if text != texts[row]:
+                texts[row] = text
+                changed.append(row)
+        for start, stop in changed_runs(changed):
+            self.dataChanged.emit(self.index(start, VALUE_COLUMN), self.index(stop, VALUE_COLUMN), [Qt.DisplayRole])
+
+    def set_value(self, row, value):
+        """直接设置一行的数值（不经过读取器）"""
+        text = str(value)
+        if text != self._texts[row]:
+            self._texts[row] = text
+            index = self.index(row, VALUE_COLUMN)
+            self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def refresh_stats(self, columns, first, last):
+        """更新first~last行的滚动统计列，columns按统计列顺序排列、每列按字段下标索引"""
+        changed = []
+        for row in range(first, last + 1):
+            index = self._stats_indices[row]
+            if index is None:
+                continue
+            texts = [f"{column[index]:.3f}" for column in columns]
+            if texts != self._stats_texts[row]:
+                self._stats_texts[row] = texts
+                changed.append(row)
+        last_column = STATS_FIRST_COLUMN + self.stats_count - 1
+        for start, stop in changed_runs(changed):
+            self.dataChanged.emit(self.index(start, STATS_FIRST_COLUMN), self.index(stop, last_column), [Qt.DisplayRole])
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+    def param_names(self):
+        return list(self._names)
+
+    def value(self, row):
+        """按参数类型解析当前显示的数值，无法解析时返回0"""
+        try:
+            return parse_value(self._texts[row], self._types[row])
+        except ValueError:
+            return 0
+
+    # ------------------------------------------------------------------
+    # QAbstractTableModel接口
+    # ------------------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._names)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation != Qt.Horizontal:
+            return None
+        if role == Qt.DisplayRole:
+            return self.headers[section]
+        if role == Qt.ToolTipRole and STATS_FIRST_COLUMN <= section < self.plot_column:
+            return self.header_tooltip
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        row, column = index.row(), index.column()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if column == VALUE_COLUMN:
+                return self._texts[row]
+            if column == 0:
+                return self._display_names[row]
+            if column == 2:
+                return self._units[row]
+            if column < self.plot_column:
+                return self._stats_texts[row][column - STATS_FIRST_COLUMN]
+            return None
+        if role == Qt.TextAlignmentRole and STATS_FIRST_COLUMN <= column < self.plot_column:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        if role == Qt.UserRole:
+            return self._names[row]
+        return None
+
+    def flags(self, index):
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == VALUE_COLUMN and self._editable[index.row()]:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        """用户编辑数值：解析成功才接受并发出valueEdited，格式无效时保留原值"""
+        if role != Qt.EditRole or index.column() != VALUE_COLUMN:
+            return False
+        row = index.row()
+        try:
+            parsed = parse_value(str(value), self._types[row])
+        except ValueError:
+            return False
+        self.set_value(row, parsed)
+        self.valueEdited.emit(self._names[row], parsed)
+        return True
@@ -10,13 +10,18 @@ from PyQt5.QtWidgets import (
     QGroupBox, QPushButton, QScrollArea, QSpinBox, QDoubleSpinBox,
     QCheckBox, QFrame
 )
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
 import logging
+import time
 
 # 导入子模块
 from .plot_display import PlotDisplayWidget
-from .data_display import CmdDataDisplayWidget, StateDataDisplayWidget
+from .data_display import CmdDataDisplayWidget, StateDataDisplayWidget, STATE_GROUP_ATTRS
+from .parameter_model import make_getter
+from field_setters import CMD_SETTERS, STATE_SETTERS, apply_values
+
+SUBSCRIBED_GROUPS = tuple(STATE_GROUP_ATTRS.values()) + ("cmd",)
 
 class ParametersViewWidget(QWidget):
     """参数界面主组件 - 3模块横向布局"""
@@ -24,12 +29,22 @@ class ParametersViewWidget(QWidget):
     def __init__(self, robot_data):
         super().__init__()
         self.robot_data = robot_data
+        self._data_changed_pending = False
         self.init_ui()
         
-        # 设置定时器更新数据
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_display)
-        self.update_timer.start(self.robot_data.app_dt)  # 使用统一的app_dt参数，50Hz更新一次
+        # 状态或控制命令变化时刷新（同一帧内的多次变化只刷新一次），不再定时轮询
+        self.robot_data.subscribe(self.on_data_changed, SUBSCRIBED_GROUPS)
+    
+    def on_data_changed(self, seq, mask):
+        """数据变化事件：仅在参数界面可见时刷新，隐藏期间的变化在重新显示时补刷新"""
+        self._data_changed_pending = True
+        if self.isVisible():
+            self.update_display()
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._data_changed_pending:
+            self.update_display()
     
     def init_ui(self):
         """初始化用户界面 - 3模块横向布局"""
@@ -43,11 +58,13 @@ class ParametersViewWidget(QWidget):
         # 左一模块：CMD控制参数 (30%)
         self.cmd_display = CmdDataDisplayWidget(self.robot_data)
         self.cmd_display.parameterChanged.connect(self.on_parameter_changed)
+        self.cmd_display.parametersPasted.connect(self.apply_cmd_values)
         self.cmd_display.plotSelectionChanged.connect(self.on_plot_selection_changed)
         
         # 左二模块：STATE状态参数 (30%)
         self.state_display = StateDataDisplayWidget(self.robot_data)
         self.state_display.parameterChanged.connect(self.on_state_parameter_changed)
+        self.state_display.parametersPasted.connect(self.apply_state_values)
         # 连接plot选择信号
         for group_name, group_widget in self.state_display.parameter_groups.items():
             group_widget.plotSelectionChanged.connect(self.on_plot_selection_changed)
@@ -64,6 +81,7 @@ class ParametersViewWidget(QWidget):
         main_splitter.setSizes([600, 600, 800])
         
         layout.addWidget(main_splitter)
+        self.compile_plot_feeds()
         
         # 设置整体样式
         self.setStyleSheet("""
@@ -95,212 +113,58 @@ class ParametersViewWidget(QWidget):
         return container
     
     def on_parameter_changed(self, group_name, param_name, value):
-        """处理参数变更"""
-        try:
-            if self.robot_data:
-                # 获取CMD数据对象
-                cmd_data = self.robot_data.get_cmd_data()
-                
-                # 根据组名和参数名更新对应的数据
-                if group_name == "cmd_floating_mode":
-                    floating_cmd = cmd_data.cmd_floating_mode
-                    if param_name == "cmd_floating_vel_x":
-                        floating_cmd.cmd_floating_vel_x = float(value)
-                    elif param_name == "cmd_floating_vel_y":
-                        floating_cmd.cmd_floating_vel_y = float(value)
-                    elif param_name == "cmd_floating_vel_z":
-                        floating_cmd.cmd_floating_vel_z = float(value)
-                    elif param_name == "cmd_floating_angular_roll":
-                        floating_cmd.cmd_floating_angular_roll = float(value)
-                    elif param_name == "cmd_floating_angular_yaw":
-                        floating_cmd.cmd_floating_angular_yaw = float(value)
-                    elif param_name == "cmd_floating_angular_pitch":
-                        floating_cmd.cmd_floating_angular_pitch = float(value)
-                    elif param_name == "cmd_depth_hold":
-                        floating_cmd.cmd_depth_hold = int(value)
-                    elif param_name == "cmd_target_depth":
-                        floating_cmd.cmd_target_depth = float(value)
-                    elif param_name == "cmd_floating_heading_hold":
-                        floating_cmd.cmd_floating_heading_hold = int(value)
-                    elif param_name == "cmd_target_roll":
-                        floating_cmd.cmd_target_roll = float(value)
-                    elif param_name == "cmd_target_yaw":
-                        floating_cmd.cmd_target_yaw = float(value)
-                    elif param_name == "cmd_target_pitch":
-                        floating_cmd.cmd_target_pitch = float(value)
-                        
-                elif group_name == "cmd_wheel_mode":
-                    wheel_cmd = cmd_data.cmd_wheel_mode
-                    if param_name == "cmd_wheel_linear_vel":
-                        wheel_cmd.cmd_wheel_linear_vel = float(value)
-                    elif param_name == "cmd_wheel_angular_vel":
-                        wheel_cmd.cmd_wheel_angular_vel = float(value)
-                    elif param_name == "cmd_wheel_heading_hold":
-                        wheel_cmd.cmd_wheel_heading_hold = int(value)
-                    elif param_name == "cmd_target_heading":
-                        wheel_cmd.cmd_target_heading = float(value)
-                        
-                elif group_name == "cmd_electromagnet":
-                    electromagnet_cmd = cmd_data.cmd_electromagnet
-                    if param_name == "cmd_electromagnet_enable":
-                        electromagnet_cmd.cmd_electromagnet_enable = int(value)
-                    elif param_name == "cmd_electromagnet_voltage":
-                        electromagnet_cmd.cmd_electromagnet_voltage = int(value)
-                        
-                elif group_name == "cmd_brush":
-                    brush_cmd = cmd_data.cmd_brush
-                    if param_name == "cmd_brush_enable":
-                        brush_cmd.cmd_brush_enable = int(value)
-                    elif param_name == "cmd_brush_power":
-                        brush_cmd.cmd_brush_power = int(value)
-                    elif param_name == "cmd_water_enable":
-                        brush_cmd.cmd_water_enable = int(value)
-                    elif param_name == "cmd_water_flow":
-                        brush_cmd.cmd_water_flow = int(value)
-                        
-                elif group_name == "cmd_camera":
-                    camera_cmd = cmd_data.cmd_camera
-                    if param_name == "cmd_camera_enable[0]":
-                        if len(camera_cmd.cmd_camera_enable) > 0:
-                            camera_cmd.cmd_camera_enable[0] = int(value)
-                    elif param_name == "cmd_camera_enable[1]":
-                        if len(camera_cmd.cmd_camera_enable) > 1:
-                            camera_cmd.cmd_camera_enable[1] = int(value)
-                    elif param_name == "cmd_camera_zoom[0]":
-                        if len(camera_cmd.cmd_camera_zoom) > 0:
-                            camera_cmd.cmd_camera_zoom[0] = int(value)
-                    elif param_name == "cmd_camera_zoom[1]":
-                        if len(camera_cmd.cmd_camera_zoom) > 1:
-                            camera_cmd.cmd_camera_zoom[1] = int(value)
-                    elif param_name == "cmd_camera_record[0]":
-                        if len(camera_cmd.cmd_camera_record) > 0:
-                            camera_cmd.cmd_camera_record[0] = int(value)
-                    elif param_name == "cmd_camera_record[1]":
-                        if len(camera_cmd.cmd_camera_record) > 1:
-                            camera_cmd.cmd_camera_record[1] = int(value)
-                    elif param_name == "cmd_camera_snapshot[0]":
-                        if len(camera_cmd.cmd_camera_snapshot) > 0:
-                            camera_cmd.cmd_camera_snapshot[0] = int(value)
-                    elif param_name == "cmd_camera_snapshot[1]":
-                        if len(camera_cmd.cmd_camera_snapshot) > 1:
-                            camera_cmd.cmd_camera_snapshot[1] = int(value)
-                
-                print(f"参数已更新: {group_name}.{param_name} = {value}")
-                # 记录控制参数变更到日志
-                logging.info(f"控制参数变更: {group_name}.{param_name} = {value}")
-                
-        except Exception as e:
-            print(f"更新参数失败: {group_name}.{param_name} = {value}, 错误: {e}")
-            # 记录参数更新失败到日志
-            logging.error(f"控制参数更新失败: {group_name}.{param_name} = {value}, 错误: {e}")
+        """处理参数变更：单个数值即只含一项的事务"""
+        self.apply_cmd_values([(group_name, param_name, value)])
+    
+    def apply_cmd_values(self, values):
+        """把[(组名, 参数名, 数值), ...]作为一个事务写入控制命令（预设、粘贴的一组数值）
+
+        参数组名即LowlevelCmd的子结构体属性名；全部数值先校验，任何一个无效则整批不写入。
+        每个子结构体版本号只递增一次，下一帧发送时只重新编码、发送一次。
+        """
+        if not self.robot_data:
+            return
+        paths = [(f"{group_name}.{param_name}", value) for group_name, param_name, value in values]
+        if self._apply_values(self.robot_data.get_cmd_data(), CMD_SETTERS, paths, "控制参数") is None:
+            # 被拒绝的输入仍显示在表格中，恢复为命令中的实际值
+            self.cmd_display.update_display()
     
     def on_state_parameter_changed(self, group_name, param_name, value):
         """处理状态参数变更"""
+        self.apply_state_values([(group_name, param_name, value)])
+    
+    def apply_state_values(self, values):
+        """把[(组名, 参数名, 数值), ...]作为一个事务写入状态覆盖值，并通知订阅者发生变化的分组
+
+        覆盖值记在robot_data.state_overrides中，不修改LCM快照，之后收到的数据包不会冲掉手动修改。
+        """
+        if not self.robot_data:
+            return
+        paths = [(f"{STATE_GROUP_ATTRS.get(group_name, group_name)}.{param_name}", value)
+                 for group_name, param_name, value in values]
+        changed_groups = self._apply_values(self.robot_data.state_overrides, STATE_SETTERS, paths, "状态参数")
+        if changed_groups:
+            # 手动修改的状态同样通知其他订阅者
+            self.robot_data.mark_changed(*changed_groups)
+        elif changed_groups is None:
+            self.state_display.update_display()
+    
+    def _apply_values(self, root, setters, paths, kind):
+        """按分发表写入一批数值，返回发生变化的子结构体属性名列表，整批被拒绝时返回None"""
         try:
-            if not self.robot_data:
-                return
-                
-            state_data = self.robot_data.get_state_data()
-            if not state_data:
-                return
-                
-            # 根据组名和参数名更新对应的状态数据
-            if group_name == "robot_status":
-                robot_state = state_data.state_robot
-                if param_name == "sta_position_x":
-                    robot_state.sta_position_x = float(value)
-                elif param_name == "sta_position_y":
-                    robot_state.sta_position_y = float(value)
-                elif param_name == "sta_position_z":
-                    robot_state.sta_position_z = float(value)
-                elif param_name == "sta_roll":
-                    robot_state.sta_roll = float(value)
-                elif param_name == "sta_pitch":
-                    robot_state.sta_pitch = float(value)
-                elif param_name == "sta_yaw":
-                    robot_state.sta_yaw = float(value)
-                    
-            elif group_name == "floating_status":
-                floating_state = state_data.state_floating_mode
-                if param_name == "sta_floating_vel_x":
-                    floating_state.sta_floating_vel_x = float(value)
-                elif param_name == "sta_floating_vel_y":
-                    floating_state.sta_floating_vel_y = float(value)
-                elif param_name == "sta_floating_vel_z":
-                    floating_state.sta_floating_vel_z = float(value)
-                elif param_name == "sta_floating_angular_x":
-                    floating_state.sta_floating_angular_x = float(value)
-                elif param_name == "sta_floating_angular_y":
-                    floating_state.sta_floating_angular_y = float(value)
-                elif param_name == "sta_floating_angular_z":
-                    floating_state.sta_floating_angular_z = float(value)
-                elif param_name.startswith("sta_thruster_power["):
-                    index = int(param_name.split('[')[1].split(']')[0])
-                    if 0 <= index < len(floating_state.sta_thruster_power):
-                        floating_state.sta_thruster_power[index] = float(value)
-                elif param_name.startswith("sta_thruster_temp["):
-                    index = int(param_name.split('[')[1].split(']')[0])
-                    if 0 <= index < len(floating_state.sta_thruster_temp):
-                        floating_state.sta_thruster_temp[index] = float(value)
-                        
-            elif group_name == "wheel_status":
-                wheel_state = state_data.state_wheel_mode
-                if param_name == "sta_wheel_linear_vel":
-                    wheel_state.sta_wheel_linear_vel = float(value)
-                elif param_name == "sta_wheel_angular_vel":
-                    wheel_state.sta_wheel_angular_vel = float(value)
-                elif param_name.startswith("sta_motor_data["):
-                    index = int(param_name.split('[')[1].split(']')[0])
-                    if 0 <= index < len(wheel_state.sta_motor_data):
-                        wheel_state.sta_motor_data[index] = float(value)
-                elif param_name.startswith("sta_motor_temp["):
-                    index = int(param_name.split('[')[1].split(']')[0])
-                    if 0 <= index < len(wheel_state.sta_motor_temp):
-                        wheel_state.sta_motor_temp[index] = float(value)
-                        
-            elif group_name == "electromagnet_status":
-                electromagnet_state = state_data.state_electromagnet
-                if param_name == "sta_electromagnet_enable":
-                    electromagnet_state.sta_electromagnet_enable = int(value)
-                elif param_name == "sta_electromagnet_voltage":
-                    electromagnet_state.sta_electromagnet_voltage = int(value)
-                    
-            elif group_name == "brush_status":
-                brush_state = state_data.state_brush
-                if param_name == "sta_brush_enable":
-                    brush_state.sta_brush_enable = int(value)
-                elif param_name == "sta_brush_power":
-                    brush_state.sta_brush_power = int(value)
-                elif param_name == "sta_water_enable":
-                    brush_state.sta_water_enable = int(value)
-                elif param_name == "sta_water_flow":
-                    brush_state.sta_water_flow = int(value)
-                    
-            elif group_name == "system_status":
-                system_state = state_data.state_system
-                if param_name == "sta_system_voltage":
-                    system_state.sta_system_voltage = float(value)
-                elif param_name == "sta_system_current":
-                    system_state.sta_system_current = float(value)
-                elif param_name == "sta_system_power":
-                    system_state.sta_system_power = float(value)
-                elif param_name == "sta_comm_status":
-                    system_state.sta_comm_status = int(value)
-                elif param_name == "sta_send_time":
-                    system_state.sta_send_time = int(value)
-                elif param_name == "sta_packet_loss":
-                    system_state.sta_packet_loss = int(value)
-                elif param_name == "sta_leak_detected":
-                    system_state.sta_leak_detected = int(value)
-                elif param_name == "sta_uptime":
-                    # uptime是只读参数，由系统自动更新，不允许手动修改
-                    print(f"警告: sta_uptime是只读参数，忽略手动修改请求: {value}")
-                    return
-            
-            # print(f"状态参数已更新: {group_name}.{param_name} = {value}")
-            
-        except Exception as e:
-            print(f"更新状态参数失败: {group_name}.{param_name} = {value}, 错误: {e}")
+            applied, changed_groups = apply_values(root, setters, paths)
+        except KeyError as e:
+            # 字符串、只读（如sta_uptime，由系统自动更新）或未知字段
+            logging.warning(f"{kind}不可修改，忽略: {e.args[0]}")
+            return None
+        except ValueError as e:
+            logging.warning(f"{kind}数值无效，忽略本次修改: {e}")
+            return None
+        for path, written, clamped in applied:
+            if clamped:
+                logging.warning(f"{kind}超出范围，已限幅: {path} = {written}")
+        logging.debug(f"{kind}变更: " + ", ".join(f"{path} = {written}" for path, written, _ in applied))
+        return changed_groups
     
     def on_plot_selection_changed(self, group_name, param_name, plot_index):
         """处理plot选择变化"""
@@ -313,10 +177,13 @@ class ParametersViewWidget(QWidget):
             # 设置参数显示在指定图表
             plot_idx = plot_index - 1  # 转换为0-3的索引
             full_param_name = f"{group_name}.{param_name}"
-            self.plot_display.plot_widget.set_plot_parameter(plot_idx, full_param_name)
+            # 遥测历史中的字段路径，状态分组名需换成LowlevelState的子结构体属性名
+            field_path = f"{STATE_GROUP_ATTRS.get(group_name, group_name)}.{param_name}"
+            self.plot_display.plot_widget.set_plot_parameter(plot_idx, full_param_name, field_path)
     
     def update_display(self):
         """更新显示数据"""
+        self._data_changed_pending = False
         try:
             # 更新CMD控制参数显示
             self.cmd_display.update_display()
@@ -324,88 +191,55 @@ class ParametersViewWidget(QWidget):
             # 更新STATE状态参数显示
             self.state_display.update_display()
             
-            # 更新plot数据
+            # 更新plot数据（唯一的绘图数据来源，重绘由帧调度器按新数据标记进行）
             self.update_plot_data()
             
-            # 更新绘图显示
-            self.plot_display.update_display()
-            
         except Exception as e:
             print(f"更新显示数据失败: {e}")
     
+    def compile_plot_feeds(self):
+        """为update_plot_data预先编译(曲线名, 读取器)表，参数组变化后重新调用
+
+        返回[(是否为命令, 子结构体属性名, [(曲线名, 读取器), ...]), ...]；
+        遥测历史中已有的字段另存一份剔除后的表，有历史数据时绘图直接读历史，不必再逐个缓存。
+        """
+        history = self.robot_data.history if self.robot_data else None
+        feeds = []
+        uncovered = []
+        groups = [(False, STATE_GROUP_ATTRS[name], name, widget) for name, widget in self.state_display.parameter_groups.items()]
+        groups += [(True, name, name, widget) for name, widget in self.cmd_display.parameter_groups.items()]
+        for is_cmd, attr, group_name, widget in groups:
+            entries = [(f"{group_name}.{param_name}", f"{attr}.{param_name}", make_getter(param_name))
+                       for param_name in widget.parameters]
+            feeds.append((is_cmd, attr, [(series, getter) for series, _, getter in entries]))
+            missing = [(series, getter) for series, path, getter in entries
+                       if history is None or not history.has_field(path)]
+            if missing:
+                uncovered.append((is_cmd, attr, missing))
+        self._plot_feeds = feeds
+        self._uncovered_plot_feeds = uncovered
+    
     def update_plot_data(self):
-        """更新绘图数据"""
+        """更新绘图数据：按预编译的读取器表取值，热路径中没有字符串处理"""
         if not self.robot_data:
             return
             
         try:
-            # 更新状态数据
-            state_data = self.robot_data.get_state_data()
-            if state_data:
-                # 遍历所有状态参数组，将数据传递给plot_widget
-                for group_name, group_widget in self.state_display.parameter_groups.items():
-                    # 根据组名获取对应的状态数据对象
-                    if group_name == "robot_status":
-                        group_obj = state_data.state_robot
-                    elif group_name == "floating_status":
-                        group_obj = state_data.state_floating_mode
-                    elif group_name == "wheel_status":
-                        group_obj = state_data.state_wheel_mode
-                    elif group_name == "electromagnet_status":
-                        group_obj = state_data.state_electromagnet
-                    elif group_name == "brush_status":
-                        group_obj = state_data.state_brush
-                    elif group_name == "system_status":
-                        group_obj = state_data.state_system
-                    else:
-                        continue
-                        
-                    # 遍历参数并更新数据
-                    for param_name in group_widget.parameters.keys():
-                        if hasattr(group_obj, param_name):
-                            value = getattr(group_obj, param_name)
-                            full_param_name = f"{group_name}.{param_name}"
-                            self.plot_display.plot_widget.update_data(full_param_name, value)
-            
-            # 更新CMD数据
+            history = self.robot_data.history
+            feeds = self._uncovered_plot_feeds if history is not None and len(history) else self._plot_feeds
+            if not feeds:
+                return
             cmd_data = self.robot_data.get_cmd_data()
-            if cmd_data:
-                # 遍历所有CMD参数组，将数据传递给plot_widget
-                for group_name, group_widget in self.cmd_display.parameter_groups.items():
-                    # 根据组名获取对应的CMD数据对象
-                    if group_name == "cmd_floating_mode":
-                        group_obj = cmd_data.cmd_floating_mode
-                    elif group_name == "cmd_wheel_mode":
-                        group_obj = cmd_data.cmd_wheel_mode
-                    elif group_name == "cmd_electromagnet":
-                        group_obj = cmd_data.cmd_electromagnet
-                    elif group_name == "cmd_brush":
-                        group_obj = cmd_data.cmd_brush
-                    elif group_name == "cmd_camera":
-                        group_obj = cmd_data.cmd_camera
-                    else:
+            get_state_group = self.robot_data.get_state_group
+            samples = []
+            for is_cmd, attr, entries in feeds:
+                group_obj = getattr(cmd_data, attr) if is_cmd else get_state_group(attr)
+                for series, getter in entries:
+                    try:
+                        samples.append((series, getter(group_obj)))
+                    except (AttributeError, IndexError):
                         continue
-                        
-                    # 遍历参数并更新数据
-                    for param_name in group_widget.parameters.keys():
-                        if hasattr(group_obj, param_name):
-                            value = getattr(group_obj, param_name)
-                            full_param_name = f"{group_name}.{param_name}"
-                            self.plot_display.plot_widget.update_data(full_param_name, value)
-                        elif '[' in param_name and ']' in param_name:
-                            # 处理数组参数，如 cmd_camera_enable[0]
-                            base_name = param_name.split('[')[0]
-                            index_str = param_name.split('[')[1].split(']')[0]
-                            try:
-                                index = int(index_str)
-                                if hasattr(group_obj, base_name):
-                                    array_attr = getattr(group_obj, base_name)
-                                    if isinstance(array_attr, list) and 0 <= index < len(array_attr):
-                                        value = array_attr[index]
-                                        full_param_name = f"{group_name}.{param_name}"
-                                        self.plot_display.plot_widget.update_data(full_param_name, value)
-                            except (ValueError, IndexError):
-                                continue
+            self.plot_display.plot_widget.append_samples(time.time(), samples)
                         
         except Exception as e:
-            print(f"更新绘图数据失败: {e}")
\ No newline at end of file
+            print(f"更新绘图数据失败: {e}")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+绘图数据抽稀
+在历史数据与绘图之间按坐标轴像素宽度抽稀，渲染开销只与屏幕宽度有关，与历史长度无关。
+一个像素列最多只能显示两个有用的点（最小值和最大值），因此目标点数为像素宽度的2倍。
+
+- minmax: 按时间把数据分成与像素列数相同的区间，每个区间保留最小值和最大值，
+  推进器功率等短时尖峰不会被抽掉；
+- lttb: Largest-Triangle-Three-Buckets，按下标等分成桶，每桶保留与相邻两桶构成三角形面积最大的点，
+  曲线形状更接近原始数据。为了整体向量化，三角形的前一个顶点取前一个桶的均值点，
+  而不是逐桶循环时前一个桶选中的点。
+"""
+import numpy as np
+
+DECIMATION_MODES = ("none", "minmax", "lttb")
+
+
+def _bin_starts(times, n_bins):
+    """按时间把数据等分为n_bins个区间，返回各非空区间第一个点的下标"""
+    edges = np.linspace(times[0], times[-1], n_bins + 1)[:-1]
+    starts = np.searchsorted(times, edges, side="left")
+    return np.unique(starts)
+
+
+def minmax_decimate(times, values, n_bins):
+    """每个时间区间保留最小值和最大值，返回(时间, 数值)，点数不超过2*n_bins
+
+    两个点都放在区间第一个点的时刻，画出来就是该像素列上的一条竖线。
+    """
+    if len(times) <= 2 * n_bins:
+        return times, values
+    starts = _bin_starts(times, n_bins)
+    mins = np.minimum.reduceat(values, starts)
+    maxs = np.maximum.reduceat(values, starts)
+    return np.repeat(times[starts], 2), np.column_stack((mins, maxs)).ravel()
+
+
+def minmax_decimate_band(times, lo, hi, n_bins):
+    """汇总数据的包络抽稀：每个时间区间保留下沿的最小值和上沿的最大值，返回(时间, 下沿, 上沿)"""
+    if len(times) <= n_bins:
+        return times, lo, hi
+    starts = _bin_starts(times, n_bins)
+    return times[starts], np.minimum.reduceat(lo, starts), np.maximum.reduceat(hi, starts)
+
+
+def lttb_decimate(times, values, n_out):
+    """Largest-Triangle-Three-Buckets抽稀到n_out个点（保留首尾两点），返回(时间, 数值)"""
+    n = len(times)
+    if n <= n_out or n_out < 3:
+        return times, values
+    # 以首点为原点，避免大时间戳相减损失精度
+    x = np.asarray(times, dtype=np.float64) - times[0]
+    y = np.asarray(values, dtype=np.float64)
+
+    # 中间的n-2个点按下标等分为n_out-2个桶
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts = edges[:-1]
+    counts = np.diff(edges)
+    x_mid, y_mid = x[1:n - 1], y[1:n - 1]
+    offsets = starts - 1
+    x_mean = np.add.reduceat(x_mid, offsets) / counts
+    y_mean = np.add.reduceat(y_mid, offsets) / counts
+
+    # 每个桶的三角形另外两个顶点：前一个桶的均值点（首桶为首点）和后一个桶的均值点（末桶为尾点）
+    ax = np.concatenate(([x[0]], x_mean[:-1]))
+    ay = np.concatenate(([y[0]], y_mean[:-1]))
+    cx = np.concatenate((x_mean[1:], [x[-1]]))
+    cy = np.concatenate((y_mean[1:], [y[-1]]))
+    ax, ay, cx, cy = (np.repeat(a, counts) for a in (ax, ay, cx, cy))
+    areas = np.abs((ax - cx) * (y_mid - ay) - (ax - x_mid) * (cy - ay))
+
+    # 每个桶面积最大的点：先求桶内最大面积，再取每个桶第一个等于最大值的点
+    bucket = np.repeat(np.arange(len(starts)), counts)
+    is_max = areas == np.repeat(np.maximum.reduceat(areas, offsets), counts)
+    candidates = np.flatnonzero(is_max)
+    _, first = np.unique(bucket[candidates], return_index=True)
+    selected = candidates[first] + 1
+
+    indices = np.concatenate(([0], selected, [n - 1]))
+    return times[indices], values[indices]
+
+
+def decimate(times, values, band, width_px, mode="minmax"):
+    """按坐标轴像素宽度抽稀一条曲线及其包络，返回(时间, 数值, 包络)
+
+    band为None或(时间, 最小值, 最大值)。width_px无效（控件尚未显示）或mode为"none"时原样返回。
+    """
+    if mode == "none" or not width_px or width_px <= 0 or times is None:
+        return times, values, band
+    n_bins = int(width_px)
+    if mode == "lttb":
+        line_times, line_values = lttb_decimate(times, values, 2 * n_bins)
+    else:
+        line_times, line_values = minmax_decimate(times, values, n_bins)
+    if band is None:
+        return line_times, line_values, None
+    # 包络始终按最小/最大值抽稀，抽稀后的时间点与曲线不同
+    return line_times, line_values, minmax_decimate_band(band[0], band[1], band[2], n_bins)
@@ -1,52 +1,134 @@
 import sys
 import os
+import time
 from datetime import datetime
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, 
-    QPushButton, QCheckBox, QFrame, QFileDialog, QMessageBox
+    QPushButton, QCheckBox, QFrame, QFileDialog, QMessageBox, QProgressDialog,
+    QLineEdit, QDoubleSpinBox, QStackedWidget
 )
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QThreadPool
 from PyQt5.QtGui import QFont
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import matplotlib.dates as mdates
-from collections import defaultdict, deque
+from collections import defaultdict
 import numpy as np
+from config.uwbot_config import PLOT_CONFIG
+from ui_modules.frame_scheduler import PRIORITY_NORMAL
+from .plot_decimation import decimate
+from .plot_export import ExportTask
+from .plot_trigger import TriggerCapture
+from .plot_spectrum import create_spectrum_view, create_welch_spectrum
+
+try:
+    import pyqtgraph as pg
+except ImportError:
+    pg = None
 
 # 设置matplotlib中文字体
 plt.rcParams['font.sans-serif'] = ['SimHei']
 plt.rcParams['axes.unicode_minus'] = False
 # sudo apt-get install fonts-wqy-microhei fonts-noto-cjk
 
-class PlotWidget(QWidget):
-    def __init__(self, robot_data=None):
+PLOT_COLORS = ['#007bff', '#28a745', '#ffc107', '#dc3545']
+
+
+def to_date_nums(times):
+    """把UTC秒时间戳转换为matplotlib日期数值（按本地时间显示），只做一次向量运算"""
+    utc_offset = datetime.now().astimezone().utcoffset().total_seconds()
+    return _UNIX_EPOCH_NUM + (np.asarray(times, dtype=np.float64) + utc_offset) / 86400.0
+
+
+_UNIX_EPOCH_NUM = mdates.date2num(np.datetime64(0, 's'))  # 1970-01-01在matplotlib日期轴上的数值
+
+
+class SampleRing:
+    """单个参数的定长采样缓冲：float64时间戳（UTC秒）和float64数值
+
+    按2倍容量镜像存储，最近的数据总是连续切片；时间戳保证单调不减，时间窗口用searchsorted定位。
+    """
+    
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.times = np.zeros(2 * capacity, dtype=np.float64)
+        self.values = np.zeros(2 * capacity, dtype=np.float64)
+        self._count = 0
+        self._last_time = -np.inf
+    
+    def __len__(self):
+        return min(self._count, self.capacity)
+    
+    def append(self, t, value):
+        # 系统时钟回拨时沿用上一个时间戳，保持时间轴有序
+        t = max(t, self._last_time)
+        self._last_time = t
+        index = self._count % self.capacity
+        self.times[index] = self.times[index + self.capacity] = t
+        self.values[index] = self.values[index + self.capacity] = value
+        self._count += 1
+    
+    def window(self, cutoff=None):
+        """返回时间戳不早于cutoff的(时间戳, 数值)视图，cutoff为None时返回全部"""
+        end = self._count % self.capacity + self.capacity
+        start = end - len(self)
+        if cutoff is not None:
+            start += int(np.searchsorted(self.times[start:end], cutoff, side="left"))
+        return self.times[start:end], self.values[start:end]
+
+
+class MatplotlibPlotView(QWidget):
+    """matplotlib绘图：子图、曲线、标题、网格和时间格式化器只创建一次
+
+    每帧只对曲线调用set_data，再从缓存的背景上重绘发生变化的子图并blit；
+    只有数据超出当前视图（或明显小于视图）时才重新计算坐标范围并完整重绘一次。
+    """
+    
+    def __init__(self):
         super().__init__()
-        self.robot_data = robot_data
-        self.init_ui()
-        self.init_data()
-        
-    def init_ui(self):
         layout = QVBoxLayout(self)
-        layout.setContentsMargins(10, 10, 10, 10)
-        layout.setSpacing(8)
-        
-        # 控制面板
-        control_panel = self.create_control_panel()
-        layout.addWidget(control_panel)
+        layout.setContentsMargins(0, 0, 0, 0)
         
         # 创建matplotlib图形
         self.figure = Figure(figsize=(12, 10))
         self.figure.patch.set_facecolor('#f8f9fa')
         
-        # 创建4个子图，竖直排列
+        # 创建4个子图，竖直排列，共用时间轴
         self.axes = []
+        self.lines = []
+        self.bands = []  # 汇总数据的最小/最大值包络：每个桶一条竖线，以NaN分隔
+        self.markers = []  # 触发时刻竖线
+        self.placeholders = []
         for i in range(4):
-            ax = self.figure.add_subplot(4, 1, i+1)
+            ax = self.figure.add_subplot(4, 1, i+1, sharex=self.axes[0] if self.axes else None)
             ax.set_facecolor('#ffffff')
             ax.grid(True, alpha=0.3)
             ax.tick_params(colors='#495057')
+            ax.set_ylabel('数值', color='#495057')
+            ax.xaxis_date()
+            ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
+            ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+            # 曲线设为animated，完整重绘时不画进缓存的背景
+            band, = ax.plot([], [], color=PLOT_COLORS[i], linewidth=1, alpha=0.25, animated=True)
+            line, = ax.plot([], [], color=PLOT_COLORS[i], linewidth=2, alpha=0.8, animated=True)
+            marker = ax.axvline(0, color='#dc3545', linestyle='--', linewidth=1, visible=False)
+            placeholder = ax.text(0.5, 0.5, f"图表 {i+1}\n请选择参数", 
+                                  transform=ax.transAxes, 
+                                  ha='center', va='center', 
+                                  fontsize=12, color='#6c757d')
+            ax.set_title(f"图表 {i+1}: 未选择参数", 
+                         fontsize=10, fontweight='bold', color='#6c757d')
+            # 只在最后一个子图显示x轴标签
+            if i < 3:
+                ax.tick_params(labelbottom=False)
+            else:
+                ax.set_xlabel('时间', color='#495057')
             self.axes.append(ax)
+            self.lines.append(line)
+            self.bands.append(band)
+            self.markers.append(marker)
+            self.placeholders.append(placeholder)
         
         # 调整子图间距
         self.figure.subplots_adjust(left=0.1, right=0.95, top=0.95, bottom=0.1, hspace=0.4)
@@ -55,6 +137,235 @@ class PlotWidget(QWidget):
         self.canvas = FigureCanvas(self.figure)
         layout.addWidget(self.canvas)
         
+        self._backgrounds = None  # 各子图不含曲线的背景，完整重绘后缓存
+        self._has_data = [False] * 4
+        self._full_redraw = True
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+    
+    def _on_draw(self, event):
+        """完整重绘（包括窗口缩放）后缓存背景，并画上曲线"""
+        self._backgrounds = [self.canvas.copy_from_bbox(ax.bbox) for ax in self.axes]
+        for ax, band, line in zip(self.axes, self.bands, self.lines):
+            ax.draw_artist(band)
+            ax.draw_artist(line)
+    
+    def set_parameter(self, index, param_name):
+        """设置子图显示的参数（标题和空图表提示），下一帧完整重绘"""
+        ax = self.axes[index]
+        if param_name:
+            ax.set_title(f"图表 {index+1}: {param_name}", 
+                         fontsize=10, fontweight='bold', color='#495057')
+        else:
+            ax.set_title(f"图表 {index+1}: 未选择参数", 
+                         fontsize=10, fontweight='bold', color='#6c757d')
+        self.placeholders[index].set_visible(not param_name)
+        self._full_redraw = True
+    
+    def axis_width(self, index):
+        """子图绘图区的像素宽度"""
+        return self.axes[index].bbox.width
+    
+    def set_marker(self, t):
+        """在所有子图上标出触发时刻（UTC秒），t为None时隐藏，下一帧完整重绘"""
+        for marker in self.markers:
+            if t is not None:
+                x = to_date_nums([t])[0]
+                marker.set_xdata([x, x])
+            marker.set_visible(t is not None)
+        self._full_redraw = True
+    
+    def _update_limits(self, ranges):
+        """数据超出当前视图或明显小于视图时重新计算坐标范围，返回是否需要完整重绘"""
+        margin = PLOT_CONFIG.VIEW_MARGIN
+        changed = False
+        if ranges:
+            # 时间轴：右侧预留margin，数据移出视图后整体平移
+            t_min = min(r[0] for r in ranges.values())
+            t_max = max(r[1] for r in ranges.values())
+            span = max(t_max - t_min, 1.0 / 86400)
+            x0, x1 = self.axes[0].get_xlim()
+            if t_min < x0 or t_max > x1 or t_min - x0 > span * margin:
+                self.axes[0].set_xlim(t_min, t_max + span * margin)
+                changed = True
+        for i, (_, _, y_min, y_max) in ranges.items():
+            ax = self.axes[i]
+            y0, y1 = ax.get_ylim()
+            span = y_max - y_min
+            if y_min < y0 or y_max > y1 or span < (y1 - y0) * margin:
+                span = span if span > 0 else max(abs(y_max), 1.0)
+                ax.set_ylim(y_min - span * margin, y_max + span * margin)
+                changed = True
+        return changed
+    
+    def render(self, series):
+        """绘制一帧，series[i]为None或(UTC秒时间戳, 数值, 包络)，包络为None或(时间戳, 最小值, 最大值)"""
+        changed = []
+        ranges = {}  # 有数据的子图 -> (起始时间, 结束时间, 最小值, 最大值)
+        for i, item in enumerate(series):
+            line, band = self.lines[i], self.bands[i]
+            if item is None or item[0] is None or len(item[0]) == 0:
+                if self._has_data[i]:
+                    line.set_data([], [])
+                    band.set_data([], [])
+                    self._has_data[i] = False
+                    changed.append(i)
+                continue
+            times, values, band_data = item
+            x = to_date_nums(times)
+            line.set_data(x, values)
+            if band_data is not None:
+                band_times, lo, hi = band_data
+                band_x = np.repeat(to_date_nums(band_times), 3)
+                band_x[2::3] = np.nan
+                band.set_data(band_x, np.column_stack((lo, hi, np.full(len(lo), np.nan))).ravel())
+                y_min, y_max = float(np.min(lo)), float(np.max(hi))
+            else:
+                band.set_data([], [])
+                y_min, y_max = float(np.min(values)), float(np.max(values))
+            self._has_data[i] = True
+            changed.append(i)
+            ranges[i] = (x[0], x[-1], y_min, y_max)
+        
+        full_redraw = self._update_limits(ranges) or self._full_redraw
+        if full_redraw or self._backgrounds is None or not PLOT_CONFIG.MATPLOTLIB_BLIT:
+            self._full_redraw = False
+            self.canvas.draw()  # draw_event中缓存背景并画上曲线
+            return
+        for i in changed:
+            ax = self.axes[i]
+            self.canvas.restore_region(self._backgrounds[i])
+            ax.draw_artist(self.bands[i])
+            ax.draw_artist(self.lines[i])
+            self.canvas.blit(ax.bbox)
+    
+    def clear(self):
+        """清空所有曲线"""
+        for i, (line, band) in enumerate(zip(self.lines, self.bands)):
+            line.set_data([], [])
+            band.set_data([], [])
+            self._has_data[i] = False
+        self.canvas.draw()
+
+
+class PyqtgraphPlotView(QWidget):
+    """pyqtgraph实时绘图：4条常驻曲线，每帧只对NumPy视图调用setData
+
+    时间轴共用同一个x范围（DateAxisItem按本地时间显示UTC秒时间戳），
+    标题只在参数变化时设置，不重建任何图元。
+    汇总数据的最小/最大值包络画成每个桶一条竖线（connect='pairs'），比FillBetweenItem重建填充路径快得多。
+    """
+    
+    def __init__(self):
+        super().__init__()
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.graphics = pg.GraphicsLayoutWidget()
+        self.graphics.setBackground('#ffffff')
+        layout.addWidget(self.graphics)
+        
+        self.plots = []
+        self.curves = []
+        self.bands = []
+        self.markers = []  # 触发时刻竖线
+        for i in range(4):
+            plot = self.graphics.addPlot(row=i, col=0, axisItems={'bottom': pg.DateAxisItem()})
+            plot.showGrid(x=True, y=True, alpha=0.3)
+            plot.setLabel('left', '数值')
+            # 数值范围每帧都在变，关闭单位前缀自动缩放，避免每帧重排坐标轴标签
+            plot.getAxis('left').enableAutoSIPrefix(False)
+            plot.setClipToView(True)  # 只绘制可见范围内的点
+            if i > 0:
+                plot.setXLink(self.plots[0])
+            # 宽度为1的画笔走Qt的快速路径，宽线条绘制明显更慢
+            band_color = pg.mkColor(PLOT_COLORS[i])
+            band_color.setAlpha(60)
+            band = pg.PlotCurveItem(pen=pg.mkPen(band_color, width=1), connect='pairs')
+            plot.addItem(band)
+            curve = plot.plot(pen=pg.mkPen(PLOT_COLORS[i], width=1))
+            marker = pg.InfiniteLine(angle=90, movable=False, pen=pg.mkPen('#dc3545', width=1, style=Qt.DashLine))
+            marker.hide()
+            plot.addItem(marker, ignoreBounds=True)
+            self.markers.append(marker)
+            self.plots.append(plot)
+            self.curves.append(curve)
+            self.bands.append(band)
+            self.set_parameter(i, None)
+        self.plots[-1].setLabel('bottom', '时间')
+    
+    def set_parameter(self, index, param_name):
+        """设置图表显示的参数（标题）"""
+        if param_name:
+            self.plots[index].setTitle(f"图表 {index+1}: {param_name}")
+        else:
+            self.plots[index].setTitle(f"图表 {index+1}: 未选择参数")
+    
+    def axis_width(self, index):
+        """图表绘图区的像素宽度"""
+        return self.plots[index].getViewBox().width()
+    
+    def set_marker(self, t):
+        """在所有图表上标出触发时刻（UTC秒），t为None时隐藏"""
+        for marker in self.markers:
+            if t is not None:
+                marker.setValue(t)
+            marker.setVisible(t is not None)
+    
+    def render(self, series):
+        """绘制一帧，series[i]为None或(UTC秒时间戳, 数值, 包络)，包络为None或(时间戳, 最小值, 最大值)"""
+        for i, item in enumerate(series):
+            if item is None:
+                self.curves[i].clear()
+                self.bands[i].clear()
+                continue
+            times, values, band = item
+            if times is None or len(times) == 0:
+                self.curves[i].clear()
+                self.bands[i].clear()
+                continue
+            self.curves[i].setData(times, values, skipFiniteCheck=True)
+            if band is not None:
+                # 每个桶一对点(t, 最小值)-(t, 最大值)
+                band_times, lo, hi = band
+                self.bands[i].setData(np.repeat(band_times, 2), np.column_stack((lo, hi)).ravel(), skipFiniteCheck=True)
+            else:
+                self.bands[i].clear()
+    
+    def clear(self):
+        """清空所有曲线"""
+        for curve, band in zip(self.curves, self.bands):
+            curve.clear()
+            band.clear()
+
+
+class PlotWidget(QWidget):
+    def __init__(self, robot_data=None):
+        super().__init__()
+        self.robot_data = robot_data
+        self.init_ui()
+        self.init_data()
+        
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.setSpacing(8)
+        
+        # 控制面板
+        control_panel = self.create_control_panel()
+        layout.addWidget(control_panel)
+        
+        # 实时绘图：优先使用pyqtgraph，未安装时退回matplotlib
+        if PLOT_CONFIG.BACKEND == "pyqtgraph" and pg is not None:
+            self.plot_view = PyqtgraphPlotView()
+        else:
+            self.plot_view = MatplotlibPlotView()
+        # 频谱模式与时域绘图共用同一块区域，按显示模式切换
+        self.spectrum_view = create_spectrum_view(PLOT_COLORS)
+        self.view_stack = QStackedWidget()
+        self.view_stack.addWidget(self.plot_view)
+        self.view_stack.addWidget(self.spectrum_view)
+        layout.addWidget(self.view_stack)
+        
         # 设置样式
         self.setStyleSheet("""
             QWidget {
@@ -106,6 +417,18 @@ class PlotWidget(QWidget):
         """)
         button_layout.addWidget(self.time_combo)
         
+        # 显示模式选择
+        mode_label = QLabel("显示模式:")
+        mode_label.setStyleSheet("color: #495057; font-weight: bold;")
+        button_layout.addWidget(mode_label)
+        
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItems(["时域曲线", "频谱"])
+        self.mode_combo.setToolTip("频谱: 推进器功率、电机速度和角速度的Welch平均功率谱")
+        self.mode_combo.setStyleSheet(self.time_combo.styleSheet())
+        self.mode_combo.currentIndexChanged.connect(self.on_mode_changed)
+        button_layout.addWidget(self.mode_combo)
+        
         button_layout.addStretch()
         
         # 自动更新复选框
@@ -161,36 +484,202 @@ class PlotWidget(QWidget):
         
         layout.addLayout(button_layout)
         
+        # 触发采集区域
+        trigger_layout = QHBoxLayout()
+        
+        trigger_label = QLabel("触发条件:")
+        trigger_label.setStyleSheet("color: #495057; font-weight: bold;")
+        trigger_layout.addWidget(trigger_label)
+        
+        self.trigger_edit = QLineEdit()
+        self.trigger_edit.setPlaceholderText("如 state_floating_mode.sta_thruster_power[2] > 80 或 sta_leak_detected == 1")
+        self.trigger_edit.setStyleSheet("""
+            QLineEdit {
+                background-color: #ffffff;
+                border: 1px solid #ced4da;
+                border-radius: 4px;
+                padding: 4px 8px;
+            }
+        """)
+        trigger_layout.addWidget(self.trigger_edit, 1)
+        
+        self.pre_trigger_spin = self.create_seconds_spin(PLOT_CONFIG.TRIGGER_PRE_SECONDS)
+        self.post_trigger_spin = self.create_seconds_spin(PLOT_CONFIG.TRIGGER_POST_SECONDS)
+        for text, spin in (("触发前:", self.pre_trigger_spin), ("触发后:", self.post_trigger_spin)):
+            label = QLabel(text)
+            label.setStyleSheet("color: #495057;")
+            trigger_layout.addWidget(label)
+            trigger_layout.addWidget(spin)
+        
+        self.trigger_btn = QPushButton("🎯 布防")
+        self.trigger_btn.setCheckable(True)
+        self.trigger_btn.toggled.connect(self.on_trigger_toggled)
+        self.trigger_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #6c757d;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                padding: 6px 12px;
+                font-weight: bold;
+            }
+            QPushButton:checked {
+                background-color: #fd7e14;
+            }
+        """)
+        trigger_layout.addWidget(self.trigger_btn)
+        
+        self.trigger_status = QLabel("未布防")
+        self.trigger_status.setStyleSheet("color: #6c757d;")
+        trigger_layout.addWidget(self.trigger_status)
+        
+        layout.addLayout(trigger_layout)
+        
         return panel
     
+    def create_seconds_spin(self, value):
+        """创建触发前/后时长输入框"""
+        spin = QDoubleSpinBox()
+        spin.setRange(0.0, 60.0)
+        spin.setDecimals(1)
+        spin.setSingleStep(0.5)
+        spin.setSuffix(" s")
+        spin.setValue(value)
+        return spin
+    
     def init_data(self):
         """初始化数据结构"""
-        self.parameter_data = defaultdict(lambda: {'times': deque(maxlen=1000), 'values': deque(maxlen=1000)})
+        self.parameter_data = defaultdict(lambda: SampleRing(PLOT_CONFIG.SAMPLE_CAPACITY))
         self.plot_assignments = [None, None, None, None]  # 4个图表当前显示的参数
+        self.plot_paths = [None, None, None, None]  # 4个图表对应的遥测历史列（字段路径）
+        self.cleared_at = 0.0  # 清除数据的时刻，遥测历史中更早的数据不再显示
+        self.export_task = None  # 正在后台执行的导出任务
+        self.export_progress = None
+        # 触发采集直接读遥测历史，没有历史时不可用
+        history = self.robot_data.history if self.robot_data else None
+        self.trigger = TriggerCapture(history) if history is not None else None
+        self.trigger_state = TriggerCapture.IDLE
+        self.trigger_btn.setEnabled(self.trigger is not None)
+        # 频谱同样直接读遥测历史，没有历史时只能显示时域曲线
+        self.spectrum = create_welch_spectrum(history) if history is not None else None
+        self.mode_combo.setEnabled(self.spectrum is not None)
         
-        # 设置更新定时器
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_plot)
-        # 使用统一的uptime参数，如果没有robot_data则使用默认值20ms
-        uptime = self.robot_data.app_dt if self.robot_data else 50
-        self.update_timer.start(uptime)  # 使用统一的uptime参数，20ms更新一次
-        
-
+        self._data_dirty = False  # 自上次重绘以来是否有新数据
+        self._drawn_count = -1  # 上次重绘时遥测历史的总行数，历史有新行时需要重绘
+    
+    def register_frame_tasks(self, scheduler):
+        """注册到帧调度器：触发判断不受可见性限制，界面隐藏时也会继续扫描新到的数据包；重绘只在可见时进行"""
+        # 使用统一的uptime参数，如果没有robot_data则使用默认值50ms
+        rate = 1000.0 / (self.robot_data.app_dt if self.robot_data else 50)
+        scheduler.register("绘图触发", self.on_trigger_frame, rate, PRIORITY_NORMAL, budget_ms=2)
+        scheduler.register("绘图", self.on_render_frame, rate, PRIORITY_NORMAL, budget_ms=8, widget=self)
     
-    def update_data(self, param_name, value):
-        """更新参数数据"""
-        if isinstance(value, (int, float)):
-            current_time = datetime.now()
-            self.parameter_data[param_name]['times'].append(current_time)
-            self.parameter_data[param_name]['values'].append(float(value))
+    def on_trigger_frame(self):
+        if self.trigger is not None and self.trigger.state != TriggerCapture.IDLE:
+            self.poll_trigger()
     
-    def set_plot_parameter(self, plot_index, param_name):
-        """设置指定图表显示的参数"""
+    def on_render_frame(self):
+        """重绘：仅在有新数据（遥测历史有新行，或追加了不在历史中的采样）时重绘，链路空闲时不消耗CPU"""
+        history = self.robot_data.history if self.robot_data else None
+        if history is not None and history.count != self._drawn_count:
+            self._data_dirty = True
+        if self.is_spectrum_mode():
+            self.update_spectrum()
+        elif self._data_dirty and not self.is_frozen():
+            self.update_plot()
+    
+    def is_spectrum_mode(self):
+        return self.view_stack.currentWidget() is self.spectrum_view
+    
+    def on_mode_changed(self, index):
+        """切换时域曲线/频谱；进入频谱模式时从历史中最近的数据开始积累，立即显示"""
+        self.view_stack.setCurrentIndex(index)
+        if self.is_spectrum_mode():
+            self.spectrum_view.clear()
+            if self.spectrum.prime():
+                self.render_spectrum()
+        else:
+            self.update_plot()
+    
+    def update_spectrum(self):
+        """增量处理新到的数据包，有新的段完成变换时重绘频谱（自动更新关闭时暂停）"""
+        if self.auto_update_cb.isChecked() and self.spectrum.update():
+            self.render_spectrum()
+    
+    def render_spectrum(self):
+        result = self.spectrum.result()
+        if result is not None:
+            frequencies, psd, _ = result
+            self.spectrum_view.render(frequencies, psd)
+    
+    def is_frozen(self):
+        """是否正在显示冻结的触发捕获"""
+        return self.trigger is not None and self.trigger.captured is not None
+    
+    def poll_trigger(self):
+        """推进触发状态机，状态变化时更新状态文字，完成捕获时显示冻结的窗口"""
+        captured = self.trigger.poll()
+        if self.trigger.state == self.trigger_state:
+            return
+        self.trigger_state = self.trigger.state
+        if self.trigger_state == TriggerCapture.ARMED:
+            self.set_trigger_status(f"等待触发: {self.trigger.condition[0]}", '#fd7e14')
+        elif self.trigger_state == TriggerCapture.TRIGGERED:
+            self.set_trigger_status(f"已触发 {self.format_time(self.trigger.trigger_time)}，采集中...", '#dc3545')
+        elif self.trigger_state == TriggerCapture.CAPTURED:
+            self.set_trigger_status(f"已捕获 {self.format_time(self.trigger.trigger_time)}（再次点击返回实时）", '#28a745')
+        if captured:
+            self.plot_view.set_marker(self.trigger.trigger_time)
+            self.update_plot()
+    
+    def on_trigger_toggled(self, checked):
+        """布防/取消布防；取消时释放捕获，返回实时显示"""
+        if checked:
+            try:
+                self.trigger.arm(self.trigger_edit.text(), self.pre_trigger_spin.value(), self.post_trigger_spin.value())
+            except ValueError as e:
+                QMessageBox.warning(self, "触发条件无效", str(e))
+                self.trigger_btn.setChecked(False)
+                return
+            self.trigger_btn.setText("⏹ 取消")
+            self.poll_trigger()
+        else:
+            frozen = self.is_frozen()
+            if self.trigger is not None:
+                self.trigger.disarm()
+            self.trigger_state = TriggerCapture.IDLE
+            self.trigger_btn.setText("🎯 布防")
+            self.set_trigger_status("未布防", '#6c757d')
+            if frozen:
+                self.plot_view.set_marker(None)
+                self.update_plot()
+    
+    def set_trigger_status(self, text, color):
+        self.trigger_status.setText(text)
+        self.trigger_status.setStyleSheet(f"color: {color};")
+    
+    @staticmethod
+    def format_time(t):
+        return datetime.fromtimestamp(t).strftime('%H:%M:%S.%f')[:-3]
+    
+    def append_samples(self, t, samples):
+        """批量追加同一时刻的采样，samples为[(参数名, 数值), ...]"""
+        for param_name, value in samples:
+            if isinstance(value, (int, float)):
+                self.parameter_data[param_name].append(t, float(value))
+        if samples:
+            self._data_dirty = True
+    
+    def set_plot_parameter(self, plot_index, param_name, field_path=None):
+        """设置指定图表显示的参数，field_path为该参数在遥测历史中的字段路径"""
         if 0 <= plot_index < 4:
             if param_name == "-- 不显示 --" or param_name is None:
                 self.plot_assignments[plot_index] = None
+                self.plot_paths[plot_index] = None
             else:
                 self.plot_assignments[plot_index] = param_name
+                self.plot_paths[plot_index] = field_path
+            self.plot_view.set_parameter(plot_index, self.plot_assignments[plot_index])
             self.update_plot()
     
     def get_time_window_seconds(self):
@@ -206,109 +695,62 @@ class PlotWidget(QWidget):
             return 300
         else:
             return None  # 全部数据
+
+    def get_series(self, plot_index, time_window):
+        """取图表的绘图数据，返回(UTC秒时间戳, 数值, 包络)，包络为None或(时间戳, 最小值, 最大值)
+
+        有遥测历史时从历史中取，按时间窗口自动选择原始数据或1s/10s/60s汇总级，
+        汇总级以均值为曲线、以桶内最小/最大值为包络；否则使用update_data缓存的数据。
+        """
+        path = self.plot_paths[plot_index]
+        if self.is_frozen():
+            # 显示冻结的触发窗口，与时间窗口无关
+            captured = self.trigger.column(path)
+            return (captured[0], captured[1], None) if captured is not None else (None, None, None)
+        history = self.robot_data.history if self.robot_data else None
+        if history is not None and len(history) and history.has_field(path):
+            times, lo, hi, mean, bucket_seconds = history.series(path, time_window, PLOT_CONFIG.MAX_POINTS)
+            start = int(np.searchsorted(times, self.cleared_at, side="left"))
+            times, lo, hi, mean = times[start:], lo[start:], hi[start:], mean[start:]
+            return times, mean, ((times, lo, hi) if bucket_seconds else None)
+
+        samples = self.parameter_data.get(self.plot_assignments[plot_index])
+        if not samples:
+            return None, None, None
+        times, values = samples.window(time.time() - time_window if time_window else None)
+        return times, values, None
     
     def update_plot(self):
         """更新绘图"""
-        if not self.auto_update_cb.isChecked():
+        if not self.auto_update_cb.isChecked() and not self.is_frozen():
             return
+        self._data_dirty = False
+        history = self.robot_data.history if self.robot_data else None
+        if history is not None:
+            self._drawn_count = history.count
             
         try:
-            current_time = datetime.now()
             time_window = self.get_time_window_seconds()
-            
-            # 清除所有子图
-            for ax in self.axes:
-                ax.clear()
-                ax.set_facecolor('#ffffff')
-                ax.grid(True, alpha=0.3)
-                ax.tick_params(colors='#495057')
-            
-            # 为每个子图绘制对应的参数
-            colors = ['#007bff', '#28a745', '#ffc107', '#dc3545']
-            
+            series = []
             for i, param_name in enumerate(self.plot_assignments):
-                if param_name and param_name in self.parameter_data:
-                    data = self.parameter_data[param_name]
-                    
-                    if len(data['times']) > 0:
-                        times = list(data['times'])
-                        values = list(data['values'])
-                        
-                        # 时间窗口过滤
-                        if time_window:
-                            cutoff_time = current_time.timestamp() - time_window
-                            filtered_data = [(t, v) for t, v in zip(times, values) 
-                                           if t.timestamp() >= cutoff_time]
-                            if filtered_data:
-                                times, values = zip(*filtered_data)
-                            else:
-                                times, values = [], []
-                        
-                        if times and values:
-                            # 绘制数据
-                            self.axes[i].plot(times, values, color=colors[i], linewidth=2, alpha=0.8)
-                            
-                            # 设置标题和标签
-                            self.axes[i].set_title(f"图表 {i+1}: {param_name}", 
-                                                  fontsize=10, fontweight='bold', color='#495057')
-                            self.axes[i].set_ylabel('数值', color='#495057')
-                            
-                            # 格式化时间轴
-                            if len(times) > 1:
-                                self.axes[i].xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
-                                self.axes[i].xaxis.set_major_locator(mdates.SecondLocator(interval=max(1, len(times)//5)))
-                            
-                            # 设置y轴范围
-                            if len(values) > 1:
-                                y_min, y_max = min(values), max(values)
-                                y_range = y_max - y_min
-                                if y_range > 0:
-                                    self.axes[i].set_ylim(y_min - y_range*0.1, y_max + y_range*0.1)
-                else:
-                    # 显示空图表提示
-                    self.axes[i].text(0.5, 0.5, f"图表 {i+1}\n请选择参数", 
-                                    transform=self.axes[i].transAxes, 
-                                    ha='center', va='center', 
-                                    fontsize=12, color='#6c757d')
-                    self.axes[i].set_title(f"图表 {i+1}: 未选择参数", 
-                                          fontsize=10, fontweight='bold', color='#6c757d')
-            
-            # 同步时间轴（如果有多个图表有数据）
-            active_axes = [ax for i, ax in enumerate(self.axes) 
-                          if self.plot_assignments[i] and 
-                          self.plot_assignments[i] in self.parameter_data and 
-                          len(self.parameter_data[self.plot_assignments[i]]['times']) > 0]
-            
-            if len(active_axes) > 1:
-                # 获取所有时间范围
-                all_times = []
-                for i, param_name in enumerate(self.plot_assignments):
-                    if param_name and param_name in self.parameter_data:
-                        times = list(self.parameter_data[param_name]['times'])
-                        if time_window:
-                            cutoff_time = current_time.timestamp() - time_window
-                            times = [t for t in times if t.timestamp() >= cutoff_time]
-                        all_times.extend(times)
-                
-                if all_times:
-                    min_time, max_time = min(all_times), max(all_times)
-                    for ax in active_axes:
-                        ax.set_xlim(min_time, max_time)
-            
-            # 只在最后一个子图显示x轴标签
-            for i, ax in enumerate(self.axes):
-                if i < 3:
-                    ax.set_xticklabels([])
+                if param_name:
+                    # 按坐标轴像素宽度抽稀，渲染点数与历史长度无关
+                    times, values, band = self.get_series(i, time_window)
+                    series.append(decimate(times, values, band, self.plot_view.axis_width(i), PLOT_CONFIG.DECIMATION))
                 else:
-                    ax.set_xlabel('时间', color='#495057')
-            
-            self.canvas.draw()
+                    series.append(None)
+            self.plot_view.render(series)
             
         except Exception as e:
             print(f"绘图更新失败: {e}")
     
     def save_plots(self):
-        """保存图表到文件"""
+        """保存图表和遥测历史到文件
+
+        界面线程只复制数据，绘图和写文件在后台线程中执行，期间命令发送和实时绘图不受影响。
+        """
+        if self.export_task is not None:
+            return
         try:
             # 检查是否有选择的参数
             active_params = [param for param in self.plot_assignments if param]
@@ -324,70 +766,79 @@ class PlotWidget(QWidget):
             if not save_dir:
                 return
             
-            # 为每个参数创建子目录并保存
-            saved_files = []
+            # 导出使用全部数据；数组复制一份，后台线程绘图期间缓冲区可以继续写入
+            plots = []
             for i, param_name in enumerate(self.plot_assignments):
                 if param_name:
-                    # 创建参数目录
-                    param_dir = os.path.join(save_dir, f"{param_name}_{timestamp}")
-                    os.makedirs(param_dir, exist_ok=True)
-                    
-                    # 保存单个图表
-                    fig_single = Figure(figsize=(10, 6))
-                    ax_single = fig_single.add_subplot(1, 1, 1)
-                    
-                    if param_name in self.parameter_data:
-                        data = self.parameter_data[param_name]
-                        if len(data['times']) > 0:
-                            times = list(data['times'])
-                            values = list(data['values'])
-                            
-                            ax_single.plot(times, values, color='#007bff', linewidth=2)
-                            ax_single.set_title(f"{param_name}", fontsize=14, fontweight='bold')
-                            ax_single.set_xlabel('时间')
-                            ax_single.set_ylabel('数值')
-                            ax_single.grid(True, alpha=0.3)
-                            
-                            # 格式化时间轴
-                            ax_single.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
-                    
-                    # 保存图片
-                    img_path = os.path.join(param_dir, f"{param_name}_{timestamp}.png")
-                    fig_single.savefig(img_path, dpi=300, bbox_inches='tight')
-                    
-                    # 保存数据
-                    if param_name in self.parameter_data:
-                        data = self.parameter_data[param_name]
-                        if len(data['times']) > 0:
-                            data_path = os.path.join(param_dir, f"{param_name}_{timestamp}.txt")
-                            with open(data_path, 'w', encoding='utf-8') as f:
-                                f.write(f"# {param_name} 数据\n")
-                                f.write("# 时间\t数值\n")
-                                for t, v in zip(data['times'], data['values']):
-                                    f.write(f"{t.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}\t{v}\n")
-                    
-                    saved_files.append(param_dir)
-            
-            # 保存完整的4图组合
-            if len(active_params) > 1:
-                combined_path = os.path.join(save_dir, f"combined_plots_{timestamp}.png")
-                self.figure.savefig(combined_path, dpi=300, bbox_inches='tight')
-                saved_files.append(combined_path)
-            
-            QMessageBox.information(self, "保存成功", 
-                                  f"图表已保存到:\n" + "\n".join(saved_files))
+                    times, values, band = self.get_series(i, None)
+                    if times is not None:
+                        times, values = times.copy(), values.copy()
+                        band = tuple(a.copy() for a in band) if band is not None else None
+                    plots.append((param_name, times, values, band, PLOT_COLORS[i]))
+            history = self.robot_data.history if self.robot_data else None
+            snapshot = history.snapshot() if history is not None else None
             
+            task = ExportTask(save_dir, timestamp, plots, snapshot,
+                              history.to_float_matrix if history is not None else None)
         except Exception as e:
             QMessageBox.critical(self, "保存失败", f"保存图表时出错: {str(e)}")
+            return
+        
+        # 非模态进度对话框，取消时工作线程在下一个检查点停止
+        progress = QProgressDialog("正在导出...", "取消", 0, 100, self)
+        progress.setWindowTitle("保存图表")
+        progress.setWindowModality(Qt.NonModal)
+        progress.setMinimumDuration(0)
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+        progress.canceled.connect(task.cancel)
+        task.signals.progress.connect(self._on_export_progress)
+        task.signals.finished.connect(self._on_export_finished)
+        task.signals.failed.connect(self._on_export_failed)
+        task.signals.canceled.connect(self._on_export_canceled)
+        
+        self.export_task = task
+        self.export_progress = progress
+        self.save_btn.setEnabled(False)
+        progress.show()
+        QThreadPool.globalInstance().start(task)
+    
+    def _end_export(self):
+        """导出结束（完成、失败或取消）后恢复界面"""
+        self.export_task = None
+        self.save_btn.setEnabled(True)
+        if self.export_progress is not None:
+            self.export_progress.canceled.disconnect()
+            self.export_progress.close()
+            self.export_progress.deleteLater()
+            self.export_progress = None
+    
+    def _on_export_progress(self, value, text):
+        if self.export_progress is not None:
+            self.export_progress.setValue(value)
+            self.export_progress.setLabelText(text)
+    
+    def _on_export_finished(self, saved_files):
+        self._end_export()
+        QMessageBox.information(self, "保存成功", 
+                              f"图表已保存到:\n" + "\n".join(saved_files))
+    
+    def _on_export_failed(self, message):
+        self._end_export()
+        QMessageBox.critical(self, "保存失败", f"保存图表时出错: {message}")
+    
+    def _on_export_canceled(self):
+        self._end_export()
     
     def clear_data(self):
         """清除所有数据"""
         self.parameter_data.clear()
-        for ax in self.axes:
-            ax.clear()
-            ax.set_facecolor('#ffffff')
-            ax.grid(True, alpha=0.3)
-        self.canvas.draw()
+        self.cleared_at = time.time()  # 遥测历史由多个界面共享，只隐藏清除前的数据
+        self.trigger_btn.setChecked(False)  # 同时取消布防并释放触发捕获
+        self.plot_view.clear()
+        if self.spectrum is not None:
+            self.spectrum.reset()
+            self.spectrum_view.clear()
 
 class PlotDisplayWidget(QWidget):
     def __init__(self, robot_data=None):
@@ -403,125 +854,3 @@ class PlotDisplayWidget(QWidget):
         # 绘图组件
         self.plot_widget = PlotWidget(self.robot_data)
         layout.addWidget(self.plot_widget)
-    
-    def update_display(self):
-        """更新显示数据"""
-        if not self.robot_data:
-            return
-            
-        try:
-            # 更新状态数据
-            state_data = self.robot_data.get_state_data()
-            self.update_group_parameters("机器人状态", state_data.state_robot)
-            self.update_group_parameters("浮游模式状态", state_data.state_floating_mode)
-            self.update_group_parameters("轮式模式状态", state_data.state_wheel_mode)
-            self.update_group_parameters("电磁铁状态", state_data.state_electromagnet)
-            self.update_group_parameters("清洗功能状态", state_data.state_brush)
-            self.update_group_parameters("系统状态", state_data.state_system)
-            
-            # 更新命令数据
-            cmd_data = self.robot_data.get_cmd_data()
-            self.update_group_parameters("浮游模式控制", cmd_data.cmd_floating_mode)
-            self.update_group_parameters("轮式模式控制", cmd_data.cmd_wheel_mode)
-            self.update_group_parameters("清洗功能控制", cmd_data.cmd_brush)
-            self.update_group_parameters("相机控制", cmd_data.cmd_camera)
-            
-        except Exception as e:
-            print(f"更新绘图数据失败: {e}")
-            
-    def update_group_parameters(self, group_name, group_data):
-        """更新组参数"""
-        for attr_name in dir(group_data):
-            if not attr_name.startswith('_'):
-                try:
-                    value = getattr(group_data, attr_name)
-                    if not callable(value):
-                        # 获取参数信息
-                        display_name, _, _ = self.get_parameter_info(attr_name)
-                        full_param_name = f"{group_name} - {display_name}"
-                        
-                        # 参数已通过data_display.py的下拉框进行选择
-                        
-                        # 更新绘图数据
-                        if isinstance(value, (int, float)):
-                            self.plot_widget.update_data(full_param_name, value)
-                        elif isinstance(value, list) and len(value) > 0:
-                            # 处理列表类型的参数（如推进器功率、温度等）
-                            for idx, item in enumerate(value):
-                                if isinstance(item, (int, float)):
-                                    indexed_name = f"{full_param_name}[{idx}]"
-                                    self.plot_widget.update_data(indexed_name, item)
-                            
-                except Exception as e:
-                    continue
-                    
-    def get_parameter_info(self, attr_name):
-        """获取参数的中文名称、单位和描述"""
-        # 参数信息映射表
-        param_info = {
-            # 机器人状态
-            'sta_position_x': ('X坐标', 'm', '机器人在X轴方向的位置'),
-            'sta_position_y': ('Y坐标', 'm', '机器人在Y轴方向的位置'),
-            'sta_position_z': ('Z坐标/深度', 'm', '机器人在Z轴方向的位置或深度'),
-            'sta_roll': ('横滚角', 'rad', '机器人绕X轴的旋转角度'),
-            'sta_pitch': ('俯仰角', 'rad', '机器人绕Y轴的旋转角度'),
-            'sta_yaw': ('偏航角', 'rad', '机器人绕Z轴的旋转角度'),
-            
-            # 浮游模式状态
-            'sta_floating_vel_x': ('X方向线速度', 'm/s', '浮游模式下X方向的线速度'),
-            'sta_floating_vel_y': ('Y方向线速度', 'm/s', '浮游模式下Y方向的线速度'),
-            'sta_floating_vel_z': ('Z方向线速度', 'm/s', '浮游模式下Z方向的线速度'),
-            'sta_floating_angular_x': ('X轴角速度', 'rad/s', '浮游模式下绕X轴的角速度'),
-            'sta_floating_angular_y': ('Y轴角速度', 'rad/s', '浮游模式下绕Y轴的角速度'),
-            'sta_floating_angular_z': ('Z轴角速度', 'rad/s', '浮游模式下绕Z轴的角速度'),
-            'sta_thruster_power': ('推进器功率', '%', '4个推进器的功率百分比'),
-            'sta_thruster_temp': ('推进器温度', '°C', '4个推进器的温度'),
-            
-            # 轮式模式状态
-            'sta_wheel_linear_vel': ('轮式线速度', 'm/s', '轮式模式下的线速度'),
-            'sta_wheel_angular_vel': ('轮式角速度', 'rad/s', '轮式模式下的角速度'),
-            'sta_motor_data': ('电机数据', '-', '3个电机的数据（舵机角度、电机速度）'),
-            'sta_motor_temp': ('电机温度', '°C', '3个电机的温度'),
-            
-            # 电磁铁状态
-            'sta_electromagnet_enable': ('电磁铁状态', '-', '电磁铁开关状态'),
-            'sta_electromagnet_voltage': ('电磁铁电压', '%', '电磁铁电压百分比'),
-            
-            # 清洗功能状态
-            'sta_brush_power': ('滚刷功率', '%', '滚刷功率百分比'),
-            'sta_brush_enable': ('滚刷状态', '-', '滚刷开关状态'),
-            'sta_vacuum_power': ('吸尘功率', '%', '吸尘器功率百分比'),
-            'sta_vacuum_enable': ('吸尘状态', '-', '吸尘器开关状态'),
-            
-            # 系统状态
-            'sta_battery_voltage': ('电池电压', 'V', '系统电池电压'),
-            'sta_battery_current': ('电池电流', 'A', '系统电池电流'),
-            'sta_battery_percentage': ('电池电量', '%', '电池剩余电量百分比'),
-            'sta_system_temp': ('系统温度', '°C', '系统内部温度'),
-            'sta_water_temp': ('水温', '°C', '环境水温'),
-            'sta_depth': ('深度', 'm', '当前深度'),
-            'sta_pressure': ('压力', 'Pa', '环境压力'),
-            
-            # 浮游模式控制
-            'cmd_floating_vel_x': ('X方向线速度控制', 'm/s', '浮游模式X方向线速度控制'),
-            'cmd_floating_vel_y': ('Y方向线速度控制', 'm/s', '浮游模式Y方向线速度控制'),
-            'cmd_floating_vel_z': ('Z方向线速度控制', 'm/s', '浮游模式Z方向线速度控制'),
-            'cmd_floating_angular_x': ('X轴角速度控制', 'rad/s', '浮游模式X轴角速度控制'),
-            'cmd_floating_angular_y': ('Y轴角速度控制', 'rad/s', '浮游模式Y轴角速度控制'),
-            'cmd_floating_angular_z': ('Z轴角速度控制', 'rad/s', '浮游模式Z轴角速度控制'),
-            
-            # 轮式模式控制
-            'cmd_wheel_linear_vel': ('轮式线速度控制', 'm/s', '轮式模式线速度控制'),
-            'cmd_wheel_angular_vel': ('轮式角速度控制', 'rad/s', '轮式模式角速度控制'),
-            
-            # 清洗功能控制
-            'cmd_brush_power': ('滚刷功率控制', '%', '滚刷功率控制'),
-            'cmd_brush_enable': ('滚刷开关控制', '-', '滚刷开关控制'),
-            'cmd_vacuum_power': ('吸尘功率控制', '%', '吸尘器功率控制'),
-            'cmd_vacuum_enable': ('吸尘开关控制', '-', '吸尘器开关控制'),
-            
-            # 相机控制
-            'cmd_camera_enable': ('相机开关控制', '-', '相机开关控制'),
-        }
-        
-        return param_info.get(attr_name, (attr_name, '-', '未知参数'))
\ No newline at end of file
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+绘图与遥测数据导出
+导出在QThreadPool的工作线程中执行，界面线程只负责复制数据，命令发送和界面刷新不受影响。
+导出内容：完整遥测历史的CSV和压缩NPZ、每个图表参数的CSV和PNG、多图组合PNG。
+
+CSV和NPZ在工作线程中写入（numpy格式化和zlib压缩期间会定期释放GIL）；
+PNG交给单独的进程渲染，Agg光栅化300dpi的粗线条时会长时间持有GIL，放在线程里会卡住界面线程。
+"""
+import os
+import threading
+import multiprocessing
+import numpy as np
+import matplotlib
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import matplotlib.dates as mdates
+from datetime import datetime
+from config.uwbot_config import PLOT_CONFIG
+from .plot_decimation import decimate
+
+CSV_CHUNK_ROWS = 5000  # CSV分块写入的行数，每块之间检查一次取消
+CANCEL_POLL_SECONDS = 0.1  # 等待渲染进程时检查取消的间隔
+RENDER_NICENESS = 10  # 渲染进程降低调度优先级，CPU紧张时让出给界面线程
+BELOW_NORMAL_PRIORITY_CLASS = 0x4000  # Windows下对应的进程优先级
+
+# 渲染进程不会导入plot_display，在这里同样设置中文字体
+matplotlib.rcParams['font.sans-serif'] = ['SimHei']
+matplotlib.rcParams['axes.unicode_minus'] = False
+
+
+def lower_priority():
+    """渲染进程的初始化函数：降低本进程的调度优先级（Windows没有os.nice，改用SetPriorityClass），失败时忽略"""
+    try:
+        if hasattr(os, "nice"):
+            os.nice(RENDER_NICENESS)
+        elif os.name == "nt":
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), BELOW_NORMAL_PRIORITY_CLASS)
+    except (OSError, AttributeError):
+        pass
+
+
+def to_local_datetimes(times):
+    """把UTC秒时间戳转换为按本地时间显示的datetime64，供matplotlib时间轴使用"""
+    utc_offset = datetime.now().astimezone().utcoffset().total_seconds()
+    return ((np.asarray(times, dtype=np.float64) + utc_offset) * 1e6).astype('datetime64[us]')
+
+
+def draw_series(ax, title, times, values, band, color, linewidth=2):
+    """在matplotlib子图上绘制一条曲线（汇总数据同时绘制桶内最小/最大值包络）
+
+    band为None或(时间戳, 最小值, 最大值)。曲线先按导出图片的像素宽度做最小/最大值抽稀，图片不变，渲染更快。
+    """
+    width_px = ax.figure.get_figwidth() * PLOT_CONFIG.EXPORT_DPI
+    times, values, band = decimate(times, values, band, width_px, "minmax")
+    if band is not None:
+        ax.fill_between(to_local_datetimes(band[0]), band[1], band[2], color=color, alpha=0.2, linewidth=0)
+    times = to_local_datetimes(times)
+    ax.plot(times, values, color=color, linewidth=linewidth, alpha=0.8)
+    ax.set_title(title, fontsize=10, fontweight='bold', color='#495057')
+    ax.set_ylabel('数值', color='#495057')
+
+    # 格式化时间轴
+    if len(times) > 1:
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
+        ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+
+    # 设置y轴范围
+    if len(values) > 1:
+        lo, hi = (band[1], band[2]) if band is not None else (values, values)
+        y_min, y_max = float(np.min(lo)), float(np.max(hi))
+        y_range = y_max - y_min
+        if y_range > 0:
+            ax.set_ylim(y_min - y_range*0.1, y_max + y_range*0.1)
+
+
+def render_png(path, figsize, panels, facecolor=None):
+    """在渲染进程中绘制一张PNG，panels为[(标题, 时间戳, 数值, 包络, 颜色), ...]，竖直排列"""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    if facecolor:
+        fig.patch.set_facecolor(facecolor)
+    single = len(panels) == 1
+    for i, (title, times, values, band, color) in enumerate(panels):
+        ax = fig.add_subplot(len(panels), 1, i+1)
+        ax.grid(True, alpha=0.3)
+        if times is not None and len(times) > 0:
+            draw_series(ax, title, times, values, band, color)
+            if single:
+                ax.title.set_fontsize(14)
+                ax.set_xlabel('时间')
+    if not single:
+        fig.subplots_adjust(left=0.1, right=0.95, top=0.95, bottom=0.1, hspace=0.4)
+    fig.savefig(path, dpi=PLOT_CONFIG.EXPORT_DPI, bbox_inches='tight')
+    return path
+
+
+class ExportCanceled(Exception):
+    """导出被用户取消"""
+
+
+class ExportSignals(QObject):
+    """导出任务的信号（QRunnable不是QObject，信号放在单独的对象上）"""
+    progress = pyqtSignal(int, str)  # 进度百分比, 当前步骤
+    finished = pyqtSignal(list)  # 已保存的文件/目录
+    failed = pyqtSignal(str)  # 错误信息
+    canceled = pyqtSignal()
+
+
+class ExportTask(QRunnable):
+    """后台导出任务
+
+    plots为[(参数名, 时间戳, 数值, 包络, 颜色), ...]，数组须为副本；
+    history为TelemetryHistory.snapshot()的结果（可为None），to_matrix把状态/命令记录转换为float64矩阵。
+    """
+
+    def __init__(self, save_dir, timestamp, plots, history=None, to_matrix=None):
+        super().__init__()
+        self.save_dir = save_dir
+        self.timestamp = timestamp
+        self.plots = plots
+        self.history = history
+        self.to_matrix = to_matrix
+        self.signals = ExportSignals()
+        self._cancel = threading.Event()
+        self.setAutoDelete(True)
+
+    def cancel(self):
+        """请求取消，工作线程在下一个检查点停止"""
+        self._cancel.set()
+
+    def _check_canceled(self):
+        if self._cancel.is_set():
+            raise ExportCanceled()
+
+    def run(self):
+        pool = None
+        steps = []
+        if self.history is not None and len(self.history["times"]):
+            steps.append(("写入遥测历史NPZ", self._save_history_npz))
+            steps.append(("写入遥测历史CSV", self._save_history_csv))
+        for plot in self.plots:
+            steps.append((f"导出 {plot[0]}", lambda plot=plot: self._save_plot(pool, *plot)))
+        if len(self.plots) > 1:
+            steps.append(("导出组合图", lambda: self._save_combined(pool)))
+
+        saved = []
+        try:
+            if self.plots:
+                # 只有PNG步骤需要渲染进程；用spawn启动，不从带Qt线程的进程fork；取消时直接终止，不等待正在绘制的图片
+                pool = multiprocessing.get_context("spawn").Pool(1, initializer=lower_priority)
+            for index, (description, step) in enumerate(steps):
+                self._check_canceled()
+                self.signals.progress.emit(int(100 * index / len(steps)), description)
+                saved.append(step())
+        except ExportCanceled:
+            self.signals.canceled.emit()
+            return
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+        self.signals.progress.emit(100, "完成")
+        self.signals.finished.emit(saved)
+
+    # ------------------------------------------------------------------
+    # 各导出步骤，返回保存的路径
+    # ------------------------------------------------------------------
+    def _save_history_npz(self):
+        path = os.path.join(self.save_dir, f"telemetry_{self.timestamp}.npz")
+        np.savez_compressed(path, **self.history)
+        return path
+
+    def _write_csv(self, path, header, times, matrix):
+        """分块写入CSV：首列为UTC秒时间戳，每块整体格式化后一次写入"""
+        columns = 1 + (matrix.shape[1] if matrix.ndim > 1 else 1)
+        fmt = ",".join(["%.6f"] + ["%.15g"] * (columns - 1))
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(header + "\n")
+            for start in range(0, len(times), CSV_CHUNK_ROWS):
+                self._check_canceled()
+                stop = start + CSV_CHUNK_ROWS
+                np.savetxt(f, np.column_stack((times[start:stop], matrix[start:stop])), fmt=fmt)
+
+    def _save_history_csv(self):
+        path = os.path.join(self.save_dir, f"telemetry_{self.timestamp}.csv")
+        matrix = self.to_matrix(self.history["state"], self.history["cmd"])
+        header = ",".join(["time"] + list(self.history["columns"]))
+        self._write_csv(path, header, self.history["times"], matrix)
+        return path
+
+    def _render(self, pool, path, figsize, panels, facecolor=None):
+        """在渲染进程中绘制PNG，等待期间定期检查取消"""
+        result = pool.apply_async(render_png, (path, figsize, panels, facecolor))
+        while not result.ready():
+            self._check_canceled()
+            result.wait(CANCEL_POLL_SECONDS)
+        return result.get()
+
+    def _save_plot(self, pool, param_name, times, values, band, color):
+        # 每个参数一个子目录：PNG和CSV
+        param_dir = os.path.join(self.save_dir, f"{param_name}_{self.timestamp}")
+        os.makedirs(param_dir, exist_ok=True)
+
+        img_path = os.path.join(param_dir, f"{param_name}_{self.timestamp}.png")
+        self._render(pool, img_path, (10, 6), [(f"{param_name}", times, values, band, color)])
+
+        if times is not None and len(times) > 0:
+            data_path = os.path.join(param_dir, f"{param_name}_{self.timestamp}.csv")
+            if band is not None:
+                # 汇总数据：均值与桶内最小/最大值
+                self._write_csv(data_path, "time,mean,min,max", times, np.column_stack((values, band[1], band[2])))
+            else:
+                self._write_csv(data_path, "time,value", times, values)
+        return param_dir
+
+    def _save_combined(self, pool):
+        path = os.path.join(self.save_dir, f"combined_plots_{self.timestamp}.png")
+        panels = [(f"图表 {i+1}: {param_name}", times, values, band, color)
+                  for i, (param_name, times, values, band, color) in enumerate(self.plots)]
+        return self._render(pool, path, (12, 10), panels, '#f8f9fa')
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+频谱模式：推进器功率、电机速度和角速度的Welch平均功率谱
+用于发现螺旋桨缠绕/附着（推进器功率出现转速相关的谱峰）和定艏保持的振荡（Z轴角速度的低频谱峰）。
+
+计算直接读遥测历史（LCM接收端按完整包率写入），在界面定时器中增量进行：
+- 每次只读上次之后新到的数据包，凑满一段（SPECTRUM_SEGMENT点，相邻段按SPECTRUM_OVERLAP重叠）才做FFT，
+  不满一段的尾部留到下一次，任何一包都不会重复变换；
+- 所有通道、本次凑满的所有段一次向量化：去均值、加Hann窗、rfft；
+- 每段的周期图写入最近SPECTRUM_AVERAGES段的环形缓冲，显示的是它们的平均，不再对整个缓冲重新计算。
+每次最多处理平均所需的最近几段，界面隐藏或刚切换到频谱模式时积压的数据不会造成卡顿。
+
+报文按接收时刻打时间戳，采样率取每段首尾时间差估计，假定段内包率大致均匀。
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from PyQt5.QtWidgets import QWidget, QVBoxLayout
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from config.uwbot_config import PLOT_CONFIG
+
+try:
+    import pyqtgraph as pg
+except ImportError:
+    pg = None
+
+# 频谱分组：标题, [(曲线名, 字段路径), ...]，每组一个子图
+SPECTRUM_GROUPS = (
+    ("推进器功率", [(f"推进器{i+1}", f"state_floating_mode.sta_thruster_power[{i}]") for i in range(4)]),
+    ("电机速度", [(f"电机{i}", f"state_wheel_mode.sta_motor_data[{i}]") for i in (1, 2)]),
+    ("角速度", [(f"{axis}轴", f"state_floating_mode.sta_floating_angular_{axis.lower()}") for axis in "XYZ"]),
+)
+PSD_FLOOR = 1e-12  # 对数坐标下功率谱的下限，全零的通道不会画出-inf
+
+
+class WelchSpectrum:
+    """多通道增量Welch功率谱（单边功率谱密度，单位为数值²/Hz）"""
+
+    def __init__(self, history, paths, segment, overlap, averages, max_gap):
+        self.history = history
+        self.paths = list(paths)
+        self.segment = segment
+        self.hop = max(1, int(round(segment * (1.0 - overlap))))
+        self.averages = averages
+        self.max_gap = max_gap
+        self.window = np.hanning(segment)
+        # 单边谱：除直流和奈奎斯特频率外的分量都折叠了负频率，乘2
+        self._scale = np.full(segment // 2 + 1, 2.0 / np.sum(self.window ** 2))
+        self._scale[0] /= 2
+        if segment % 2 == 0:
+            self._scale[-1] /= 2
+        self.reset()
+
+    def reset(self):
+        """丢弃已平均的周期图，从最新一包开始重新积累"""
+        self._next_row = self.history.count
+        self._pending_times = np.empty(0)
+        self._pending = np.empty((0, len(self.paths)))
+        self._periodograms = np.zeros((self.averages, len(self.paths), self.segment // 2 + 1))
+        self._rates = np.zeros(self.averages)  # 各段估计的采样率
+        self._filled = 0  # 环形缓冲中有效的段数
+        self._slot = 0  # 下一段写入的位置
+
+    def prime(self):
+        """从历史中已有的数据开始积累（最多取平均所需的最近几段）"""
+        self.reset()
+        self._next_row = max(0, self._next_row - self._backlog_limit())
+        return self.update()
+
+    def _backlog_limit(self):
+        """凑满平均所需的段数最多需要的采样点数"""
+        return self.segment + self.hop * (self.averages - 1)
+
+    def _read_new_rows(self):
+        """读上次之后新到的数据包，返回(时间戳, (行数, 通道数)矩阵)"""
+        times, columns, self._next_row = self.history.columns_since(self.paths, self._next_row)
+        # 转换为float64的同时复制出来，不再引用环形缓冲
+        return times.copy(), np.column_stack(columns).astype(np.float64)
+
+    def update(self):
+        """处理新到的数据包，有新的段完成变换时返回True"""
+        new_times, new_values = self._read_new_rows()
+        if not len(new_times):
+            return False
+        times = np.concatenate((self._pending_times, new_times))
+        values = np.concatenate((self._pending, new_values))
+
+        # 断链后的数据不能与之前的拼成一段
+        gaps = np.flatnonzero(np.diff(times) > self.max_gap)
+        start = gaps[-1] + 1 if len(gaps) else 0
+        # 积压超过平均所需的段数时只保留最近的部分
+        start = max(start, len(times) - self._backlog_limit())
+        times, values = times[start:], values[start:]
+
+        n_segments = (len(times) - self.segment) // self.hop + 1 if len(times) >= self.segment else 0
+        if n_segments:
+            self._transform(times, values, n_segments)
+        consumed = n_segments * self.hop
+        self._pending_times, self._pending = times[consumed:], values[consumed:]
+        return n_segments > 0
+
+    def _transform(self, times, values, n_segments):
+        """对n_segments个完整段一次做加窗FFT，写入周期图环形缓冲"""
+        starts = np.arange(n_segments) * self.hop
+        segments = sliding_window_view(values, self.segment, axis=0)[starts]  # (段数, 通道数, 段长)
+        segments = segments - segments.mean(axis=-1, keepdims=True)
+        spectra = np.fft.rfft(segments * self.window, axis=-1)
+        spans = times[starts + self.segment - 1] - times[starts]
+        rates = np.where(spans > 0, (self.segment - 1) / np.maximum(spans, 1e-9), 0.0)
+        power = (spectra.real ** 2 + spectra.imag ** 2) * self._scale
+        power /= np.where(rates > 0, rates, 1.0)[:, None, None]
+        slots = (self._slot + np.arange(n_segments)) % self.averages
+        self._periodograms[slots] = power
+        self._rates[slots] = rates
+        self._slot = (self._slot + n_segments) % self.averages
+        self._filled = min(self._filled + n_segments, self.averages)
+
+    def result(self):
+        """返回(频率, (通道数, 频点数)功率谱密度, 参与平均的段数)，尚无完整的段时返回None"""
+        if not self._filled:
+            return None
+        if self._filled == self.averages:
+            psd, rates = self._periodograms.mean(axis=0), self._rates
+        else:
+            valid = (self._slot - 1 - np.arange(self._filled)) % self.averages
+            psd, rates = self._periodograms[valid].mean(axis=0), self._rates[valid]
+        frequencies = np.fft.rfftfreq(self.segment, 1.0 / max(float(np.mean(rates)), 1e-9))
+        return frequencies, psd, self._filled
+
+
+def peak_frequencies(frequencies, psd):
+    """各通道除直流外功率最大的频率"""
+    return frequencies[1:][np.argmax(psd[:, 1:], axis=1)]
+
+
+def group_title(title, names, frequencies, psd):
+    """子图标题：分组名以及各通道的峰值频率，没有交流分量的通道显示为-"""
+    peaks = peak_frequencies(frequencies, psd)
+    active = psd[:, 1:].max(axis=1) > PSD_FLOOR
+    return f"{title}  峰值: " + "  ".join(f"{name} {peak:.2f}Hz" if ok else f"{name} -"
+                                         for name, peak, ok in zip(names, peaks, active))
+
+
+class MatplotlibSpectrumView(QWidget):
+    """matplotlib频谱图：每组一个对数坐标子图，曲线只创建一次"""
+
+    def __init__(self, colors):
+        super().__init__()
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.figure = Figure(figsize=(12, 10))
+        self.figure.patch.set_facecolor('#f8f9fa')
+        self.axes = []
+        self.lines = []
+        for i, (title, channels) in enumerate(SPECTRUM_GROUPS):
+            ax = self.figure.add_subplot(len(SPECTRUM_GROUPS), 1, i+1)
+            ax.set_facecolor('#ffffff')
+            ax.grid(True, which='both', alpha=0.3)
+            ax.tick_params(colors='#495057')
+            ax.set_yscale('log')
+            ax.set_ylabel('功率谱密度', color='#495057')
+            ax.set_title(title, fontsize=10, fontweight='bold', color='#495057')
+            lines = [ax.plot([], [], color=colors[j], linewidth=1.5, label=name)[0]
+                     for j, (name, _) in enumerate(channels)]
+            ax.legend(loc='upper right', fontsize=8)
+            self.axes.append(ax)
+            self.lines.append(lines)
+        self.axes[-1].set_xlabel('频率 (Hz)', color='#495057')
+        self.figure.subplots_adjust(left=0.1, right=0.95, top=0.95, bottom=0.1, hspace=0.4)
+
+        self.canvas = FigureCanvas(self.figure)
+        layout.addWidget(self.canvas)
+
+    def render(self, frequencies, psd):
+        """绘制一帧，psd按SPECTRUM_GROUPS的通道顺序排列"""
+        psd = np.maximum(psd, PSD_FLOOR)
+        row = 0
+        for ax, lines, (title, channels) in zip(self.axes, self.lines, SPECTRUM_GROUPS):
+            group = psd[row:row + len(channels)]
+            for line, values in zip(lines, group):
+                line.set_data(frequencies, values)
+            ax.set_title(group_title(title, [name for name, _ in channels], frequencies, group),
+                         fontsize=10, fontweight='bold', color='#495057')
+            ax.relim()
+            ax.autoscale_view()
+            row += len(channels)
+        # 只有新的段完成变换时才会调用，频率约为每秒一两次，直接完整重绘
+        self.canvas.draw_idle()
+
+    def clear(self):
+        for lines in self.lines:
+            for line in lines:
+                line.set_data([], [])
+        self.canvas.draw_idle()
+
+
+class PyqtgraphSpectrumView(QWidget):
+    """pyqtgraph频谱图：每组一个对数y轴图表，常驻曲线只调用setData"""
+
+    def __init__(self, colors):
+        super().__init__()
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.graphics = pg.GraphicsLayoutWidget()
+        self.graphics.setBackground('#ffffff')
+        layout.addWidget(self.graphics)
+
+        self.plots = []
+        self.curves = []
+        for i, (title, channels) in enumerate(SPECTRUM_GROUPS):
+            plot = self.graphics.addPlot(row=i, col=0)
+            plot.showGrid(x=True, y=True, alpha=0.3)
+            plot.setLogMode(x=False, y=True)
+            plot.setLabel('left', '功率谱密度')
+            plot.setTitle(title)
+            plot.addLegend(offset=(-10, 10))
+            curves = [plot.plot(pen=pg.mkPen(colors[j], width=1), name=name)
+                      for j, (name, _) in enumerate(channels)]
+            self.plots.append(plot)
+            self.curves.append(curves)
+        self.plots[-1].setLabel('bottom', '频率 (Hz)')
+
+    def render(self, frequencies, psd):
+        """绘制一帧，psd按SPECTRUM_GROUPS的通道顺序排列"""
+        psd = np.maximum(psd, PSD_FLOOR)
+        row = 0
+        for plot, curves, (title, channels) in zip(self.plots, self.curves, SPECTRUM_GROUPS):
+            group = psd[row:row + len(channels)]
+            for curve, values in zip(curves, group):
+                curve.setData(frequencies, values, skipFiniteCheck=True)
+            plot.setTitle(group_title(title, [name for name, _ in channels], frequencies, group))
+            row += len(channels)
+
+    def clear(self):
+        for curves in self.curves:
+            for curve in curves:
+                curve.clear()
+
+
+def create_spectrum_view(colors):
+    """按PLOT_CONFIG.BACKEND创建频谱视图，与时域绘图使用同一个后端"""
+    if PLOT_CONFIG.BACKEND == "pyqtgraph" and pg is not None:
+        return PyqtgraphSpectrumView(colors)
+    return MatplotlibSpectrumView(colors)
+
+
+def create_welch_spectrum(history):
+    """按PLOT_CONFIG创建覆盖SPECTRUM_GROUPS全部通道的WelchSpectrum"""
+    paths = [path for _, channels in SPECTRUM_GROUPS for _, path in channels]
+    return WelchSpectrum(history, paths, PLOT_CONFIG.SPECTRUM_SEGMENT, PLOT_CONFIG.SPECTRUM_OVERLAP,
+                         PLOT_CONFIG.SPECTRUM_AVERAGES, PLOT_CONFIG.SPECTRUM_MAX_GAP)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+示波器式触发采集
+在遥测历史（LCM接收端按完整包率写入的无锁环形缓冲）上逐包判断触发条件，
+条件由假变真的那一包即为触发点；触发后等到触发后时长的数据都已到达，把触发前后的窗口复制冻结。
+
+判断在界面定时器中对自上次以来新到的所有行做一次向量化比较，
+界面刷新频率只影响发现触发的延迟，不会漏掉两次刷新之间持续一两个包的尖峰或标志位。
+"""
+import re
+import numpy as np
+
+# 条件格式：字段路径 比较符 数值，如 state_floating_mode.sta_thruster_power[2] > 80
+CONDITION_PATTERN = re.compile(r"^\s*([\w.]+(?:\[\d+\])?)\s*(>=|<=|==|!=|>|<)\s*(\S+)\s*$")
+OPERATORS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+
+def parse_condition(text, field_paths):
+    """解析触发条件，返回(字段路径, 比较函数, 阈值)；条件无效时抛出ValueError
+
+    字段可以只写字段名（如sta_leak_detected），在field_paths中唯一匹配时自动补全分组。
+    """
+    match = CONDITION_PATTERN.match(text)
+    if not match:
+        raise ValueError("条件格式应为: 字段 比较符 数值，如 state_system.sta_leak_detected == 1")
+    path, op, threshold = match.groups()
+    try:
+        threshold = float(threshold)
+    except ValueError:
+        raise ValueError(f"阈值不是数值: {threshold}")
+    if path not in field_paths:
+        candidates = [p for p in field_paths if p.endswith("." + path)]
+        if len(candidates) != 1:
+            raise ValueError(f"未知字段: {path}" if not candidates else f"字段名不唯一: {', '.join(candidates)}")
+        path = candidates[0]
+    return path, OPERATORS[op], threshold
+
+
+class TriggerCapture:
+    """触发采集状态机：空闲 -> 等待触发 -> 已触发（采集触发后数据）-> 已捕获"""
+
+    IDLE = "idle"
+    ARMED = "armed"
+    TRIGGERED = "triggered"
+    CAPTURED = "captured"
+
+    def __init__(self, history):
+        self.history = history
+        self.columns = {path: index for index, path in enumerate(history.field_paths())}
+        self.state = self.IDLE
+        self.condition = None  # (字段路径, 比较函数, 阈值)
+        self.pre_seconds = 0.0
+        self.post_seconds = 0.0
+        self.trigger_time = None
+        self.captured = None  # 冻结的(时间戳, float64矩阵)，列顺序与field_paths()一致
+        self._next_row = 0  # 下一次从哪一行（总行号）开始判断
+        self._last_hit = False  # 上一包是否满足条件，用于检测由假变真
+
+    def arm(self, text, pre_seconds, post_seconds):
+        """解析条件并开始等待触发，只判断此后到达的数据包；条件无效时抛出ValueError"""
+        self.condition = parse_condition(text, self.columns)
+        self.pre_seconds = pre_seconds
+        self.post_seconds = post_seconds
+        self.trigger_time = None
+        self.captured = None
+        # 以最新一包的判断结果为初值：布防时条件已经成立，要等它先变假再变真才触发
+        path, op, threshold = self.condition
+        _, values, self._next_row = self.history.column_since(path, self.history.count - 1)
+        self._last_hit = bool(len(values) and op(values[-1], threshold))
+        self.state = self.ARMED
+
+    def disarm(self):
+        """停止等待并释放已捕获的数据"""
+        self.state = self.IDLE
+        self.trigger_time = None
+        self.captured = None
+
+    def poll(self):
+        """在界面定时器中调用，推进状态机；刚完成捕获时返回True"""
+        if self.state == self.ARMED:
+            self._scan()
+        if self.state == self.TRIGGERED:
+            return self._try_capture()
+        return False
+
+    def _scan(self):
+        """对自上次以来新到的所有包判断条件，找到第一个由假变真的包"""
+        path, op, threshold = self.condition
+        times, values, self._next_row = self.history.column_since(path, self._next_row)
+        if not len(values):
+            return
+        hits = op(values, threshold)
+        previous = np.concatenate(([self._last_hit], hits[:-1]))
+        self._last_hit = bool(hits[-1])
+        edges = np.flatnonzero(hits & ~previous)
+        if len(edges):
+            self.trigger_time = float(times[edges[0]])
+            self.state = self.TRIGGERED
+
+    def _try_capture(self):
+        """触发后时长的数据都已到达时复制触发前后的窗口"""
+        times, state, cmd = self.history.window()
+        if not len(times) or times[-1] < self.trigger_time + self.post_seconds:
+            return False
+        start = int(np.searchsorted(times, self.trigger_time - self.pre_seconds, side="left"))
+        stop = int(np.searchsorted(times, self.trigger_time + self.post_seconds, side="right"))
+        rows = slice(start, stop)
+        self.captured = (times[rows].copy(), self.history.to_float_matrix(state[rows], cmd[rows]))
+        self.state = self.CAPTURED
+        return True
+
+    def column(self, path):
+        """已捕获窗口中某字段的(时间戳, 数值)，未捕获或不是历史中的列时返回None"""
+        if self.captured is None or path not in self.columns:
+            return None
+        times, matrix = self.captured
+        return times, matrix[:, self.columns[path]]
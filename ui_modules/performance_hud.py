@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+性能统计面板
+停靠在主窗口右侧，按PROFILER_SHORTCUT显示/隐藏；显示时启用FrameProfiler，隐藏时停用并恢复被计时的方法。
+每个统计窗口（PROFILER_REFRESH_INTERVAL）刷新一次：界面线程负载、事件循环延迟、节拍抖动，
+以及各组件方法的每秒调用次数、p50/p99/最大耗时和占用界面线程的比例（按占用从大到小排列）。
+"""
+from PyQt5.QtWidgets import (
+    QDockWidget, QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
+    QHeaderView, QAbstractItemView
+)
+from PyQt5.QtCore import Qt
+from config.uwbot_config import MAIN_CONFIG
+from ui_modules.frame_profiler import get_profiler
+from ui_modules.frame_scheduler import PRIORITY_LOW
+
+SECTION_HEADERS = ["组件方法", "次/秒", "p50(ms)", "p99(ms)", "最大(ms)", "占用"]
+
+
+class PerformanceHud(QDockWidget):
+    """性能统计停靠面板"""
+
+    def __init__(self, scheduler=None, parent=None):
+        super().__init__("📈 性能统计", parent)
+        self.setObjectName("PerformanceHud")
+        self.profiler = get_profiler()
+        self.scheduler = scheduler
+        self._late_frames = 0
+        self._frames = 0
+
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        layout.setContentsMargins(6, 6, 6, 6)
+        self.summary_label = QLabel("统计中…")
+        self.summary_label.setStyleSheet("font-family: Consolas, monospace; font-size: 11px; color: #495057;")
+        layout.addWidget(self.summary_label)
+
+        self.table = QTableWidget(0, len(SECTION_HEADERS))
+        self.table.setHorizontalHeaderLabels(SECTION_HEADERS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionMode(QAbstractItemView.NoSelection)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in range(1, len(SECTION_HEADERS)):
+            self.table.horizontalHeader().setSectionResizeMode(column, QHeaderView.Interactive)
+            self.table.setColumnWidth(column, 70)
+        layout.addWidget(self.table)
+        self.setWidget(container)
+        self.setMinimumWidth(480)
+
+        self.visibilityChanged.connect(self.on_visibility_changed)
+        if scheduler is not None:
+            scheduler.register("性能统计", self.refresh, 1000.0 / MAIN_CONFIG.PROFILER_REFRESH_INTERVAL,
+                               PRIORITY_LOW, widget=self)
+            self.profiler.attach_scheduler(scheduler)
+
+    def toggle(self):
+        self.setVisible(not self.isVisible())
+
+    def on_visibility_changed(self, visible):
+        """只在面板可见时统计"""
+        self.profiler.set_enabled(visible)
+        if visible and self.scheduler is not None:
+            self._frames, self._late_frames = self.scheduler.frames, self.scheduler.late_frames
+
+    def refresh(self):
+        """取出本窗口的统计并显示"""
+        snapshot = self.profiler.snapshot()
+        lines = [f"界面线程负载 {snapshot['load']:.0%}    事件循环延迟 p50 {snapshot['lag_p50']:.1f}ms"
+                 f"  p99 {snapshot['lag_p99']:.1f}ms  最大 {snapshot['lag_max']:.1f}ms"]
+        for name, p50, p99, worst in snapshot["ticks"]:
+            lines.append(f"{name} 节拍抖动 p50 {p50:.2f}ms  p99 {p99:.2f}ms  最大 {worst:.2f}ms")
+        if self.scheduler is not None:
+            frames = self.scheduler.frames - self._frames
+            late = self.scheduler.late_frames - self._late_frames
+            self._frames, self._late_frames = self.scheduler.frames, self.scheduler.late_frames
+            lines.append(f"帧调度 {frames}帧, 超出预算 {late}帧")
+        self.summary_label.setText("\n".join(lines))
+
+        sections = snapshot["sections"]
+        self.table.setRowCount(len(sections))
+        for row, (name, rate, p50, p99, worst, share) in enumerate(sections):
+            texts = (name, f"{rate:.1f}", f"{p50:.2f}", f"{p99:.2f}", f"{worst:.2f}", f"{share:.1%}")
+            for column, text in enumerate(texts):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if column:
+                        item.setTextAlignment(int(Qt.AlignRight | Qt.AlignVCenter))
+                    self.table.setItem(row, column, item)
+                item.setText(text)